@@ -0,0 +1,64 @@
+"""
+Seeded synthetic task graphs for benchmarks.
+
+Tasks only depend on tasks generated before them, so every graph is
+acyclic. Fan-out is the number of dependencies per task; fan-in is
+concentrated on a small set of hub tasks that many others depend on.
+"""
+import random
+from datetime import date, timedelta
+from typing import Dict, List
+
+DUE_DATE_DISTRIBUTIONS = ('uniform', 'normal', 'overdue')
+
+def generate_tasks(count: int, seed: int = 0, max_dependencies: int = 2, hub_fraction: float = 0.2,
+                   hub_count: int = 10, due_dates: str = 'uniform', no_due_date: float = 0.1,
+                   today: date = None) -> List[Dict]:
+    """
+    Generate `count` tasks in the API's input format.
+
+    max_dependencies: each task depends on 0..max_dependencies earlier tasks
+    hub_fraction: share of dependencies that point at one of the first
+        hub_count tasks, which gives those tasks a high fan-in
+    due_dates: 'uniform' (-10..60 days), 'normal' (around 14 days) or
+        'overdue' (mostly past due)
+    no_due_date: share of tasks without a due date
+    """
+    if due_dates not in DUE_DATE_DISTRIBUTIONS:
+        raise ValueError(f'due_dates must be one of {", ".join(DUE_DATE_DISTRIBUTIONS)}')
+
+    rng = random.Random(seed)
+    today = today or date.today()
+    tasks = []
+    for i in range(count):
+        task_id = i + 1
+        task = {
+            'id': task_id,
+            'title': f'Task {task_id}',
+            'estimated_hours': rng.choice([0.5, 1, 2, 4, 8, 16, 40]),
+            'importance': rng.randint(1, 10),
+            'dependencies': _dependencies(rng, i, max_dependencies, hub_fraction, hub_count),
+        }
+        if rng.random() >= no_due_date:
+            task['due_date'] = (today + timedelta(days=_days_until_due(rng, due_dates))).isoformat()
+        tasks.append(task)
+    return tasks
+
+def _dependencies(rng: random.Random, i: int, max_dependencies: int, hub_fraction: float,
+                  hub_count: int) -> List[int]:
+    if i == 0:
+        return []
+    dependencies = set()
+    for _ in range(rng.randint(0, max_dependencies)):
+        if rng.random() < hub_fraction:
+            dependencies.add(rng.randint(1, min(i, hub_count)))
+        else:
+            dependencies.add(rng.randint(1, i))
+    return sorted(dependencies)
+
+def _days_until_due(rng: random.Random, distribution: str) -> int:
+    if distribution == 'normal':
+        return round(rng.gauss(14, 7))
+    if distribution == 'overdue':
+        return rng.randint(-30, 3)
+    return rng.randint(-10, 60)
@@ -0,0 +1,156 @@
+"""
+In-process load generator for the analyze and suggest views.
+
+Requests go through the Django test client (the full middleware stack, no
+network) from several threads or processes at once. Each scenario is one
+endpoint, payload size and strategy; the result reports throughput, latency
+percentiles and the error rate. Used by `manage.py loadtest`.
+"""
+import functools
+import itertools
+import json
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import date
+from typing import Dict, List, NamedTuple, Tuple
+from urllib.parse import urlencode
+
+from benchmarks.generator import generate_tasks
+
+ENDPOINTS = {
+    'analyze': 'analyze-tasks',
+    'suggest': 'suggest-tasks',
+    'async-analyze': 'analyze-tasks-async',
+    'async-suggest': 'suggest-tasks-async',
+}
+
+PERCENTILES = (50, 90, 99)
+
+class Scenario(NamedTuple):
+    endpoint: str
+    size: int
+    strategy: str
+    as_of: date
+    seed: int
+    # Identical payloads are answered from the result cache after the first
+    cached: bool
+
+_local = threading.local()
+
+@functools.lru_cache(maxsize=8)
+def _payload(size: int, seed: int, as_of: date) -> Tuple[Dict, str]:
+    """
+    First task and the JSON of the rest, so per-request variants can be
+    assembled without re-encoding the whole list.
+    """
+    tasks = generate_tasks(size, seed, today=as_of)
+    return tasks[0], json.dumps(tasks[1:])[1:-1]
+
+def _tasks_json(scenario: Scenario, i: int) -> str:
+    first, rest = _payload(scenario.size, scenario.seed, scenario.as_of)
+    if not scenario.cached:
+        # A distinct title per request gives every request its own cache key
+        first = dict(first, title=f'{first["title"]} #{i}')
+    return '[' + json.dumps(first) + (', ' + rest if rest else '') + ']'
+
+def _client():
+    if not hasattr(_local, 'client'):
+        from django.conf import settings
+        from django.test import Client
+
+        hosts = [host.lstrip('.') for host in settings.ALLOWED_HOSTS if host not in ('*', '.')]
+        _local.client = Client(HTTP_HOST=hosts[0] if hosts else 'localhost')
+    return _local.client
+
+def _send(scenario: Scenario, i: int) -> Tuple[float, int]:
+    """
+    Send request i of the scenario; returns (seconds, status code), with
+    status 0 when the view raised.
+    """
+    from django.urls import reverse
+
+    client = _client()
+    path = reverse(ENDPOINTS[scenario.endpoint])
+    params = {'strategy': scenario.strategy, 'as_of': scenario.as_of.isoformat()}
+    if scenario.endpoint.endswith('suggest'):
+        params['tasks'] = _tasks_json(scenario, i)
+        url = f'{path}?{urlencode(params)}'
+        send = functools.partial(client.get, url, secure=True)
+    else:
+        body = f'{{"tasks": {_tasks_json(scenario, i)}, {json.dumps(params)[1:]}'
+        send = functools.partial(client.post, path, data=body, content_type='application/json', secure=True)
+
+    start = time.perf_counter()
+    try:
+        status = send().status_code
+    except Exception:
+        status = 0
+    return time.perf_counter() - start, status
+
+def run_requests(scenario: Scenario, indexes: List[int], warmup: int) -> Dict:
+    """
+    Send the given requests one after another; the warmup requests before
+    them are not recorded. Window times are time.monotonic(), which is
+    comparable across processes.
+    """
+    for i in range(warmup):
+        _send(scenario, -1 - i)
+    started = time.monotonic()
+    results = [_send(scenario, i) for i in indexes]
+    return {'started': started, 'finished': time.monotonic(), 'results': results}
+
+def _init_process():
+    import django
+
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'task_analyzer.settings')
+    django.setup()
+
+def run_scenario(scenario: Scenario, requests: int, concurrency: int, mode: str, warmup: int) -> Dict:
+    """
+    Spread `requests` over `concurrency` threads or processes and summarize.
+    """
+    shares = [list(range(start, requests, concurrency)) for start in range(concurrency)]
+    shares = [share for share in shares if share]
+    if mode == 'processes':
+        executor = ProcessPoolExecutor(len(shares), mp_context=multiprocessing.get_context('spawn'),
+                                       initializer=_init_process)
+    else:
+        executor = ThreadPoolExecutor(len(shares), thread_name_prefix='loadtest')
+    with executor:
+        runs = list(executor.map(run_requests, itertools.repeat(scenario), shares, itertools.repeat(warmup)))
+    return summarize(runs)
+
+def summarize(runs: List[Dict]) -> Dict:
+    results = [result for run in runs for result in run['results']]
+    elapsed = max(run['finished'] for run in runs) - min(run['started'] for run in runs)
+    latencies = sorted(seconds for seconds, _ in results)
+    statuses = {}
+    for _, status in results:
+        statuses[str(status)] = statuses.get(str(status), 0) + 1
+    errors = sum(count for status, count in statuses.items() if status != '200')
+
+    summary = {
+        'requests': len(results),
+        'errors': errors,
+        'error_rate': errors / len(results) if results else 0.0,
+        'statuses': statuses,
+        'seconds': elapsed,
+        'throughput': len(results) / elapsed if elapsed > 0 else 0.0,
+        'mean_ms': 1000 * sum(latencies) / len(latencies) if latencies else 0.0,
+        'max_ms': 1000 * latencies[-1] if latencies else 0.0,
+    }
+    for p in PERCENTILES:
+        summary[f'p{p}_ms'] = 1000 * percentile(latencies, p)
+    return summary
+
+def percentile(sorted_values: List[float], p: float) -> float:
+    """
+    Nearest-rank percentile of an ascending list.
+    """
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * p // 100))  # ceil(n * p / 100)
+    return sorted_values[int(rank) - 1]
@@ -0,0 +1,64 @@
+"""
+Peak memory of a large analysis, measured with tracemalloc.
+
+Compares building every output dict up front (analyze_and_sort_tasks) with
+the compact TaskRecord/Ranking result used by the views (rank_tasks), and
+reports peak traced memory per 100k tasks.
+
+Usage (from backend/):
+    python -m benchmarks.memory --tasks 100000
+"""
+import argparse
+import random
+import tracemalloc
+from datetime import date, timedelta
+
+from tasks.scoring import analyze_and_sort_tasks, rank_tasks
+
+def make_tasks(count: int, seed: int = 0):
+    rng = random.Random(seed)
+    today = date.today()
+    return [
+        {
+            'id': i + 1,
+            'title': f'Task {i + 1}',
+            'due_date': (today + timedelta(days=rng.randint(-10, 60))).isoformat(),
+            'estimated_hours': rng.choice([0.5, 1, 2, 4, 8, 16]),
+            'importance': rng.randint(1, 10),
+            'dependencies': [rng.randint(1, i) for _ in range(rng.randint(0, 2))] if i else []
+        }
+        for i in range(count)
+    ]
+
+def measure_peak(func, *args) -> int:
+    """
+    Peak bytes allocated while running func(*args), excluding the input.
+    """
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    baseline = tracemalloc.get_traced_memory()[0]
+    result = func(*args)
+    peak = tracemalloc.get_traced_memory()[1] - baseline
+    tracemalloc.stop()
+    del result
+    return peak
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--tasks', type=int, default=100000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    tasks = make_tasks(args.tasks, args.seed)
+    scale = 100000 / args.tasks
+
+    runs = [
+        ('dicts (analyze_and_sort_tasks)', analyze_and_sort_tasks),
+        ('compact (rank_tasks)', lambda t: rank_tasks(t, ['smart_balance'])),
+    ]
+    for label, func in runs:
+        peak = measure_peak(func, tasks)
+        print(f'{label:34} peak {peak / 2 ** 20:8.1f} MiB   per 100k tasks {peak * scale / 2 ** 20:8.1f} MiB')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,262 @@
+"""
+Scaling benchmarks for the scoring engine and API views.
+
+Times calculate_priority_score, analyze_and_sort_tasks and each view
+(through the Django test client) on generated task graphs of several
+sizes, records peak traced memory, and writes the results as JSON. When a
+baseline file is given, cases slower or bigger than the baseline by more
+than --threshold are reported and the exit status is 1.
+
+Usage (from backend/):
+    python -m benchmarks.suite --sizes 100,1000,10000 --output results.json
+    python -m benchmarks.suite --baseline benchmarks/baseline.json
+    python -m benchmarks.suite --compare results.json benchmarks/baseline.json
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from datetime import date, datetime
+from typing import Callable, Dict, List
+
+from benchmarks.generator import DUE_DATE_DISTRIBUTIONS, generate_tasks
+from benchmarks.memory import measure_peak
+
+# Fixed so results don't drift with the calendar
+AS_OF = date(2025, 1, 1)
+
+# Timings shorter than this are too noisy to flag as regressions
+MIN_COMPARABLE_SECONDS = 0.005
+
+# Timed runs per case below LARGE_SIZE tasks, whatever --repeat says, so the
+# median compared against the baseline isn't a single sample
+MIN_REPEAT = 3
+LARGE_SIZE = 100000
+
+def time_case(run: Callable[[], object], repeat: int, memory: bool) -> Dict[str, float]:
+    """
+    Best and median wall time of `repeat` runs after one untimed warm-up
+    run (lazy imports, caches), and the peak memory of one more run under
+    tracemalloc.
+    """
+    run()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - start)
+
+    result = {'seconds': min(timings), 'median_seconds': statistics.median(timings)}
+    if memory:
+        result['peak_bytes'] = measure_peak(run)
+    return result
+
+def scoring_cases(tasks: List[Dict]) -> Dict[str, Callable[[], object]]:
+    from tasks.scoring import (analyze_and_sort_tasks, build_blocking_index, build_impact_index,
+                               calculate_priority_score)
+
+    def priority_scores():
+        blocking_index = build_blocking_index(tasks)
+        impact_index = build_impact_index(tasks)
+        return [calculate_priority_score(task, tasks, 'smart_balance', blocking_index, impact_index)
+                for task in tasks]
+
+    return {
+        'calculate_priority_score': priority_scores,
+        'analyze_and_sort_tasks': lambda: analyze_and_sort_tasks(tasks, 'smart_balance', AS_OF),
+    }
+
+def view_cases(tasks: List[Dict], max_get_size: int, max_db_size: int) -> Dict[str, Callable[[], object]]:
+    """
+    One request per view through the test client. The result cache is
+    cleared before each request so every run does the full work. The
+    request size limits are lifted so large sizes aren't rejected with 413.
+    """
+    from django.test import Client, override_settings
+    from django.urls import reverse
+    from tasks.cache import result_cache
+
+    client = Client()
+    unlimited = override_settings(DATA_UPLOAD_MAX_MEMORY_SIZE=None, TASK_ANALYZER_MAX_BODY_BYTES=sys.maxsize,
+                                  TASK_ANALYZER_MAX_TASKS=sys.maxsize, TASK_ANALYZER_MAX_BATCH_LISTS=sys.maxsize)
+
+    def request(method, name, expected=200, **kwargs):
+        def run():
+            result_cache().clear()
+            with unlimited:
+                response = getattr(client, method)(reverse(name), secure=True, **kwargs)
+            if response.status_code != expected:
+                raise RuntimeError(f'{name} returned {response.status_code}')
+            return response.content
+        return run
+
+    body = json.dumps({'tasks': tasks, 'as_of': AS_OF.isoformat()})
+    batch = json.dumps({
+        'lists': [{'name': f'list-{i}', 'tasks': tasks[i:i + 100]} for i in range(0, len(tasks), 100)],
+        'as_of': AS_OF.isoformat()
+    })
+    cases = {
+        'view:analyze': request('post', 'analyze-tasks', data=body, content_type='application/json'),
+        'view:analyze_page': request('post', 'analyze-tasks', content_type='application/json', data=json.dumps(
+            {'tasks': tasks, 'as_of': AS_OF.isoformat(), 'limit': 20, 'compact': True})),
+        'view:batch': request('post', 'analyze-batch', data=batch, content_type='application/json'),
+    }
+    if len(tasks) <= max_get_size:
+        cases['view:suggest'] = request('get', 'suggest-tasks', data={
+            'tasks': json.dumps(tasks), 'as_of': AS_OF.isoformat()})
+    if len(tasks) <= max_db_size:
+        _store_tasks(tasks)
+        cases['view:stored_analyze'] = request('get', 'analyze-stored-tasks', data={'as_of': AS_OF.isoformat()})
+        cases['view:stored_suggest'] = request('get', 'suggest-stored-tasks')
+    return cases
+
+def _store_tasks(tasks: List[Dict]):
+    """
+    Replace the stored tasks with `tasks` (dependencies remapped to the
+    new row ids) and materialize their scores.
+    """
+    from tasks.materialized import rescore_all
+    from tasks.models import Task
+
+    Task.objects.all().delete()
+    rows = Task.objects.bulk_create([
+        Task(title=task['title'], due_date=task.get('due_date'), estimated_hours=task['estimated_hours'],
+             importance=task['importance'])
+        for task in tasks
+    ], batch_size=2000)
+    row_ids = {task['id']: row.pk for task, row in zip(tasks, rows)}
+    for task, row in zip(tasks, rows):
+        row.dependencies = [row_ids[dependency] for dependency in task['dependencies']]
+    Task.objects.bulk_update(rows, ['dependencies'], batch_size=2000)
+    rescore_all()
+
+def run_suite(sizes: List[int], repeat: int, memory: bool, views: bool, seed: int, graph: Dict,
+              max_get_size: int, max_db_size: int) -> Dict:
+    results = {}
+    for size in sizes:
+        tasks = generate_tasks(size, seed, today=AS_OF, **graph)
+        cases = scoring_cases(tasks)
+        if views:
+            cases.update(view_cases(tasks, max_get_size, max_db_size))
+        for name, run in cases.items():
+            key = f'{name}[n={size}]'
+            results[key] = time_case(run, max(repeat, MIN_REPEAT) if size < LARGE_SIZE else 1, memory)
+            print(_format_result(key, results[key]), flush=True)
+
+    return {
+        'meta': {
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'cpus': os.cpu_count(),
+            'seed': seed,
+            'graph': graph,
+        },
+        'results': results,
+    }
+
+def compare(current: Dict, baseline: Dict, threshold: float) -> List[Dict]:
+    """
+    Cases present in both runs whose median time or peak memory grew by
+    more than `threshold` (0.2 = 20%).
+    """
+    regressions = []
+    for key, result in current['results'].items():
+        base = baseline['results'].get(key)
+        if base is None:
+            continue
+        for metric in ('median_seconds', 'peak_bytes'):
+            if metric not in result or metric not in base:
+                continue
+            if metric == 'median_seconds' and base[metric] < MIN_COMPARABLE_SECONDS:
+                continue
+            ratio = result[metric] / base[metric] if base[metric] else float('inf')
+            if ratio > 1 + threshold:
+                regressions.append({
+                    'case': key, 'metric': metric, 'baseline': base[metric],
+                    'current': result[metric], 'ratio': round(ratio, 3)
+                })
+    return regressions
+
+def _format_result(key: str, result: Dict) -> str:
+    line = f'{key:45} {result["seconds"] * 1000:10.2f} ms'
+    if 'peak_bytes' in result:
+        line += f'  peak {result["peak_bytes"] / 2 ** 20:8.2f} MiB'
+    return line
+
+def _setup_django():
+    import django
+
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'task_analyzer.settings')
+    django.setup()
+    from django.db import connection
+    from django.test.utils import setup_test_environment
+
+    setup_test_environment()
+    # A throwaway database so stored-task benchmarks never touch real data
+    database_name = connection.settings_dict['NAME']
+    connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    return connection, database_name
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', default='100,1000,10000',
+                        help='Comma-separated task counts, e.g. 100,1000,10000,100000,1000000')
+    parser.add_argument('--repeat', type=int, default=MIN_REPEAT,
+                        help=f'Timed runs per case below 100k tasks (at least {MIN_REPEAT})')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--max-dependencies', type=int, default=2, help='Fan-out per task')
+    parser.add_argument('--hub-fraction', type=float, default=0.2, help='Share of dependencies on hub tasks')
+    parser.add_argument('--hub-count', type=int, default=10)
+    parser.add_argument('--due-dates', choices=DUE_DATE_DISTRIBUTIONS, default='uniform')
+    parser.add_argument('--no-due-date', type=float, default=0.1, help='Share of tasks without a due date')
+    parser.add_argument('--no-memory', action='store_true', help='Skip the tracemalloc peak memory runs')
+    parser.add_argument('--no-views', action='store_true', help='Only benchmark the scoring module')
+    parser.add_argument('--max-get-size', type=int, default=10000, help='Largest list sent to /suggest/')
+    parser.add_argument('--max-db-size', type=int, default=100000, help='Largest table for stored-task views')
+    parser.add_argument('--output', default='benchmark-results.json')
+    parser.add_argument('--baseline', help='Baseline results to compare against')
+    parser.add_argument('--threshold', type=float, default=0.2, help='Allowed slowdown/growth, 0.2 = 20%%')
+    parser.add_argument('--compare', nargs=2, metavar=('RESULTS', 'BASELINE'),
+                        help='Compare two result files without running anything')
+    args = parser.parse_args()
+
+    if args.compare:
+        with open(args.compare[0]) as current_file, open(args.compare[1]) as baseline_file:
+            current, baseline = json.load(current_file), json.load(baseline_file)
+    else:
+        database = None if args.no_views else _setup_django()
+        graph = {
+            'max_dependencies': args.max_dependencies, 'hub_fraction': args.hub_fraction,
+            'hub_count': args.hub_count, 'due_dates': args.due_dates, 'no_due_date': args.no_due_date,
+        }
+        sizes = [int(size) for size in args.sizes.split(',')]
+        try:
+            current = run_suite(sizes, args.repeat, not args.no_memory, not args.no_views, args.seed, graph,
+                                args.max_get_size, args.max_db_size)
+        finally:
+            if database is not None:
+                connection, database_name = database
+                connection.creation.destroy_test_db(database_name, verbosity=0)
+        with open(args.output, 'w') as output:
+            json.dump(current, output, indent=2)
+        print(f'Results written to {args.output}')
+
+        if not args.baseline:
+            return
+        with open(args.baseline) as baseline_file:
+            baseline = json.load(baseline_file)
+
+    regressions = compare(current, baseline, args.threshold)
+    for regression in regressions:
+        print(f'REGRESSION {regression["case"]} {regression["metric"]}: '
+              f'{regression["baseline"]:.6g} -> {regression["current"]:.6g} (x{regression["ratio"]})')
+    if regressions:
+        sys.exit(1)
+    print('No regressions beyond threshold')
+
+if __name__ == '__main__':
+    main()
@@ -1,3 +1,4 @@
+import json
 import os
 from pathlib import Path
 import dj_database_url
@@ -30,9 +31,11 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'tasks.middleware.TimingMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
-    'whitenoise.middleware.WhiteNoiseMiddleware',
+    # WhiteNoise, async-capable so ASGI requests aren't run in a thread
+    'tasks.middleware.StaticFilesMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -91,6 +94,84 @@ else:
 CORS_ALLOW_ALL_ORIGINS = True
 
 
+# Task analyzer request limits (tasks per request, request body size)
+TASK_ANALYZER_MAX_TASKS = int(os.environ.get('TASK_ANALYZER_MAX_TASKS', 1000000))
+TASK_ANALYZER_MAX_BODY_BYTES = int(os.environ.get('TASK_ANALYZER_MAX_BODY_BYTES', 256 * 1024 * 1024))
+# JSON bodies are read whole through request.body, which Django caps at
+# DATA_UPLOAD_MAX_MEMORY_SIZE (2.5MB by default); use the same limit
+DATA_UPLOAD_MAX_MEMORY_SIZE = TASK_ANALYZER_MAX_BODY_BYTES
+
+# Batch analysis: lists per request, total tasks above which lists are scored
+# in a process pool, and the pool size (defaults to the CPU count)
+TASK_ANALYZER_MAX_BATCH_LISTS = int(os.environ.get('TASK_ANALYZER_MAX_BATCH_LISTS', 1000))
+TASK_ANALYZER_BATCH_PARALLEL_THRESHOLD = int(os.environ.get('TASK_ANALYZER_BATCH_PARALLEL_THRESHOLD', 20000))
+TASK_ANALYZER_BATCH_WORKERS = int(os.environ.get('TASK_ANALYZER_BATCH_WORKERS', 0)) or None
+
+# Process-pool scoring of a single large task list: worker count (1 = off) and
+# the list size from which it is used
+TASK_ANALYZER_SCORING_WORKERS = int(os.environ.get('TASK_ANALYZER_SCORING_WORKERS', 1))
+TASK_ANALYZER_PARALLEL_THRESHOLD = int(os.environ.get('TASK_ANALYZER_PARALLEL_THRESHOLD', 200000))
+
+# Async views (ASGI): scoring threads, and requests allowed to wait for one
+# before new requests get 503
+TASK_ANALYZER_ASYNC_WORKERS = int(os.environ.get('TASK_ANALYZER_ASYNC_WORKERS', 4))
+TASK_ANALYZER_ASYNC_QUEUE = int(os.environ.get('TASK_ANALYZER_ASYNC_QUEUE', 16))
+
+# Rows fetched per database round trip when analyzing stored tasks
+TASK_ANALYZER_DB_CHUNK_SIZE = int(os.environ.get('TASK_ANALYZER_DB_CHUNK_SIZE', 2000))
+
+# Incremental analysis sessions kept per worker process, and the seconds an
+# idle session is kept
+TASK_ANALYZER_SESSION_MAX = int(os.environ.get('TASK_ANALYZER_SESSION_MAX', 100))
+TASK_ANALYZER_SESSION_TTL = int(os.environ.get('TASK_ANALYZER_SESSION_TTL', 1800))
+
+# Custom strategies available by name, as a JSON object of
+# {"name": {"weights": {...}, "thresholds": {...}}}, and how many compiled
+# request-defined strategies each worker process keeps
+TASK_ANALYZER_STRATEGIES = json.loads(os.environ.get('TASK_ANALYZER_STRATEGIES', '{}'))
+TASK_ANALYZER_STRATEGY_CACHE_SIZE = int(os.environ.get('TASK_ANALYZER_STRATEGY_CACHE_SIZE', 256))
+
+# Working hours per day used by /schedule/ to turn hour offsets into dates
+TASK_ANALYZER_SCHEDULE_HOURS_PER_DAY = float(os.environ.get('TASK_ANALYZER_SCHEDULE_HOURS_PER_DAY', 8))
+
+# Analysis result cache. The default is a per-process LRU; point the backend at
+# a shared one (e.g. django.core.cache.backends.filebased.FileBasedCache with a
+# directory, or db.DatabaseCache with a table from createcachetable) so all
+# workers share hits.
+TASK_ANALYZER_CACHE_ALIAS = 'task_results'
+# Seconds browsers and shared caches may reuse a /suggest/ response
+TASK_ANALYZER_SUGGEST_MAX_AGE = int(os.environ.get('TASK_ANALYZER_SUGGEST_MAX_AGE', 60))
+TASK_ANALYZER_CACHE_MAX_ITEM_BYTES = int(os.environ.get('TASK_ANALYZER_CACHE_MAX_ITEM_BYTES', 4 * 1024 * 1024))
+
+# Per-request phase timings (Server-Timing header) and latency histograms for
+# /api/metrics. Off by default; the middleware then removes itself at startup.
+TASK_ANALYZER_METRICS = os.environ.get('TASK_ANALYZER_METRICS', 'False').lower() == 'true'
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'tasks': {'handlers': ['console'], 'level': os.environ.get('TASK_ANALYZER_LOG_LEVEL', 'INFO')},
+    },
+}
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    TASK_ANALYZER_CACHE_ALIAS: {
+        'BACKEND': os.environ.get('TASK_ANALYZER_CACHE_BACKEND', 'tasks.cache.LRULocMemCache'),
+        'LOCATION': os.environ.get('TASK_ANALYZER_CACHE_LOCATION', 'task-results'),
+        'TIMEOUT': int(os.environ.get('TASK_ANALYZER_CACHE_TIMEOUT', 3600)),
+        'OPTIONS': {
+            'MAX_ENTRIES': int(os.environ.get('TASK_ANALYZER_CACHE_MAX_ENTRIES', 256)),
+        },
+    },
+}
+
 # Internationalization
 LANGUAGE_CODE = 'en-us'
 TIME_ZONE = 'UTC'
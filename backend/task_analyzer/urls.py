@@ -1,7 +1,10 @@
 from django.contrib import admin
 from django.urls import path, include
 
+from tasks.views import metrics
+
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/tasks/', include('tasks.urls')),  # Include tasks app URLs
+    path('api/metrics', metrics, name='metrics'),
 ]
\ No newline at end of file
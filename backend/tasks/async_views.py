@@ -0,0 +1,50 @@
+"""
+Async versions of the analyze and suggest endpoints for ASGI deployments.
+
+Under an ASGI server, and as long as every middleware is async-capable
+(see tasks.middleware), the request body is received without holding a
+thread, and these views hand parsing, scoring and serialization to the
+bounded scoring executor. Note that the body is still read into memory
+before the view runs. When it is saturated they answer 503 with
+Retry-After instead of queueing more work.
+"""
+from django.http import HttpResponseNotAllowed, JsonResponse
+
+from . import views
+from .executor import ExecutorSaturated, get_scoring_executor
+
+def saturated_response(error):
+    response = JsonResponse({
+        'status': 'error',
+        'message': f'Server busy: {str(error)}'
+    }, status=503)
+    response['Retry-After'] = '1'
+    return response
+
+async def run_view(view, request):
+    """
+    Run a synchronous view on the scoring executor.
+    """
+    try:
+        return await get_scoring_executor().run(view, request)
+    except ExecutorSaturated as e:
+        return saturated_response(e)
+
+async def analyze_tasks(request):
+    """
+    Async analyze_tasks; accepts the same JSON and NDJSON bodies.
+    """
+    if request.method != 'POST':
+        return HttpResponseNotAllowed(['POST'])
+    return await run_view(views.analyze_tasks, request)
+
+# Same as @csrf_exempt, which only wraps sync views in this Django version
+analyze_tasks.csrf_exempt = True
+
+async def suggest_tasks(request):
+    """
+    Async suggest_tasks, including ETag handling.
+    """
+    if request.method != 'GET':
+        return HttpResponseNotAllowed(['GET'])
+    return await run_view(views.suggest_tasks, request)
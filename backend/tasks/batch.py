@@ -0,0 +1,105 @@
+"""
+Batch analysis of many independent task lists.
+
+Each list is scored on its own with rank_tasks and serialized to JSON where
+it was scored, so a list analyzed in a worker process comes back as one
+bytes string instead of pickled task dicts. Large batches are spread over the
+shared process pool.
+"""
+from datetime import date
+from typing import Dict, Iterator, List
+
+from .scoring import rank_tasks
+from .serializers import dumps
+from .strategies import StrategyError
+from .workers import get_process_pool
+
+def analyze_list(item: Dict, as_of: date = None) -> bytes:
+    """
+    Analyze one named task list and return its result entry as JSON.
+    The entry has the same status/message shape as an /analyze/ response.
+    """
+    name = item.get('name')
+    tasks = item.get('tasks')
+    strategy = item.get('strategy', 'smart_balance')
+
+    if not tasks or not isinstance(tasks, list):
+        entry = {'name': name, 'status': 'error', 'message': 'No tasks provided'}
+        return dumps(entry)
+
+    try:
+        result = rank_tasks(tasks, [strategy], as_of)
+    except StrategyError as e:
+        entry = {'name': name, 'status': 'error', 'message': str(e)}
+        return dumps(entry)
+    except Exception as e:
+        entry = {'name': name, 'status': 'error', 'message': f'Server error: {str(e)}'}
+        return dumps(entry)
+
+    if result['errors']:
+        entry = {
+            'name': name,
+            'status': 'error',
+            'message': 'Validation errors occurred',
+            'errors': result['errors'],
+            'warnings': result['warnings']
+        }
+    else:
+        strategy = result['strategies_used'][0]
+        sorted_tasks = result['rankings'][strategy]
+        entry = {
+            'name': name,
+            'status': 'success',
+            'message': f'Analyzed {len(sorted_tasks)} tasks using {strategy} strategy',
+            'data': {
+                'sorted_tasks': sorted_tasks,
+                'errors': result['errors'],
+                'warnings': result['warnings'],
+                'strategy_used': strategy,
+                'as_of': result['as_of']
+            }
+        }
+    return dumps(entry)
+
+def _analyze_chunk(items: List[Dict], as_of: date) -> List[bytes]:
+    return [analyze_list(item, as_of) for item in items]
+
+def analyze_batch(items: List[Dict], as_of: date = None, workers: int = 1) -> Iterator[bytes]:
+    """
+    Yield the JSON result entry for each list, in input order. With more
+    than one worker the lists are split into contiguous chunks of roughly
+    equal task counts and scored in the process pool.
+    """
+    as_of = as_of or date.today()
+    if workers <= 1 or len(items) < 2:
+        for item in items:
+            yield analyze_list(item, as_of)
+        return
+
+    pool = get_process_pool(workers)
+    futures = [pool.submit(_analyze_chunk, chunk, as_of) for chunk in _balanced_chunks(items, workers * 4)]
+    for future in futures:
+        yield from future.result()
+
+def _balanced_chunks(items: List[Dict], chunk_count: int) -> List[List[Dict]]:
+    """
+    Split items into at most chunk_count contiguous chunks holding about the
+    same number of tasks each.
+    """
+    sizes = [task_count(item) + 1 for item in items]
+    target = sum(sizes) / chunk_count
+
+    chunks, chunk, chunk_size = [], [], 0
+    for item, size in zip(items, sizes):
+        chunk.append(item)
+        chunk_size += size
+        if chunk_size >= target:
+            chunks.append(chunk)
+            chunk, chunk_size = [], 0
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+def task_count(item: Dict) -> int:
+    tasks = item.get('tasks')
+    return len(tasks) if isinstance(tasks, list) else 0
@@ -0,0 +1,97 @@
+"""
+Content-addressed cache of analysis responses.
+
+Responses are keyed by a SHA-256 of the canonical JSON of the request
+inputs (tasks, strategy, as-of date), so re-posting the same task list skips
+scoring entirely. The cache goes through Django's cache framework using the
+TASK_ANALYZER_CACHE_ALIAS cache: a size-bounded LRU in local memory by
+default, or any shared backend (file, database, Redis) so every worker
+process sees the same entries.
+"""
+import hashlib
+import json
+import threading
+from datetime import date
+from typing import Any, Callable, Dict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.http import HttpResponse
+
+from .metrics import phase
+
+# Bump when the response format changes so old entries are never served
+CACHE_KEY_VERSION = 2
+
+class CacheStats:
+    """
+    Process-wide hit, miss and eviction counters.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def record(self, name: str, count: int = 1):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + count)
+
+    def as_dict(self) -> Dict[str, int]:
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions}
+
+stats = CacheStats()
+
+class LRULocMemCache(LocMemCache):
+    """
+    LocMemCache that evicts exactly one least-recently-used entry when
+    MAX_ENTRIES is reached (instead of a CULL_FREQUENCY fraction) and
+    counts evictions.
+    """
+    def _cull(self):
+        # Entries are kept most recently used first
+        key, _ = self._cache.popitem()
+        del self._expire_info[key]
+        stats.record('evictions')
+
+def result_cache():
+    return caches[getattr(settings, 'TASK_ANALYZER_CACHE_ALIAS', 'task_results')]
+
+def max_cached_bytes() -> int:
+    return getattr(settings, 'TASK_ANALYZER_CACHE_MAX_ITEM_BYTES', 4 * 1024 * 1024)
+
+def result_cache_key(kind: str, tasks: Any, as_of: date = None, **params) -> str:
+    """
+    Hash the request inputs into a cache key. Object key order and
+    whitespace in the request don't matter; as_of defaults to today.
+    """
+    with phase('cache_key'):
+        canonical = json.dumps(
+            {'tasks': tasks, 'as_of': (as_of or date.today()).isoformat(), **params},
+            sort_keys=True, separators=(',', ':'), default=str
+        )
+        digest = hashlib.sha256(canonical.encode()).hexdigest()
+    return f'tasks:{kind}:v{CACHE_KEY_VERSION}:{digest}'
+
+def cached_response(key: str, build_response: Callable[[], HttpResponse]) -> HttpResponse:
+    """
+    Serve the cached body for key, or build the response and cache its
+    body if it succeeded and is not too large to keep.
+    """
+    cache = result_cache()
+    content = cache.get(key)
+    if content is not None:
+        stats.record('hits')
+        return HttpResponse(content, content_type='application/json')
+
+    stats.record('misses')
+    response = build_response()
+    if response.status_code == 200 and len(response.content) <= max_cached_bytes():
+        cache.set(key, response.content)
+    return response
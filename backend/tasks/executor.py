@@ -0,0 +1,73 @@
+"""
+Bounded executor for running CPU-heavy scoring from async views.
+
+Work runs on a fixed number of threads, so the event loop stays free to
+accept and read other requests. At most max_workers + max_pending calls
+are accepted at once; past that, run() raises ExecutorSaturated so the
+view can answer 503 instead of queueing without limit.
+"""
+import asyncio
+import contextvars
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+
+class ExecutorSaturated(Exception):
+    """
+    Raised when every worker is busy and the pending queue is full.
+    """
+
+class BoundedExecutor:
+    def __init__(self, max_workers: int, max_pending: int):
+        self.max_in_flight = max_workers + max_pending
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='scoring')
+        self._lock = threading.Lock()
+        self._in_flight = 0
+
+    @property
+    def in_flight(self) -> int:
+        with self._lock:
+            return self._in_flight
+
+    def _release(self, future):
+        with self._lock:
+            self._in_flight -= 1
+
+    async def run(self, fn, *args, **kwargs):
+        """
+        Run fn(*args, **kwargs) on a worker thread and await its result.
+        A slot is held until the call finishes, even if the awaiting
+        request is cancelled first.
+        """
+        with self._lock:
+            if self._in_flight >= self.max_in_flight:
+                raise ExecutorSaturated(f'{self.max_in_flight} scoring requests already in progress')
+            self._in_flight += 1
+        try:
+            # Run in a copy of the caller's context so per-request state
+            # (e.g. the metrics timer) is visible on the worker thread
+            context = contextvars.copy_context()
+            future = self._executor.submit(context.run, functools.partial(fn, *args, **kwargs))
+        except BaseException:
+            self._release(None)
+            raise
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+def get_scoring_executor() -> BoundedExecutor:
+    """
+    The process-wide executor, sized from settings on first use.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = BoundedExecutor(
+                getattr(settings, 'TASK_ANALYZER_ASYNC_WORKERS', 4),
+                getattr(settings, 'TASK_ANALYZER_ASYNC_QUEUE', 16)
+            )
+        return _executor
@@ -0,0 +1,75 @@
+import json
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+
+from benchmarks.load import ENDPOINTS, PERCENTILES, Scenario, run_scenario
+from tasks.scoring import STRATEGY_NAMES
+
+class Command(BaseCommand):
+    help = ('Load-test the analyze and suggest views in-process from several threads or processes '
+            'and report throughput, latency percentiles and error rates.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--endpoints', default='analyze,suggest',
+                            help=f'Comma-separated, from: {", ".join(ENDPOINTS)}')
+        parser.add_argument('--sizes', default='100,1000', help='Comma-separated tasks per request')
+        parser.add_argument('--strategies', default='smart_balance',
+                            help='Comma-separated strategy names, or "all"')
+        parser.add_argument('--requests', type=int, default=200, help='Timed requests per scenario')
+        parser.add_argument('--concurrency', type=int, default=4, help='Threads or processes sending requests')
+        parser.add_argument('--mode', choices=('threads', 'processes'), default='threads')
+        parser.add_argument('--warmup', type=int, default=2, help='Untimed requests per thread or process')
+        parser.add_argument('--cached', action='store_true',
+                            help='Repeat identical payloads so the result cache answers them')
+        parser.add_argument('--as-of', default='2025-01-01', help='Date the generated tasks are scored as of')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--output', help='Also write the results to this JSON file')
+
+    def handle(self, *args, **options):
+        endpoints = _split(options['endpoints'])
+        unknown = [endpoint for endpoint in endpoints if endpoint not in ENDPOINTS]
+        if unknown:
+            raise CommandError(f'Unknown endpoint(s): {", ".join(unknown)}')
+        strategies = STRATEGY_NAMES if options['strategies'] == 'all' else _split(options['strategies'])
+        unknown = [strategy for strategy in strategies if strategy not in STRATEGY_NAMES]
+        if unknown:
+            raise CommandError(f'Unknown strategy(s): {", ".join(unknown)}')
+        try:
+            sizes = [int(size) for size in _split(options['sizes'])]
+            as_of = datetime.strptime(options['as_of'], '%Y-%m-%d').date()
+        except ValueError:
+            raise CommandError('--sizes must be integers and --as-of a YYYY-MM-DD date')
+        if min(sizes + [options['requests'], options['concurrency']]) < 1:
+            raise CommandError('--sizes, --requests and --concurrency must be positive')
+
+        self.stdout.write(f'{options["requests"]} requests per scenario, {options["concurrency"]} '
+                          f'{options["mode"]}, {"cached" if options["cached"] else "uncached"} payloads')
+        self.stdout.write(f'{"endpoint":15} {"tasks":>8} {"strategy":16} {"req/s":>9} '
+                          + ''.join(f'{f"p{p} ms":>10}' for p in PERCENTILES) + f' {"errors":>8}')
+
+        results = []
+        for endpoint in endpoints:
+            for size in sizes:
+                for strategy in strategies:
+                    scenario = Scenario(endpoint, size, strategy, as_of, options['seed'], options['cached'])
+                    summary = run_scenario(scenario, options['requests'], options['concurrency'],
+                                           options['mode'], options['warmup'])
+                    results.append({'endpoint': endpoint, 'tasks': size, 'strategy': strategy, **summary})
+                    self.stdout.write(
+                        f'{endpoint:15} {size:8} {strategy:16} {summary["throughput"]:9.1f} '
+                        + ''.join(f'{summary[f"p{p}_ms"]:10.2f}' for p in PERCENTILES)
+                        + f' {summary["error_rate"]:7.1%}'
+                    )
+
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                json.dump({'options': {key: options[key] for key in (
+                    'requests', 'concurrency', 'mode', 'warmup', 'cached', 'as_of', 'seed')},
+                    'results': results}, output, indent=2)
+            self.stdout.write(f'Results written to {options["output"]}')
+        if any(result['errors'] for result in results):
+            self.stdout.write(self.style.WARNING('Some requests failed; see statuses in the JSON output'))
+
+def _split(value):
+    return [part.strip() for part in value.split(',') if part.strip()]
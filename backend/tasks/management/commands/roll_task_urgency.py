@@ -0,0 +1,30 @@
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+
+from tasks.materialized import rescore_all, roll_urgency
+
+class Command(BaseCommand):
+    help = "Move the stored tasks' urgency and composite scores forward to today. Run once a day."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--date', help='Score as of this date (YYYY-MM-DD) instead of today')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Rows per bulk_update')
+        parser.add_argument('--full', action='store_true',
+                            help='Recount blocking counts and rescore every task')
+
+    def handle(self, *args, **options):
+        today = None
+        if options['date']:
+            try:
+                today = datetime.strptime(options['date'], '%Y-%m-%d').date()
+            except ValueError:
+                raise CommandError('--date must be in YYYY-MM-DD format')
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be positive')
+
+        if options['full']:
+            updated = rescore_all(today, options['batch_size'])
+        else:
+            updated = roll_urgency(today, options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Rescored {updated} tasks'))
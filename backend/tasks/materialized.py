@@ -0,0 +1,214 @@
+"""
+Materialized factor scores for stored tasks.
+
+Each Task row carries its urgency, importance and effort scores, the number
+of tasks it blocks, and one composite score column per strategy. Saves and
+deletes update the row and the blocking counts of its dependencies
+(tasks.signals), and the roll_task_urgency command moves urgency forward
+once a day. Suggestions can then be read with ORDER BY score DESC LIMIT k.
+"""
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import Any, Dict, Iterable, List
+
+from django.db import connection, transaction
+from django.db.models import F, Q
+from django.db.models.functions import Greatest
+
+from .models import Task
+from .scoring import (
+    STRATEGY_NAMES, URGENCY_FLOOR_DAYS, build_explanation, calculate_blocking_score,
+    calculate_effort_score, calculate_importance_score, calculate_urgency_score,
+    calculate_weighted_score, get_strategy_weights
+)
+from .strategies import resolve_strategy
+
+# Composite score column for each strategy. Transitive impact changes
+# whenever anything downstream does, so strategies that weight it aren't
+# materialized and are scored on request instead.
+STRATEGY_SCORE_FIELDS = {
+    strategy: f'score_{strategy}' for strategy in STRATEGY_NAMES if not get_strategy_weights(strategy)['impact']
+}
+
+# Every column written when a task is rescored
+SCORE_FIELDS = (
+    'urgency_score', 'importance_score', 'effort_score', 'blocking_count', 'scored_on',
+    *STRATEGY_SCORE_FIELDS.values()
+)
+
+def score_field(strategy: str) -> str:
+    """
+    The composite score column for a strategy. Unknown strategies fall back
+    to smart_balance, like get_strategy_weights.
+    """
+    return STRATEGY_SCORE_FIELDS[resolve_strategy(strategy).key]
+
+def is_materialized(strategy: str) -> bool:
+    """
+    Whether a strategy's suggestions can be read from a score column.
+    Custom strategies and those that weight downstream impact can't.
+    """
+    return resolve_strategy(strategy).key in STRATEGY_SCORE_FIELDS
+
+def unique_dependencies(dependencies: Any) -> set:
+    """
+    The distinct task ids in a stored dependency list.
+    """
+    if not isinstance(dependencies, list):
+        return set()
+    return {d for d in dependencies if isinstance(d, int) and not isinstance(d, bool)}
+
+def apply_scores(task: Task, today: date = None):
+    """
+    Recompute a task's factor and composite scores from its fields and its
+    current blocking_count. Invalid hours and importance get the same
+    defaults as request validation.
+    """
+    if today is None:
+        today = date.today()
+
+    estimated_hours = task.estimated_hours
+    if estimated_hours is None or estimated_hours <= 0:
+        estimated_hours = 1
+
+    task.urgency_score = calculate_urgency_score(task.due_date.isoformat() if task.due_date else None, today)
+    task.importance_score = calculate_importance_score(task.importance)
+    task.effort_score = calculate_effort_score(estimated_hours)
+    task.scored_on = today
+    apply_composite_scores(task)
+
+def apply_composite_scores(task: Task):
+    """
+    Recompute the per-strategy composite scores from the stored factors.
+    """
+    factors = (task.urgency_score, task.importance_score, task.effort_score,
+               calculate_blocking_score(task.blocking_count))
+    for strategy, field in STRATEGY_SCORE_FIELDS.items():
+        setattr(task, field, round(calculate_weighted_score(factors, get_strategy_weights(strategy)), 4))
+
+def adjust_blocking_counts(deltas: Dict[int, int]):
+    """
+    Add each delta to the blocking count of the task with that id and
+    rescore those tasks. Ids without a stored task are ignored.
+    The counts are changed in the database, so concurrent saves don't
+    overwrite each other's changes.
+    """
+    by_delta = defaultdict(list)
+    for task_id, delta in deltas.items():
+        if delta:
+            by_delta[delta].append(task_id)
+    if not by_delta:
+        return
+
+    with transaction.atomic():
+        for delta, task_ids in by_delta.items():
+            Task.objects.filter(pk__in=task_ids).update(blocking_count=Greatest(F('blocking_count') + delta, 0))
+        changed = [task_id for task_ids in by_delta.values() for task_id in task_ids]
+        tasks = list(Task.objects.select_for_update().filter(pk__in=changed))
+        for task in tasks:
+            apply_composite_scores(task)
+        Task.objects.bulk_update(tasks, list(STRATEGY_SCORE_FIELDS.values()))
+
+def count_dependents(task_id: int) -> int:
+    """
+    The number of other stored tasks that list task_id as a dependency.
+    Uses JSON containment where the database supports it; otherwise rows
+    whose dependency text mentions the id are fetched and checked.
+    """
+    others = Task.objects.exclude(pk=task_id)
+    if connection.features.supports_json_field_contains:
+        return others.filter(dependencies__contains=[task_id]).count()
+    candidates = others.filter(dependencies__icontains=str(task_id)).values_list('dependencies', flat=True)
+    return sum(1 for dependencies in candidates.iterator() if task_id in unique_dependencies(dependencies))
+
+def stale_urgency_tasks(today: date):
+    """
+    Tasks whose urgency score may have changed since it was computed.
+    Tasks without a due date, tasks already overdue when scored, and tasks
+    still URGENCY_FLOOR_DAYS or more away keep the same urgency.
+    """
+    return Task.objects.filter(
+        Q(scored_on__isnull=True) |
+        Q(scored_on__lt=today, due_date__gte=F('scored_on'),
+          due_date__lt=today + timedelta(days=URGENCY_FLOOR_DAYS))
+    )
+
+def roll_urgency(today: date = None, batch_size: int = 1000) -> int:
+    """
+    Move urgency and composite scores forward to `today` for every stale
+    task, writing them back with bulk_update in batches. Returns the number
+    of tasks updated.
+    """
+    if today is None:
+        today = date.today()
+
+    updated = 0
+    for batch in _batches(stale_urgency_tasks(today), batch_size):
+        for task in batch:
+            apply_scores(task, today)
+        Task.objects.bulk_update(batch, SCORE_FIELDS)
+        updated += len(batch)
+    return updated
+
+def rescore_all(today: date = None, batch_size: int = 1000) -> int:
+    """
+    Recount every blocking count from the stored dependency lists and
+    rescore every task. Used after migrating existing rows or to repair
+    counts changed outside the ORM signals (bulk_update, raw SQL).
+    """
+    if today is None:
+        today = date.today()
+
+    blocking_counts = {}
+    for dependencies in Task.objects.values_list('dependencies', flat=True).iterator(chunk_size=batch_size):
+        for dependency in unique_dependencies(dependencies):
+            blocking_counts[dependency] = blocking_counts.get(dependency, 0) + 1
+
+    updated = 0
+    for batch in _batches(Task.objects.all(), batch_size):
+        for task in batch:
+            task.blocking_count = blocking_counts.get(task.pk, 0)
+            apply_scores(task, today)
+        Task.objects.bulk_update(batch, SCORE_FIELDS)
+        updated += len(batch)
+    return updated
+
+def _batches(queryset, size: int) -> Iterable[List[Task]]:
+    """
+    Yield the queryset in primary-key order, `size` rows at a time. Each
+    batch is its own query, so rows can be updated while iterating.
+    """
+    last_pk = None
+    while True:
+        page = queryset.order_by('pk')
+        if last_pk is not None:
+            page = page.filter(pk__gt=last_pk)
+        batch = list(page[:size])
+        if not batch:
+            return
+        yield batch
+        last_pk = batch[-1].pk
+
+def top_stored_tasks(queryset, strategy: str, k: int) -> List[Dict[str, Any]]:
+    """
+    The k highest-scoring tasks of the queryset from the materialized
+    columns, as an indexed ORDER BY ... LIMIT k query.
+    """
+    field = score_field(strategy)
+    rows = queryset.order_by(f'-{field}', '-created_at').values_list(
+        'title', 'due_date', 'estimated_hours', 'importance',
+        'urgency_score', 'importance_score', 'effort_score', 'blocking_count', field
+    )[:k]
+
+    top_tasks = []
+    for title, due_date, hours, importance, urgency, importance_score, effort, blocking, score in rows:
+        top_tasks.append({
+            'title': title,
+            'due_date': due_date.isoformat() if due_date else None,
+            'estimated_hours': hours,
+            'importance': importance,
+            'priority_score': score,
+            'explanation': build_explanation(urgency, importance_score, effort,
+                                             calculate_blocking_score(blocking)),
+        })
+    return top_tasks
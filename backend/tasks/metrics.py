@@ -0,0 +1,170 @@
+"""
+Per-request phase timings and process-wide latency histograms.
+
+The timing middleware starts a RequestTimer for each request; code on the
+hot path marks phases with `with phase('score'):` and reports sizes with
+count('tasks', n). Outside a timed request (metrics disabled, management
+commands, tests) phase() returns a shared no-op context manager, so the
+instrumentation costs one context variable lookup per call.
+
+Histograms are kept per process and rendered in the Prometheus text
+exposition format by render_prometheus().
+"""
+import bisect
+import contextlib
+import contextvars
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+# Upper bounds (seconds) of the latency histogram buckets
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+_current_timer = contextvars.ContextVar('task_analyzer_request_timer', default=None)
+_no_op = contextlib.nullcontext()
+
+class RequestTimer:
+    """
+    Phase durations (seconds, summed over repeats) and counts for one request.
+    """
+    __slots__ = ('phases', 'counts')
+
+    def __init__(self):
+        self.phases = {}
+        self.counts = {}
+
+class _Phase:
+    __slots__ = ('timer', 'name', 'start')
+
+    def __init__(self, timer: RequestTimer, name: str):
+        self.timer = timer
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        phases = self.timer.phases
+        phases[self.name] = phases.get(self.name, 0.0) + time.perf_counter() - self.start
+        return False
+
+def phase(name: str):
+    """
+    Context manager timing one phase of the current request.
+    """
+    timer = _current_timer.get()
+    if timer is None:
+        return _no_op
+    return _Phase(timer, name)
+
+def count(name: str, value: int):
+    """
+    Add value to a per-request count such as the number of tasks scored.
+    """
+    timer = _current_timer.get()
+    if timer is not None:
+        timer.counts[name] = timer.counts.get(name, 0) + value
+
+def start_request() -> Tuple[RequestTimer, contextvars.Token]:
+    timer = RequestTimer()
+    return timer, _current_timer.set(timer)
+
+def finish_request(token: contextvars.Token):
+    _current_timer.reset(token)
+
+def current_timer() -> Optional[RequestTimer]:
+    return _current_timer.get()
+
+class Histogram:
+    """
+    Cumulative-bucket histogram with a running sum and count.
+    """
+    __slots__ = ('bounds', 'buckets', 'sum', 'count')
+
+    def __init__(self, bounds: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.bounds = bounds
+        self.buckets = [0] * (len(bounds) + 1)  # Last bucket is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.buckets[bisect.bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        total = 0
+        result = []
+        for bound, observed in zip(self.bounds + (float('inf'),), self.buckets):
+            total += observed
+            result.append(('+Inf' if bound == float('inf') else repr(bound), total))
+        return result
+
+class MetricsRegistry:
+    """
+    Request and phase latency histograms plus counters, keyed by labels.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.requests = {}  # (view, method, status) -> Histogram
+            self.phases = {}  # (view, phase) -> Histogram
+            self.counts = {}  # (view, name) -> total
+
+    def record(self, view: str, method: str, status: int, seconds: float, timer: RequestTimer):
+        with self._lock:
+            key = (view, method, str(status))
+            if key not in self.requests:
+                self.requests[key] = Histogram()
+            self.requests[key].observe(seconds)
+            for name, phase_seconds in timer.phases.items():
+                if (view, name) not in self.phases:
+                    self.phases[(view, name)] = Histogram()
+                self.phases[(view, name)].observe(phase_seconds)
+            for name, value in timer.counts.items():
+                self.counts[(view, name)] = self.counts.get((view, name), 0) + value
+
+    def render(self, extra_counters: Dict[str, Tuple[str, int]] = None) -> str:
+        """
+        Prometheus text exposition of every metric. extra_counters maps
+        metric names to (help text, value).
+        """
+        lines = []
+        with self._lock:
+            _render_histograms(lines, 'task_analyzer_request_duration_seconds',
+                               'Request latency by view, method and status.',
+                               ('view', 'method', 'status'), self.requests)
+            _render_histograms(lines, 'task_analyzer_phase_duration_seconds',
+                               'Time spent in each processing phase per request.',
+                               ('view', 'phase'), self.phases)
+            lines.append('# HELP task_analyzer_items_total Items processed by view (e.g. tasks scored).')
+            lines.append('# TYPE task_analyzer_items_total counter')
+            for (view, name), value in sorted(self.counts.items()):
+                lines.append(f'task_analyzer_items_total{_labels(("view", "item"), (view, name))} {value}')
+        for metric, (help_text, value) in (extra_counters or {}).items():
+            lines.append(f'# HELP {metric} {help_text}')
+            lines.append(f'# TYPE {metric} counter')
+            lines.append(f'{metric} {value}')
+        return '\n'.join(lines) + '\n'
+
+def _labels(names, values) -> str:
+    pairs = []
+    for name, value in zip(names, values):
+        escaped = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        pairs.append(f'{name}="{escaped}"')
+    return '{' + ','.join(pairs) + '}'
+
+def _render_histograms(lines: List[str], metric: str, help_text: str, label_names, histograms: Dict):
+    lines.append(f'# HELP {metric} {help_text}')
+    lines.append(f'# TYPE {metric} histogram')
+    for key, histogram in sorted(histograms.items()):
+        for bound, total in histogram.cumulative():
+            lines.append(f'{metric}_bucket{_labels(label_names + ("le",), key + (bound,))} {total}')
+        lines.append(f'{metric}_sum{_labels(label_names, key)} {histogram.sum!r}')
+        lines.append(f'{metric}_count{_labels(label_names, key)} {histogram.count}')
+
+registry = MetricsRegistry()
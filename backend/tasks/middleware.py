@@ -0,0 +1,101 @@
+"""
+Project middleware.
+
+TimingMiddleware adds a Server-Timing header with the phases recorded by
+tasks.metrics and feeds the latency histograms served at /api/metrics.
+It is disabled (removed from the middleware chain at startup) unless
+TASK_ANALYZER_METRICS is on.
+
+StaticFilesMiddleware is WhiteNoise usable in an async middleware chain.
+WhiteNoise's own middleware is sync-only, so under ASGI Django would run
+the whole chain in a thread for every request, async views included.
+Both middleware work in sync and async chains.
+"""
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+from . import metrics
+
+class TimingMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'TASK_ANALYZER_METRICS', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        timer, token = metrics.start_request()
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            metrics.finish_request(token)
+        return self.record(request, response, timer, time.perf_counter() - start)
+
+    async def __acall__(self, request):
+        timer, token = metrics.start_request()
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            metrics.finish_request(token)
+        return self.record(request, response, timer, time.perf_counter() - start)
+
+    def record(self, request, response, timer: metrics.RequestTimer, elapsed: float):
+        # Streamed bodies are produced after this point and not included
+        match = request.resolver_match
+        view = match.view_name if match is not None else 'unresolved'
+        if view != 'metrics':
+            metrics.registry.record(view, request.method, response.status_code, elapsed, timer)
+        response['Server-Timing'] = server_timing(timer, elapsed)
+        return response
+
+def server_timing(timer: metrics.RequestTimer, total: float) -> str:
+    """
+    Server-Timing header value; durations are in milliseconds and counts
+    are sent as descriptions, e.g. `tasks;desc="5000"`.
+    """
+    entries = [f'{name};dur={seconds * 1000:.2f}' for name, seconds in timer.phases.items()]
+    entries.extend(f'{name};desc="{value}"' for name, value in timer.counts.items())
+    entries.append(f'total;dur={total * 1000:.2f}')
+    return ', '.join(entries)
+
+class StaticFilesMiddleware(WhiteNoiseMiddleware):
+    """
+    Serves static files like WhiteNoiseMiddleware. In an async chain only
+    static file requests go to a thread; everything else is passed
+    straight on to the next handler.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response=None, settings=settings):
+        super().__init__(get_response, settings)
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        if self.autorefresh:
+            static_file = await sync_to_async(self.find_file)(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is not None:
+            return await sync_to_async(self.serve)(static_file, request)
+        return await self.get_response(request)
@@ -0,0 +1,31 @@
+# Generated by Django 4.2.7 on 2026-10-17 02:32
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Task',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', models.CharField(max_length=200)),
+                ('due_date', models.DateField(blank=True, null=True)),
+                ('estimated_hours', models.FloatField(help_text='Estimated time to complete in hours', validators=[django.core.validators.MinValueValidator(0.1)])),
+                ('importance', models.IntegerField(help_text='Importance on a scale of 1-10', validators=[django.core.validators.MinValueValidator(1), django.core.validators.MaxValueValidator(10)])),
+                ('dependencies', models.JSONField(blank=True, default=list, help_text='List of task IDs that this task depends on')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
@@ -0,0 +1,74 @@
+# Generated by Django 4.2.7 on 2026-10-17 02:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0002_task_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='blocking_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='effort_score',
+            field=models.FloatField(default=0.5),
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='importance_score',
+            field=models.FloatField(default=0.5),
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='score_deadline_driven',
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='score_fastest_wins',
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='score_high_impact',
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='score_smart_balance',
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='scored_on',
+            field=models.DateField(blank=True, help_text='Date the urgency score was computed for', null=True),
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='urgency_score',
+            field=models.FloatField(default=0.3),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['-score_smart_balance', '-created_at'], name='task_smart_balance_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['-score_fastest_wins', '-created_at'], name='task_fastest_wins_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['-score_high_impact', '-created_at'], name='task_high_impact_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['-score_deadline_driven', '-created_at'], name='task_deadline_driven_idx'),
+        ),
+    ]
@@ -17,6 +17,17 @@ class Task(models.Model):
         blank=True,
         help_text="List of task IDs that this task depends on"
     )
+    # Materialized factor scores, kept current by tasks.signals and the
+    # roll_task_urgency command (see tasks.materialized)
+    urgency_score = models.FloatField(default=0.3)
+    importance_score = models.FloatField(default=0.5)
+    effort_score = models.FloatField(default=0.5)
+    blocking_count = models.PositiveIntegerField(default=0)
+    score_smart_balance = models.FloatField(default=0)
+    score_fastest_wins = models.FloatField(default=0)
+    score_high_impact = models.FloatField(default=0)
+    score_deadline_driven = models.FloatField(default=0)
+    scored_on = models.DateField(null=True, blank=True, help_text="Date the urgency score was computed for")
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -24,4 +35,15 @@ class Task(models.Model):
         return self.title
 
     class Meta:
-        ordering = ['-created_at']
\ No newline at end of file
+        ordering = ['-created_at']
+        indexes = [
+            # Filters and default ordering used by the stored-task endpoints
+            models.Index(fields=['due_date'], name='task_due_date_idx'),
+            models.Index(fields=['importance'], name='task_importance_idx'),
+            models.Index(fields=['created_at'], name='task_created_at_idx'),
+            # ORDER BY score DESC LIMIT k for stored-task suggestions
+            models.Index(fields=['-score_smart_balance', '-created_at'], name='task_smart_balance_idx'),
+            models.Index(fields=['-score_fastest_wins', '-created_at'], name='task_fastest_wins_idx'),
+            models.Index(fields=['-score_high_impact', '-created_at'], name='task_high_impact_idx'),
+            models.Index(fields=['-score_deadline_driven', '-created_at'], name='task_deadline_driven_idx'),
+        ]
\ No newline at end of file
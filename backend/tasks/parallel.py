@@ -0,0 +1,146 @@
+"""
+Process-pool scoring for very large task lists.
+
+The parent builds the global blocking counts and downstream impacts once
+and writes five numeric input columns (days until due, hours, importance,
+blocking count, impact) into a shared memory block. Each worker scores a contiguous chunk of rows with
+the same functions as the single-process path, writes factor scores,
+rounded totals and its chunk's stable sort order into shared output blocks,
+and returns nothing but a status. The parent then k-way merges the sorted
+chunks. No task dicts or records are pickled.
+"""
+import heapq
+from array import array
+from datetime import date
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Dict, List, Tuple
+
+from .records import TaskRecord
+from .scoring import (
+    ScoredTasks, calculate_blocking_score, calculate_effort_score, calculate_impact_score,
+    calculate_importance_score, parse_due_date, urgency_from_days
+)
+from .strategies import Strategy
+from .workers import get_process_pool
+
+# Input columns, each n float64 values in the input block
+DAYS, HOURS, IMPORTANCE, BLOCKING, IMPACT = range(5)
+
+# Factor score columns at the start of the output block
+FACTORS = 5
+
+def _input_columns(records: List[TaskRecord], blocking_counts: Dict[Any, int], impacts: Dict[Any, float],
+                   today: date) -> array:
+    """
+    The five input columns laid out one after another. Days until due is
+    NaN when there is no valid due date. Raises TypeError, ValueError or
+    OverflowError for values that can't be stored as floats.
+    """
+    days_by_due = {}
+    days = array('d')
+    for record in records:
+        due_date = record.due_date_value
+        try:
+            value = days_by_due[due_date]
+        except KeyError:
+            due = parse_due_date(due_date)
+            value = float('nan') if due is None else float((due - today).days)
+            days_by_due[due_date] = value
+        except TypeError:
+            value = float('nan')  # Unhashable, so not a date string either
+        days.append(value)
+
+    columns = days
+    columns.extend(float(record.estimated_hours) for record in records)
+    columns.extend(float(record.importance) for record in records)
+    columns.extend(float(blocking_counts.get(record.id, 0)) for record in records)
+    columns.extend(float(impacts.get(record.id, 0.0)) for record in records)
+    return columns
+
+def _score_chunk(names: Tuple[str, str, str], n: int, start: int, end: int, strategies: List[Strategy]) -> int:
+    """
+    Worker: score rows [start, end) from the shared input block. Writes
+    the five factor columns and one rounded-total column per strategy into
+    the output block, and each strategy's sorted row order for the chunk
+    into the order block.
+    """
+    blocks = [SharedMemory(name=name) for name in names]
+    inputs = blocks[0].buf.cast('d')
+    outputs = blocks[1].buf.cast('d')
+    orders = blocks[2].buf.cast('q')
+    try:
+        for i in range(start, end):
+            days = inputs[DAYS * n + i]
+            outputs[i] = 0.3 if days != days else urgency_from_days(int(days))
+            outputs[n + i] = calculate_importance_score(inputs[IMPORTANCE * n + i])
+            outputs[2 * n + i] = calculate_effort_score(inputs[HOURS * n + i])
+            outputs[3 * n + i] = calculate_blocking_score(int(inputs[BLOCKING * n + i]))
+            outputs[4 * n + i] = calculate_impact_score(inputs[IMPACT * n + i])
+
+        factors = [outputs[column * n + start:column * n + end].tolist() for column in range(FACTORS)]
+        for s, strategy in enumerate(strategies):
+            score = strategy.score
+            totals = [round(score(row), 4) for row in zip(*factors)]
+            offset = (FACTORS + s) * n + start
+            outputs[offset:offset + len(totals)] = array('d', totals)
+
+            # Stable descending sort within the chunk
+            order = sorted(range(start, end), key=lambda i: totals[i - start], reverse=True)
+            orders[s * n + start:s * n + end] = array('q', order)
+        return end - start
+    finally:
+        del inputs, outputs, orders
+        for block in blocks:
+            block.close()
+
+def _chunk_bounds(n: int, chunks: int) -> List[Tuple[int, int]]:
+    size = -(-n // chunks)
+    return [(start, min(start + size, n)) for start in range(0, n, size)]
+
+def rank_records(records: List[TaskRecord], blocking_counts: Dict[Any, int], impacts: Dict[Any, float],
+                 today: date, strategies: List[Strategy],
+                 workers: int) -> Tuple[ScoredTasks, Dict[str, Tuple[List[int], List[float]]]]:
+    """
+    Score records in the process pool and rank them under each strategy.
+    Returns (scored tasks, {strategy: (order, rounded totals)}), identical
+    to the single-process result.
+    """
+    n = len(records)
+    columns = _input_columns(records, blocking_counts, impacts, today)
+
+    blocks = [
+        SharedMemory(create=True, size=max(1, columns.itemsize * len(columns))),
+        SharedMemory(create=True, size=max(1, 8 * n * (FACTORS + len(strategies)))),
+        SharedMemory(create=True, size=max(1, 8 * n * len(strategies))),
+    ]
+    try:
+        blocks[0].buf[:columns.itemsize * len(columns)] = columns.tobytes()
+        del columns
+
+        names = tuple(block.name for block in blocks)
+        bounds = _chunk_bounds(n, workers)
+        pool = get_process_pool(workers)
+        futures = [pool.submit(_score_chunk, names, n, start, end, strategies) for start, end in bounds]
+        for future in futures:
+            future.result()
+
+        outputs = blocks[1].buf.cast('d')
+        orders = blocks[2].buf.cast('q')
+        try:
+            factors = tuple(outputs[column * n:(column + 1) * n].tolist() for column in range(FACTORS))
+            rankings = {}
+            for s, strategy in enumerate(strategies):
+                totals = outputs[(FACTORS + s) * n:(FACTORS + 1 + s) * n].tolist()
+                runs = [orders[s * n + start:s * n + end].tolist() for start, end in bounds]
+                # Chunks are contiguous, and merge takes ties from earlier
+                # runs first, so ties keep input order as in a stable sort
+                order = list(heapq.merge(*runs, key=lambda i: -totals[i]))
+                rankings[strategy.name] = (order, totals)
+        finally:
+            del outputs, orders
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+    return ScoredTasks(records, factors), rankings
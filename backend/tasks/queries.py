@@ -0,0 +1,61 @@
+"""
+Reading stored Task rows for scoring.
+
+Rows are fetched as tuples with values_list() and streamed in chunks with
+iterator(), so ranking a large table never instantiates Task objects or
+holds the whole result set in the database cursor at once.
+"""
+from datetime import datetime
+from typing import Dict, Iterator
+
+from django.conf import settings
+
+from .models import Task
+
+# Columns the scoring pipeline needs, in the order they are selected
+STORED_TASK_FIELDS = ('id', 'title', 'due_date', 'estimated_hours', 'importance', 'dependencies')
+
+def db_chunk_size() -> int:
+    return getattr(settings, 'TASK_ANALYZER_DB_CHUNK_SIZE', 2000)
+
+def filter_stored_tasks(params):
+    """
+    Build a Task queryset from the optional due_before (YYYY-MM-DD) and
+    min_importance (integer) filters. Raises ValueError with a message
+    for the client when a filter value is invalid.
+    """
+    queryset = Task.objects.all()
+
+    due_before = params.get('due_before')
+    if due_before:
+        try:
+            due_before = datetime.strptime(due_before, '%Y-%m-%d').date()
+        except ValueError:
+            raise ValueError('due_before must be a date in YYYY-MM-DD format')
+        queryset = queryset.filter(due_date__lt=due_before)
+
+    min_importance = params.get('min_importance')
+    if min_importance:
+        try:
+            min_importance = int(min_importance)
+        except ValueError:
+            raise ValueError('min_importance must be an integer')
+        queryset = queryset.filter(importance__gte=min_importance)
+
+    return queryset
+
+def iter_stored_tasks(queryset) -> Iterator[Dict]:
+    """
+    Yield each row of the queryset as a task dict in the shape the API
+    accepts, with due dates as ISO strings.
+    """
+    rows = queryset.values_list(*STORED_TASK_FIELDS).iterator(chunk_size=db_chunk_size())
+    for task_id, title, due_date, estimated_hours, importance, dependencies in rows:
+        yield {
+            'id': task_id,
+            'title': title,
+            'due_date': due_date.isoformat() if due_date else None,
+            'estimated_hours': estimated_hours,
+            'importance': importance,
+            'dependencies': dependencies,
+        }
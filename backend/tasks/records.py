@@ -0,0 +1,62 @@
+"""
+Compact internal representation of validated tasks.
+
+Validation turns each incoming task dict into a TaskRecord, and scoring works
+on those records plus factor score columns. Output dicts are only built when
+a response is serialized.
+"""
+from typing import Dict, Any
+
+# Marks a field that was absent from the input task (as opposed to null)
+MISSING = object()
+
+# Fields stored in TaskRecord slots; any other input keys go to `extra`
+CORE_FIELDS = frozenset(('id', 'title', 'due_date', 'estimated_hours', 'importance', 'dependencies'))
+
+class TaskRecord:
+    """
+    One validated task with normalized fields.
+    """
+    __slots__ = ('id', 'title', 'due_date', 'estimated_hours', 'importance', 'dependencies', 'extra')
+
+    def __init__(self, task_id, title, due_date, estimated_hours, importance, dependencies, extra=None):
+        self.id = task_id
+        self.title = title
+        self.due_date = due_date
+        self.estimated_hours = estimated_hours
+        self.importance = importance
+        self.dependencies = dependencies
+        self.extra = extra
+
+    @classmethod
+    def from_dict(cls, task: Dict, task_id, estimated_hours, importance, dependencies) -> 'TaskRecord':
+        """
+        Build a record from an input dict and its normalized values.
+        Input keys outside CORE_FIELDS are kept in `extra` and echoed back.
+        """
+        extra = None
+        if len(task) > len(CORE_FIELDS) or not CORE_FIELDS.issuperset(task):
+            extra = {key: value for key, value in task.items() if key not in CORE_FIELDS} or None
+        return cls(task_id, task['title'], task.get('due_date', MISSING),
+                   estimated_hours, importance, dependencies, extra)
+
+    @property
+    def due_date_value(self):
+        """
+        The due date, or None when it was not given.
+        """
+        return None if self.due_date is MISSING else self.due_date
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        The normalized task as a plain dict, in the shape clients sent it.
+        """
+        task = {'id': self.id, 'title': self.title}
+        if self.due_date is not MISSING:
+            task['due_date'] = self.due_date
+        task['estimated_hours'] = self.estimated_hours
+        task['importance'] = self.importance
+        task['dependencies'] = self.dependencies
+        if self.extra:
+            task.update(self.extra)
+        return task
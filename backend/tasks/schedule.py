@@ -0,0 +1,180 @@
+"""
+Critical-path scheduling.
+
+Treats estimated_hours as task durations and dependencies as
+finish-to-start links, then runs one forward and one backward pass over a
+Kahn topological order of the dependency graph built by the scoring
+module. Every task gets its earliest and latest start/finish and its slack
+(how long it can slip without delaying the whole plan); tasks with no
+slack form the critical path. Earliest finishes are turned into calendar
+dates at a fixed number of working hours per day and compared with each
+task's due date. Everything is O(n + edges).
+"""
+import math
+from collections.abc import Hashable
+from datetime import date, timedelta
+from typing import Any, Dict, List, Sequence, Tuple
+
+from .metrics import count, phase
+from .records import TaskRecord
+from .scoring import _cycle_error, _dependency_graph, _find_cycles, _topological_order, parse_due_date
+from .validation import IssueLog, validate_tasks
+
+DEFAULT_HOURS_PER_DAY = 8
+
+# Slack below this many hours counts as none (float rounding on long chains)
+SLACK_TOLERANCE = 1e-6
+
+def build_schedule(tasks: List[Dict], as_of: date = None,
+                   hours_per_day: float = DEFAULT_HOURS_PER_DAY, strict: bool = False) -> Dict[str, Any]:
+    """
+    Schedule tasks as early as their dependencies allow, starting on as_of
+    (default: today). Tasks come back in an order in which they can be
+    worked (each after the tasks it depends on). Dependency cycles are
+    reported as errors and leave the schedule empty, as does any invalid
+    task with strict.
+    """
+    as_of = as_of or date.today()
+    with phase('validate'):
+        records, _, errors, warnings = validate_tasks(tasks, strict)
+    count('tasks', len(records))
+
+    with phase('dependencies'):
+        ids = [record.id for record in records]
+        dependency_lists = [record.dependencies for record in records]
+        graph = _dependency_graph(ids, dependency_lists)
+        order, dependents, _ = _topological_order(graph[1])
+        if not (strict and errors):
+            errors.extend(_cycle_error(cycle) for cycle in _find_cycles(ids, dependency_lists, graph, order))
+
+    result = {
+        'tasks': [],
+        'critical_path': [],
+        'total_hours': 0.0,
+        'finish_date': None,
+        'late_tasks': 0,
+        'errors': errors,
+        'warnings': warnings,
+        'hours_per_day': hours_per_day,
+        'as_of': as_of.isoformat()
+    }
+    if errors or not records:
+        return result
+
+    with phase('schedule'):
+        position, adjacency = graph
+        durations = _durations(records, warnings)
+
+        # Tasks sharing an id are one node, scheduled once as the last of them
+        repeated = {i for i, task_id in enumerate(ids)
+                    if isinstance(task_id, Hashable) and position.get(task_id, i) != i}
+        if repeated:
+            warnings.append(f"{len(repeated)} task(s) repeat an earlier task id; "
+                            "each id is scheduled once, as its last occurrence")
+            for node in repeated:
+                durations[node] = 0.0
+
+        earliest_start, earliest_finish, latest_finish = _critical_path_times(order, adjacency, dependents,
+                                                                              durations)
+        total_hours = max(earliest_finish)
+
+        rows = []
+        late_tasks = 0
+        for node in order:
+            if node in repeated:
+                continue
+            row = _schedule_row(records[node], durations[node], earliest_start[node], earliest_finish[node],
+                                latest_finish[node], as_of, hours_per_day)
+            late_tasks += row['days_late'] > 0
+            rows.append(row)
+
+    result.update({
+        'tasks': rows,
+        'critical_path': [ids[node] for node in _trace_critical_path(adjacency, earliest_finish)],
+        'total_hours': round(total_hours, 4),
+        'finish_date': _finish_date(total_hours, as_of, hours_per_day).isoformat(),
+        'late_tasks': late_tasks
+    })
+    return result
+
+def _durations(records: List[TaskRecord], warnings: List[str]) -> List[float]:
+    """
+    Validated estimated hours as floats; NaN and infinite estimates (which
+    validation lets through) are replaced by the usual default of 1.
+    """
+    defaults = IssueLog()
+    durations = []
+    for i, record in enumerate(records):
+        hours = float(record.estimated_hours)
+        if not math.isfinite(hours):
+            hours = 1.0
+            defaults.add('invalid_estimated_hours', record.id, i, record.title)
+        durations.append(hours)
+    warnings.extend(defaults.messages())
+    return durations
+
+def _critical_path_times(order: List[int], adjacency: List[Any], dependents: List[Sequence[int]],
+                         durations: List[float]) -> Tuple[List[float], List[float], List[float]]:
+    """
+    Forward pass for earliest start/finish, backward pass for latest
+    finish, both in hours from the start of the plan. A task with nothing
+    after it may finish as late as the plan does.
+    """
+    earliest_start = [0.0] * len(adjacency)
+    earliest_finish = [0.0] * len(adjacency)
+    for node in order:
+        start = max([earliest_finish[target] for target in adjacency[node]], default=0.0)
+        earliest_start[node] = start
+        earliest_finish[node] = start + durations[node]
+
+    total_hours = max(earliest_finish, default=0.0)
+    latest_finish = [total_hours] * len(adjacency)
+    for node in reversed(order):
+        if dependents[node]:
+            latest_finish[node] = min(latest_finish[d] - durations[d] for d in dependents[node])
+    return earliest_start, earliest_finish, latest_finish
+
+def _trace_critical_path(adjacency: List[Any], earliest_finish: List[float]) -> List[int]:
+    """
+    One chain of zero-slack tasks, walked back from the task finishing
+    last: each task's latest-finishing dependency is the one that sets its
+    earliest start. Ties go to the first task in list order.
+    """
+    node = max(range(len(earliest_finish)), key=earliest_finish.__getitem__)
+    path = [node]
+    while adjacency[node]:
+        node = max(adjacency[node], key=earliest_finish.__getitem__)
+        path.append(node)
+    path.reverse()
+    return path
+
+def _finish_date(hours: float, as_of: date, hours_per_day: float) -> date:
+    """
+    The working day on which the given number of hours from the start of
+    as_of is reached: 8 hours at 8 per day finish on as_of itself. Plans
+    running past the last representable date finish on date.max.
+    """
+    try:
+        return as_of + timedelta(days=max(0, math.ceil(hours / hours_per_day - SLACK_TOLERANCE) - 1))
+    except OverflowError:
+        return date.max
+
+def _schedule_row(record: TaskRecord, duration: float, earliest_start: float, earliest_finish: float,
+                  latest_finish: float, as_of: date, hours_per_day: float) -> Dict[str, Any]:
+    slack = latest_finish - earliest_finish
+    finish_date = _finish_date(earliest_finish, as_of, hours_per_day)
+    due_date = parse_due_date(record.due_date_value)
+    return {
+        'id': record.id,
+        'title': record.title,
+        'due_date': record.due_date_value,
+        'estimated_hours': duration,
+        'earliest_start': round(earliest_start, 4),
+        'earliest_finish': round(earliest_finish, 4),
+        'latest_start': round(latest_finish - duration, 4),
+        'latest_finish': round(latest_finish, 4),
+        'slack': round(max(slack, 0.0), 4),
+        'critical': slack <= SLACK_TOLERANCE,
+        'earliest_finish_date': finish_date.isoformat(),
+        'days_late': max((finish_date - due_date).days, 0) if due_date else 0
+    }
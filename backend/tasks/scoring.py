@@ -1,14 +1,232 @@
+import heapq
 import json
+import math
 from datetime import datetime, date
-from typing import List, Dict, Any
+from collections.abc import Hashable
+from functools import lru_cache
+from typing import List, Dict, Any, Sequence, Tuple
+
+from .metrics import count, phase
+from .records import TaskRecord
+from .strategies import BUILTIN_STRATEGIES, Strategy, resolve_strategy
+from .validation import validate_tasks
+
+# Task lists at least this long are scored with the NumPy engine
+VECTORIZE_THRESHOLD = 500
+
+# When more than one worker is allowed, task lists at least this long are
+# scored in a process pool (see parallel.py)
+PARALLEL_THRESHOLD = 200000
+
+# Distinct due date strings remembered by parse_due_date
+DUE_DATE_CACHE_SIZE = 4096
+
+# Importance-weighted downstream tasks at which the impact factor reaches 1.0
+IMPACT_SATURATION = 50
+
+def find_dependency_cycles(tasks: List[Dict]) -> List[List[Any]]:
+    """
+    Find every dependency cycle as a list of member task ids.
+    A Kahn topological pass settles acyclic lists; otherwise an iterative
+    Tarjan strongly-connected-components pass over the tasks it couldn't
+    order finds the cycles. Both run in O(n + edges) and never touch
+    Python's recursion limit.
+    """
+    return _find_cycles([task.get('id') for task in tasks], [task.get('dependencies') for task in tasks])
+
+def _dependency_graph(ids: List[Any], dependency_lists: List[Any]) -> Tuple[Dict[Any, int], List[Any]]:
+    """
+    Index form of the dependency graph: the position of each task id in
+    the list and, per position, the positions of the tasks it depends on.
+    Tasks sharing an id share one node; unknown and unhashable ids are
+    skipped.
+    """
+    # Map task ids to their position in the task list
+    try:
+        position = {task_id: i for i, task_id in enumerate(ids)}
+    except TypeError:
+        position = {task_id: i for i, task_id in enumerate(ids) if isinstance(task_id, Hashable)}
+    position.pop(None, None)
+    get = position.get
+    # With distinct ids every task is its own node, so no id lookup is needed
+    distinct = len(position) == len(ids)
+    
+    adjacency = [()] * len(ids)
+    for i, dependencies in enumerate(dependency_lists):
+        if not dependencies or not isinstance(dependencies, list):
+            continue
+        if distinct:
+            node = i
+        else:
+            try:
+                node = position[ids[i]]
+            except (KeyError, TypeError):
+                continue
+        try:
+            if len(dependencies) == 1:
+                # The common case; a tuple avoids building a list per task
+                target = get(dependencies[0])
+                targets = () if target is None else (target,)
+            else:
+                targets = [position[d] for d in dependencies if d in position]
+        except TypeError:
+            targets = [position[d] for d in dependencies if isinstance(d, Hashable) and d in position]
+        if not targets:
+            continue
+        # Tasks sharing an id share one node
+        adjacency[node] = [*adjacency[node], *targets] if adjacency[node] else targets
+    
+    return position, adjacency
+
+def _find_cycles(ids: List[Any], dependency_lists: List[Any], graph: Tuple = None,
+                 order: List[int] = None) -> List[List[Any]]:
+    """
+    find_dependency_cycles over parallel id / dependency-list columns.
+    Pass the _dependency_graph of the columns and its _topological_order
+    if they are already built.
+    """
+    _, adjacency = graph or _dependency_graph(ids, dependency_lists)
+    if order is None:
+        order = _topological_order(adjacency)[0]
+    if len(order) == len(adjacency):
+        return []  # Kahn's pass ordered every task, so there are no cycles
+    
+    # Edges point from a task to the tasks it depends on. Every cycle must
+    # contain at least one edge to a later (or the same) position, so only
+    # the sources of such edges need to be used as search roots.
+    roots = [node for node, targets in enumerate(adjacency) if targets and max(targets) >= node]
+    
+    index = [-1] * len(ids)
+    for node in order:
+        # Ordered tasks only lead to other ordered tasks, never into a cycle
+        index[node] = 0
+    low = [0] * len(ids)
+    on_stack = [False] * len(ids)
+    stack = []
+    counter = 0
+    cycles = []
+    
+    for root in roots:
+        if index[root] >= 0:
+            continue
+        
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = True
+        work = [(root, iter(adjacency[root]))]
+        
+        while work:
+            node, edges = work[-1]
+            for target in edges:
+                if index[target] < 0:
+                    if not adjacency[target]:
+                        # Task without dependencies can never be in a cycle
+                        index[target] = counter
+                        counter += 1
+                        continue
+                    index[target] = low[target] = counter
+                    counter += 1
+                    stack.append(target)
+                    on_stack[target] = True
+                    work.append((target, iter(adjacency[target])))
+                    break
+                elif on_stack[target] and index[target] < low[node]:
+                    low[node] = index[target]
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    if low[node] < low[parent]:
+                        low[parent] = low[node]
+                
+                if low[node] == index[node]:
+                    # Node is the root of a strongly connected component
+                    member = stack.pop()
+                    on_stack[member] = False
+                    if member == node:
+                        if node in adjacency[node]:
+                            cycles.append([ids[node]])  # Task depends on itself
+                        continue
+                    members = [member]
+                    while member != node:
+                        member = stack.pop()
+                        on_stack[member] = False
+                        members.append(member)
+                    members.sort()
+                    cycles.append([ids[m] for m in members])
+    
+    return cycles
 
 def detect_circular_dependencies(tasks: List[Dict]) -> List[str]:
     """
-    SIMPLIFIED circular dependency detection.
-    Returns empty list (no errors) to avoid index issues.
-    We'll implement this properly later if needed.
+    Return one error message per dependency cycle found in the task list.
+    """
+    return [_cycle_error(cycle) for cycle in find_dependency_cycles(tasks)]
+
+def _cycle_error(cycle: List[Any]) -> str:
+    return "Circular dependency detected between tasks: " + ", ".join(str(task_id) for task_id in cycle)
+
+@lru_cache(maxsize=DUE_DATE_CACHE_SIZE)
+def _parse_due_date(due_date: str) -> date:
+    try:
+        return datetime.strptime(due_date, '%Y-%m-%d').date()
+    except (ValueError, TypeError):
+        return None
+
+def parse_due_date(due_date: Any) -> date:
+    """
+    Parse a YYYY-MM-DD due date, or return None if it is missing or invalid.
+    Backlogs share few distinct dates, so results are memoized.
+    """
+    if not due_date:
+        return None
+    try:
+        return _parse_due_date(due_date)
+    except TypeError:
+        return None  # Unhashable, so not a date string either
+
+def _urgency_for_days(days_until_due: int) -> float:
+    """
+    Urgency for a number of days until the due date. Only used to build
+    URGENCY_TABLE; scoring looks values up from the table.
+    """
+    if days_until_due < 0:
+        # Past due - very high urgency (negative days get high score)
+        return 1.0
+    elif days_until_due == 0:
+        # Due today - very high urgency
+        return 0.9
+    elif days_until_due <= 1:
+        # Due tomorrow
+        return 0.8
+    elif days_until_due <= 3:
+        # Due in 3 days
+        return 0.7
+    elif days_until_due <= 7:
+        # Due in a week
+        return 0.5
+    elif days_until_due <= 14:
+        # Due in two weeks
+        return 0.3
+    else:
+        # Far future - low urgency that decays
+        return max(0.1, 10 / days_until_due)
+
+# Urgency by days until due. From 100 days on, 10 / days <= 0.1, so every
+# later day scores the 0.1 floor.
+URGENCY_FLOOR_DAYS = 100
+URGENCY_TABLE = tuple(_urgency_for_days(days) for days in range(URGENCY_FLOOR_DAYS))
+
+def urgency_from_days(days_until_due: int) -> float:
+    """
+    Look up the urgency score for a number of days until the due date.
     """
-    return []  # Temporarily disable circular dependency check
+    if days_until_due < 0:
+        return 1.0
+    if days_until_due < URGENCY_FLOOR_DAYS:
+        return URGENCY_TABLE[days_until_due]
+    return 0.1
 
 def calculate_urgency_score(due_date: str, today: date = None) -> float:
     """
@@ -18,36 +236,11 @@ def calculate_urgency_score(due_date: str, today: date = None) -> float:
     if today is None:
         today = date.today()
     
-    if not due_date:
-        return 0.3  # No due date = low urgency
+    due = parse_due_date(due_date)
+    if due is None:
+        return 0.3  # No due date or invalid date format = low urgency
     
-    try:
-        due = datetime.strptime(due_date, '%Y-%m-%d').date()
-        days_until_due = (due - today).days
-        
-        if days_until_due < 0:
-            # Past due - very high urgency (negative days get high score)
-            return 1.0
-        elif days_until_due == 0:
-            # Due today - very high urgency
-            return 0.9
-        elif days_until_due <= 1:
-            # Due tomorrow
-            return 0.8
-        elif days_until_due <= 3:
-            # Due in 3 days
-            return 0.7
-        elif days_until_due <= 7:
-            # Due in a week
-            return 0.5
-        elif days_until_due <= 14:
-            # Due in two weeks
-            return 0.3
-        else:
-            # Far future - low urgency that decays
-            return max(0.1, 10 / days_until_due)
-    except (ValueError, TypeError):
-        return 0.3  # Invalid date format
+    return urgency_from_days((due - today).days)
 
 def calculate_effort_score(estimated_hours: float) -> float:
     """
@@ -80,32 +273,129 @@ def calculate_importance_score(importance: int) -> float:
     # Normalize 1-10 scale to 0.1-1.0
     return importance / 10.0
 
-def calculate_dependency_score(task: Dict, all_tasks: List[Dict]) -> float:
+def build_blocking_index(tasks: List[Dict]) -> Dict[Any, int]:
     """
-    Calculate dependency score - tasks that block others get higher priority.
-    SIMPLIFIED: Only count dependencies that actually exist.
+    Build a reverse-dependency index: task id -> number of tasks it blocks.
+    One pass over every task's dependency list, O(n + edges).
     """
-    task_id = task.get('id')
-    
-    # If no ID, can't calculate dependencies
-    if task_id is None:
-        return 0.1
-    
-    # Get all valid task IDs from the task list
-    valid_task_ids = {t.get('id') for t in all_tasks if t.get('id') is not None}
-    
-    # Count how many other tasks depend on this task
-    blocking_count = 0
+    return _count_blocking([task.get('id') for task in tasks], [task.get('dependencies') for task in tasks])
+
+def _count_blocking(ids: List[Any], dependency_lists: List[Any]) -> Dict[Any, int]:
+    """
+    build_blocking_index over parallel id / dependency-list columns.
+    """
+    try:
+        valid_task_ids = set(ids)
+    except TypeError:
+        valid_task_ids = {task_id for task_id in ids if isinstance(task_id, Hashable)}
+    valid_task_ids.discard(None)
     
-    for other_task in all_tasks:
-        # Get dependencies list safely
-        dependencies = other_task.get('dependencies', [])
+    blocking_counts = {}
+    for dependencies in dependency_lists:
+        if not dependencies or not isinstance(dependencies, list):
+            continue
         
-        # Only count if the dependency exists in our task list
-        if task_id in dependencies and task_id in valid_task_ids:
-            blocking_count += 1
+        # A task counts once per dependent, even if listed twice
+        try:
+            unique_dependencies = set(dependencies)
+        except TypeError:
+            unique_dependencies = {d for d in dependencies if isinstance(d, Hashable)}
+        for dependency in unique_dependencies:
+            if dependency in valid_task_ids:
+                blocking_counts[dependency] = blocking_counts.get(dependency, 0) + 1
     
-    # Normalize: 0 dependencies = 0.1, 3+ dependencies = 1.0
+    return blocking_counts
+
+def _topological_order(adjacency: List[Any]) -> Tuple[List[int], List[Sequence[int]], List[int]]:
+    """
+    Kahn's algorithm over a _dependency_graph adjacency, in O(n + edges).
+    Returns (nodes ordered so each comes after the tasks it depends on,
+    per node its distinct dependents in list order, per node its number of
+    distinct dependencies). Nodes on or downstream of a cycle are left out
+    of the order.
+    """
+    dependency_counts = [0] * len(adjacency)
+    # Most tasks have at most one dependent; a list is only made for more
+    dependents = [()] * len(adjacency)
+    for node, targets in enumerate(adjacency):
+        if not targets:
+            continue
+        if len(targets) > 1:
+            targets = dict.fromkeys(targets)
+        dependency_counts[node] = len(targets)
+        for target in targets:
+            others = dependents[target]
+            if not others:
+                dependents[target] = (node,)
+            elif others.__class__ is tuple:
+                dependents[target] = [others[0], node]
+            else:
+                others.append(node)
+    
+    remaining = list(dependency_counts)
+    order = [node for node, count in enumerate(dependency_counts) if not count]
+    for node in order:  # Grows while it is walked, like a FIFO queue
+        for dependent in dependents[node]:
+            remaining[dependent] -= 1
+            if not remaining[dependent]:
+                order.append(dependent)
+    return order, dependents, dependency_counts
+
+def _downstream_impact(adjacency: List[Any], weights: List[float], topology: Tuple = None) -> List[float]:
+    """
+    Importance-weighted count of the tasks downstream of each node, in one
+    reverse topological pass:
+        impact(t) = sum over dependents d of (weight(d) + impact(d)) / dependencies(d)
+    A dependent that waits on several tasks splits its credit between
+    them, so shared descendants are never counted twice and no result
+    exceeds the true weighted number of descendants. On trees and chains
+    it is exact (a chain of 200 tasks gives its head 199 downstream tasks).
+    Pass the _topological_order of the adjacency if it is already built.
+    """
+    order, dependents, dependency_counts = topology or _topological_order(adjacency)
+    impact = [0.0] * len(adjacency)
+    for node in reversed(order):
+        if dependents[node]:
+            total = 0.0
+            for dependent in dependents[node]:
+                total += (weights[dependent] + impact[dependent]) / dependency_counts[dependent]
+            impact[node] = total
+    return impact
+
+def _impact_index(ids: List[Any], dependency_lists: List[Any], importances: List[Any],
+                  graph: Tuple = None, topology: Tuple = None) -> Dict[Any, float]:
+    """
+    Downstream impact by task id, for tasks that have any. Each downstream
+    task is weighted by its importance score (0.1-1.0).
+    """
+    position, adjacency = graph or _dependency_graph(ids, dependency_lists)
+    if not position:
+        return {}
+    weights = [calculate_importance_score(importance) for importance in importances]
+    impact = _downstream_impact(adjacency, weights, topology)
+    return {task_id: impact[node] for task_id, node in position.items() if impact[node]}
+
+def build_impact_index(tasks: List[Dict]) -> Dict[Any, float]:
+    """
+    Build the transitive impact index: task id -> importance-weighted
+    number of tasks downstream of it. O(n + edges).
+    """
+    return _impact_index([task.get('id') for task in tasks], [task.get('dependencies') for task in tasks],
+                         [task.get('importance', 5) for task in tasks])
+
+def calculate_impact_score(impact: float) -> float:
+    """
+    Normalize downstream impact on a log scale: nothing downstream = 0.1,
+    IMPACT_SATURATION or more weighted downstream tasks = 1.0.
+    """
+    if impact <= 0:
+        return 0.1
+    return min(1.0, 0.1 + 0.9 * math.log1p(impact) / math.log1p(IMPACT_SATURATION))
+
+def calculate_blocking_score(blocking_count: int) -> float:
+    """
+    Normalize a blocking count: 0 dependents = 0.1, 3+ dependents = 1.0
+    """
     if blocking_count == 0:
         return 0.1
     elif blocking_count == 1:
@@ -115,67 +405,39 @@ def calculate_dependency_score(task: Dict, all_tasks: List[Dict]) -> float:
     else:
         return 1.0
 
-def get_strategy_weights(strategy: str) -> Dict[str, float]:
-    """
-    Get weighting factors for different sorting strategies.
-    """
-    strategies = {
-        "smart_balance": {
-            "urgency": 0.4,
-            "importance": 0.3,
-            "effort": 0.2,
-            "dependencies": 0.1
-        },
-        "fastest_wins": {
-            "urgency": 0.2,
-            "importance": 0.2,
-            "effort": 0.6,
-            "dependencies": 0.0
-        },
-        "high_impact": {
-            "urgency": 0.2,
-            "importance": 0.6,
-            "effort": 0.1,
-            "dependencies": 0.1
-        },
-        "deadline_driven": {
-            "urgency": 0.7,
-            "importance": 0.2,
-            "effort": 0.1,
-            "dependencies": 0.0
-        }
-    }
-    
-    return strategies.get(strategy, strategies["smart_balance"])
-
-def calculate_priority_score(task: Dict, all_tasks: List[Dict], strategy: str = "smart_balance") -> Dict[str, Any]:
+def calculate_dependency_score(task: Dict, all_tasks: List[Dict], blocking_index: Dict[Any, int] = None) -> float:
     """
-    Calculate overall priority score for a task using weighted factors.
-    Returns the score breakdown and explanation.
+    Calculate dependency score - tasks that block others get higher priority.
+    Only dependencies that actually exist are counted. Pass a prebuilt
+    blocking_index when scoring many tasks to avoid rescanning all_tasks.
     """
-    # Handle missing or invalid data with defaults
-    due_date = task.get('due_date')
-    estimated_hours = task.get('estimated_hours', 1)
-    importance = task.get('importance', 5)
+    task_id = task.get('id')
     
-    # Calculate individual scores
-    urgency_score = calculate_urgency_score(due_date)
-    effort_score = calculate_effort_score(estimated_hours)
-    importance_score = calculate_importance_score(importance)
-    dependency_score = calculate_dependency_score(task, all_tasks)
+    # If no ID, can't calculate dependencies
+    if task_id is None:
+        return 0.1
     
-    # Get weights for the selected strategy
-    weights = get_strategy_weights(strategy)
-    
-    # Calculate weighted total score (0-1 scale)
-    total_score = (
-        urgency_score * weights["urgency"] +
-        importance_score * weights["importance"] +
-        effort_score * weights["effort"] +
-        dependency_score * weights["dependencies"]
-    )
+    if blocking_index is None:
+        blocking_index = build_blocking_index(all_tasks)
     
-    # Generate explanation
+    return calculate_blocking_score(blocking_index.get(task_id, 0))
+
+# Built-in strategies, in the order they are offered to clients
+STRATEGY_NAMES = list(BUILTIN_STRATEGIES)
+
+def get_strategy_weights(strategy: Any) -> Dict[str, float]:
+    """
+    Get weighting factors for a strategy name or custom definition (see
+    strategies.py); unknown names get smart_balance's. The dict is shared
+    between calls, so don't modify it.
+    """
+    return resolve_strategy(strategy).weights_used
+
+def build_explanation(urgency_score: float, importance_score: float, effort_score: float,
+                      dependency_score: float) -> str:
+    """
+    Describe in words which factors drive a task's priority.
+    """
     explanation_parts = []
     if urgency_score > 0.7:
         explanation_parts.append("very urgent")
@@ -195,24 +457,412 @@ def calculate_priority_score(task: Dict, all_tasks: List[Dict], strategy: str =
     if dependency_score > 0.6:
         explanation_parts.append("blocks other tasks")
     
-    explanation = "This task is " + ", ".join(explanation_parts) if explanation_parts else "This task has average priority across all factors."
+    return "This task is " + ", ".join(explanation_parts) if explanation_parts else "This task has average priority across all factors."
+
+def calculate_factor_scores(task: Dict, all_tasks: List[Dict], blocking_index: Dict[Any, int] = None,
+                            today: date = None, impact_index: Dict[Any, float] = None) -> Tuple[float, ...]:
+    """
+    Calculate the (urgency, importance, effort, dependencies, impact)
+    factor scores for a task. These don't depend on the strategy. Pass a
+    prebuilt impact_index (see build_impact_index) when scoring many tasks.
+    """
+    # Handle missing or invalid data with defaults
+    due_date = task.get('due_date')
+    estimated_hours = task.get('estimated_hours', 1)
+    importance = task.get('importance', 5)
+    
+    return (
+        calculate_urgency_score(due_date, today),
+        calculate_importance_score(importance),
+        calculate_effort_score(estimated_hours),
+        calculate_dependency_score(task, all_tasks, blocking_index),
+        calculate_impact_score(_task_impact(task, all_tasks, impact_index))
+    )
+
+def _task_impact(task: Dict, all_tasks: List[Dict], impact_index: Dict[Any, float] = None) -> float:
+    task_id = task.get('id')
+    if task_id is None:
+        return 0.0
+    if impact_index is None:
+        impact_index = build_impact_index(all_tasks)
+    return impact_index.get(task_id, 0.0)
+
+def calculate_weighted_score(factors: Tuple[float, ...], weights: Dict[str, float]) -> float:
+    """
+    Combine factor scores into a weighted total score (0-1 scale).
+    Without an impact factor (4 factors) the impact weight is ignored.
+    """
+    total = (
+        factors[0] * weights["urgency"] +
+        factors[1] * weights["importance"] +
+        factors[2] * weights["effort"] +
+        factors[3] * weights["dependencies"]
+    )
+    if len(factors) > 4:
+        total += factors[4] * weights["impact"]
+    return total
+
+def calculate_priority_score(task: Dict, all_tasks: List[Dict], strategy: str = "smart_balance",
+                             blocking_index: Dict[Any, int] = None,
+                             impact_index: Dict[Any, float] = None) -> Dict[str, Any]:
+    """
+    Calculate overall priority score for a task using weighted factors.
+    Returns the score breakdown and explanation.
+    
+    The impact factor needs the downstream impact of the whole list: pass
+    a prebuilt impact_index (and blocking_index) when scoring many tasks,
+    or each call builds its own. Without an impact_index, strategies that
+    give impact no weight skip the factor and leave it out of the breakdown.
+    """
+    # Get weights for the selected strategy
+    compiled = resolve_strategy(strategy)
+    with_impact = impact_index is not None or compiled.weights[4] > 0
+    
+    factors = calculate_factor_scores(task, all_tasks, blocking_index,
+                                      impact_index=impact_index if with_impact else {})
+    urgency_score, importance_score, effort_score, dependency_score, impact_score = factors
+    total_score = compiled.score(factors)
+    
+    explanation = build_explanation(urgency_score, importance_score, effort_score, dependency_score)
+    
+    breakdown = {
+        'urgency': round(urgency_score, 4),
+        'importance': round(importance_score, 4),
+        'effort': round(effort_score, 4),
+        'dependencies': round(dependency_score, 4)
+    }
+    if with_impact:
+        breakdown['impact'] = round(impact_score, 4)
     
     return {
         'total_score': round(total_score, 4),
-        'score_breakdown': {
-            'urgency': round(urgency_score, 4),
-            'importance': round(importance_score, 4),
-            'effort': round(effort_score, 4),
-            'dependencies': round(dependency_score, 4)
-        },
-        'weights_used': weights,
+        'score_breakdown': breakdown,
+        'weights_used': compiled.weights_used,
         'explanation': explanation
     }
 
-def analyze_and_sort_tasks(tasks: List[Dict], strategy: str = "smart_balance") -> Dict[str, Any]:
+def _record_factors(record: TaskRecord, blocking_counts: Dict[Any, int], today: date,
+                    impacts: Dict[Any, float] = None) -> Tuple[float, ...]:
+    """
+    calculate_factor_scores for a validated record.
+    """
+    if record.id is None:
+        dependency_score = impact_score = 0.1
+    else:
+        dependency_score = calculate_blocking_score(blocking_counts.get(record.id, 0))
+        impact_score = calculate_impact_score(impacts.get(record.id, 0.0)) if impacts else 0.1
+    
+    return (
+        calculate_urgency_score(record.due_date_value, today),
+        calculate_importance_score(record.importance),
+        calculate_effort_score(record.estimated_hours),
+        dependency_score,
+        impact_score
+    )
+
+def _score_breakdown(row: Tuple[float, ...]) -> Dict[str, float]:
+    urgency_score, importance_score, effort_score, dependency_score, impact_score = row
+    return {
+        'urgency': round(urgency_score, 4),
+        'importance': round(importance_score, 4),
+        'effort': round(effort_score, 4),
+        'dependencies': round(dependency_score, 4),
+        'impact': round(impact_score, 4)
+    }
+
+class ScoredTasks:
+    """
+    Validated task records with their (urgency, importance, effort,
+    dependencies, impact) factor score columns. Columns are lists, or NumPy arrays
+    when the vectorized engine was used. Output dicts are only built when
+    a response is serialized.
+    """
+    __slots__ = ('records', 'factors', '_explanations')
+    
+    def __init__(self, records: List[TaskRecord], factors: Tuple):
+        self.records = records
+        self.factors = factors
+        self._explanations = None
+    
+    def __len__(self) -> int:
+        return len(self.records)
+    
+    @property
+    def is_columnar(self) -> bool:
+        return not isinstance(self.factors[0], list)
+    
+    def factor_lists(self) -> Tuple[List[float], ...]:
+        """
+        Factor columns as Python lists.
+        """
+        return tuple(column if isinstance(column, list) else column.tolist() for column in self.factors)
+    
+    def factor_row(self, i: int) -> Tuple[float, ...]:
+        return tuple(float(column[i]) for column in self.factors)
+    
+    def rounded_totals(self, strategies: List[Strategy]) -> Dict[str, List[float]]:
+        """
+        Rounded weighted totals for each compiled strategy, by name. With
+        NumPy all of them come from a single factor-matrix x weights-matrix
+        product.
+        """
+        if self.is_columnar:
+            from . import vectorized
+            totals = vectorized.weighted_totals(self.factors, strategies)
+            return {
+                strategy.name: [round(total, 4) for total in totals[:, column].tolist()]
+                for column, strategy in enumerate(strategies)
+            }
+        
+        totals_by_strategy = {}
+        for strategy in strategies:
+            score = strategy.score
+            totals_by_strategy[strategy.name] = [round(score(row), 4) for row in zip(*self.factors)]
+        return totals_by_strategy
+    
+    def explanations(self) -> List[str]:
+        """
+        Explanation text for every task, computed once.
+        """
+        if self._explanations is None:
+            if self.is_columnar:
+                from . import vectorized
+                table = vectorized.explanation_table()
+                codes = vectorized.explanation_codes(*self.factors[:4])
+                self._explanations = [table[code] for code in codes.tolist()]
+            else:
+                self._explanations = [build_explanation(*row) for row in zip(*self.factors[:4])]
+        return self._explanations
+    
+    def to_dict(self, i: int, priority_score: float, row: Tuple = None, explanation: str = None,
+                fields: frozenset = None) -> Dict[str, Any]:
+        """
+        Materialize one scored task as an output dict, optionally with only
+        the given fields. Unrequested scores are not computed.
+        """
+        if row is None and (fields is None or 'score_breakdown' in fields or 'explanation' in fields):
+            row = self.factor_row(i)
+        return scored_task_dict(self.records[i], priority_score, row, explanation, fields)
+
+def scored_task_dict(record: TaskRecord, priority_score: float, row: Tuple = None, explanation: str = None,
+                     fields: frozenset = None) -> Dict[str, Any]:
+    """
+    Output dict of one scored record. row (the factor scores) is needed
+    unless fields leaves out both the breakdown and the explanation.
+    """
+    task = record.to_dict()
+    if fields is not None:
+        task = {key: value for key, value in task.items() if key in fields}
+    if fields is None or 'priority_score' in fields:
+        task['priority_score'] = priority_score
+    if fields is None or 'score_breakdown' in fields:
+        task['score_breakdown'] = _score_breakdown(row)
+    if fields is None or 'explanation' in fields:
+        task['explanation'] = build_explanation(*row[:4]) if explanation is None else explanation
+    return task
+
+class Ranking:
+    """
+    One strategy's tasks in priority order, or one page of them. Iterating
+    yields output dicts, built one at a time, optionally projected to
+    `fields`.
+    """
+    __slots__ = ('scored', 'order', 'totals', 'strategy', 'fields')
+    
+    def __init__(self, scored: ScoredTasks, order: List[int], totals: List[float], strategy: str,
+                 fields: frozenset = None):
+        self.scored = scored
+        self.order = order
+        self.totals = totals
+        self.strategy = strategy
+        self.fields = fields
+    
+    def __len__(self) -> int:
+        return len(self.order)
+    
+    def __iter__(self):
+        scored = self.scored
+        if len(self.order) < len(scored):
+            # A page: look up just its rows instead of converting every column
+            for i in self.order:
+                yield scored.to_dict(i, self.totals[i], fields=self.fields)
+            return
+        
+        columns = scored.factor_lists()
+        explanations = scored.explanations()
+        for i in self.order:
+            row = (columns[0][i], columns[1][i], columns[2][i], columns[3][i], columns[4][i])
+            yield scored.to_dict(i, self.totals[i], row, explanations[i], self.fields)
+    
+    def to_list(self) -> List[Dict[str, Any]]:
+        return list(self)
+
+def _compute_factors(records: List[TaskRecord], blocking_counts: Dict[Any, int], impacts: Dict[Any, float],
+                     today: date, errors: List[str]) -> ScoredTasks:
+    """
+    Compute factor scores for validated records.
+    Large lists are scored column-wise with NumPy when it is available;
+    otherwise records are scored one at a time.
+    """
+    if len(records) >= VECTORIZE_THRESHOLD:
+        from . import vectorized
+        
+        if vectorized.is_available():
+            try:
+                return ScoredTasks(records, vectorized.score_factors(records, blocking_counts, today, impacts))
+            except (TypeError, ValueError, OverflowError):
+                pass  # Unusual values (e.g. unhashable ids) get per-task error reporting
+    
+    scored_records = []
+    rows = []
+    for record in records:
+        try:
+            rows.append(_record_factors(record, blocking_counts, today, impacts))
+            scored_records.append(record)
+        except Exception as e:
+            errors.append(f"Error processing task '{record.title}': {str(e)}")
+            continue
+    
+    columns = tuple(map(list, zip(*rows))) if rows else ([], [], [], [], [])
+    return ScoredTasks(scored_records, columns)
+
+def _prepare_tasks(tasks: List[Dict], as_of: date, strict: bool = False) -> Tuple[ScoredTasks, List[str], List[str]]:
+    """
+    Validate, check dependencies and compute factor scores as of one date.
+    Returns (scored tasks, errors, warnings).
+    """
+    records, blocking_counts, impacts, errors, warnings = _prepare_records(tasks, strict)
+    with phase('score'):
+        scored = _compute_factors(records, blocking_counts, impacts, as_of, errors)
+    return scored, errors, warnings
+
+def _prepare_records(tasks: List[Dict], strict: bool = False) -> Tuple[List[TaskRecord], Dict[Any, int],
+                                                                       Dict[Any, float], List[str], List[str]]:
+    """
+    Validate tasks, check dependencies, and count how many tasks each
+    blocks directly and downstream.
+    Returns (records, blocking counts, downstream impacts, errors, warnings).
+    With strict, any error leaves no records to score.
+    """
+    with phase('validate'):
+        records, rejected, errors, warnings = validate_tasks(tasks, strict)
+    count('tasks', len(records))
+    if strict and errors:
+        return [], {}, {}, errors, warnings
+    
+    with phase('dependencies'):
+        blocking_counts, impacts = _check_dependencies(records, rejected, errors)
+    if strict and errors:
+        return [], {}, {}, errors, warnings
+    
+    return records, blocking_counts, impacts, errors, warnings
+
+def _check_dependencies(records: List[TaskRecord], rejected: List[Any],
+                        errors: List[str]) -> Tuple[Dict[Any, int], Dict[Any, float]]:
+    """
+    Add dependency cycle errors and return the blocking count and
+    downstream impact indexes.
+    """
+    ids = [record.id for record in records]
+    dependency_lists = [record.dependencies for record in records]
+    graph = _dependency_graph(ids, dependency_lists)
+    topology = _topological_order(graph[1])
+    
+    # Reject dependency cycles before scoring
+    errors.extend(_cycle_error(cycle) for cycle in _find_cycles(ids, dependency_lists, graph, topology[0]))
+    
+    impacts = _impact_index(ids, dependency_lists, [record.importance for record in records], graph, topology)
+    
+    # Build the reverse-dependency index once for the whole request.
+    # Rejected tasks still count as dependents.
+    rejected = [task for task in rejected if isinstance(task, dict)]
+    blocking_counts = _count_blocking(
+        ids + [task.get('id') for task in rejected],
+        dependency_lists + [task.get('dependencies') for task in rejected]
+    )
+    return blocking_counts, impacts
+
+def compile_strategies(strategies: List[Any]) -> List[Strategy]:
+    """
+    Resolve strategy names and custom definitions, dropping repeated
+    names but keeping order. Raises StrategyError for invalid definitions.
+    """
+    compiled = {}
+    for strategy in strategies:
+        strategy = resolve_strategy(strategy)
+        compiled.setdefault(strategy.name, strategy)
+    return list(compiled.values())
+
+def rank_tasks(tasks: List[Dict], strategies: List[Any], as_of: date = None, workers: int = 1,
+               parallel_threshold: int = PARALLEL_THRESHOLD, limit: int = None, offset: int = 0,
+               fields: List[str] = None, strict: bool = False) -> Dict[str, Any]:
+    """
+    Analyze tasks once and rank them under each strategy, keeping results
+    compact: rankings are Ranking objects whose output dicts are only built
+    when iterated (e.g. while serializing a response).
+    With workers > 1, lists of at least parallel_threshold tasks are scored
+    in a process pool; the results are identical.
+    With a limit, each ranking holds only positions offset..offset+limit,
+    chosen by partial selection rather than a full sort. Strategies are
+    names or custom definitions; rankings are keyed by strategy name.
+    fields restricts
+    the keys of each output dict. With strict, the first invalid task (or
+    any dependency cycle) is reported as the error and nothing is scored.
+    """
+    strategies = compile_strategies(strategies)
+    as_of = as_of or date.today()
+    
+    records, blocking_counts, impacts, errors, warnings = _prepare_records(tasks, strict)
+    
+    ranked = None
+    if workers > 1 and len(records) >= parallel_threshold:
+        from . import parallel
+        try:
+            # Scoring and sorting happen together in the workers
+            with phase('score'):
+                scored, ranked = parallel.rank_records(records, blocking_counts, impacts, as_of, strategies,
+                                                       workers)
+        except (TypeError, ValueError, OverflowError):
+            pass  # Unusual values get per-task error reporting below
+    
+    if ranked is None:
+        with phase('score'):
+            scored = _compute_factors(records, blocking_counts, impacts, as_of, errors)
+            strategy_totals = scored.rounded_totals(strategies)
+        ranked = {}
+        with phase('sort'):
+            for strategy, totals in strategy_totals.items():
+                # Sort by priority score (descending); ties keep input order
+                if limit is None:
+                    order = sorted(range(len(scored)), key=totals.__getitem__, reverse=True)
+                else:
+                    # nlargest matches the first offset + limit of the stable sort
+                    order = heapq.nlargest(offset + limit, range(len(scored)), key=totals.__getitem__)
+                ranked[strategy] = (order, totals)
+    
+    fields = frozenset(fields) if fields is not None else None
+    rankings = {}
+    for strategy, (order, totals) in ranked.items():
+        if limit is not None:
+            order = order[offset:offset + limit]
+        rankings[strategy] = Ranking(scored, order, totals, strategy, fields)
+    
+    return {
+        'rankings': rankings,
+        'total_tasks': len(scored),
+        'errors': errors,
+        'warnings': warnings,
+        'strategies_used': [strategy.name for strategy in strategies],
+        'as_of': as_of.isoformat()
+    }
+
+def analyze_and_sort_tasks(tasks: List[Dict], strategy: Any = "smart_balance", as_of: date = None,
+                           workers: int = 1, parallel_threshold: int = PARALLEL_THRESHOLD) -> Dict[str, Any]:
     """
     Main function: Analyze tasks, calculate scores, and return sorted list.
-    SIMPLIFIED: No complex dependency checks that cause errors.
+    Dependency cycles are reported as errors. Urgency is computed as of
+    one date for the whole request (default: today). Pass workers > 1 to
+    score lists of at least parallel_threshold tasks in a process pool.
     """
     # Validate input
     if not tasks:
@@ -222,62 +872,67 @@ def analyze_and_sort_tasks(tasks: List[Dict], strategy: str = "smart_balance") -
             'warnings': []
         }
     
-    errors = []
-    warnings = []
+    result = rank_tasks(tasks, [strategy], as_of, workers, parallel_threshold)
+    strategy = result['strategies_used'][0]
     
-    # SIMPLIFIED: Skip circular dependency check for now
-    # circular_errors = detect_circular_dependencies(tasks)
-    # errors.extend(circular_errors)
+    return {
+        'sorted_tasks': result['rankings'][strategy].to_list(),
+        'errors': result['errors'],
+        'warnings': result['warnings'],
+        'strategy_used': strategy,
+        'as_of': result['as_of']
+    }
+
+def analyze_tasks_by_strategy(tasks: List[Dict], strategies: List[str] = None, as_of: date = None) -> Dict[str, Any]:
+    """
+    Analyze tasks once and return one sorted ranking per strategy.
+    Factor scores are shared; only the weighted totals differ per strategy.
+    Defaults to every built-in strategy.
+    """
+    if strategies is None:
+        strategies = list(STRATEGY_NAMES)
     
-    # Calculate scores for each task
-    scored_tasks = []
-    for i, task in enumerate(tasks):
-        try:
-            # Ensure each task has basic required fields
-            if not task.get('title'):
-                errors.append(f"Task at index {i} is missing a title")
-                continue
-            
-            # Assign ID if missing
-            if 'id' not in task:
-                task['id'] = i + 1
-            
-            # Ensure estimated_hours is valid
-            estimated_hours = task.get('estimated_hours')
-            if estimated_hours is None or estimated_hours <= 0:
-                task['estimated_hours'] = 1
-                warnings.append(f"Task '{task.get('title')}' has invalid estimated hours, using default 1")
-            
-            # Ensure importance is valid
-            importance = task.get('importance')
-            if importance is None or not (1 <= importance <= 10):
-                task['importance'] = 5
-                warnings.append(f"Task '{task.get('title')}' has invalid importance, using default 5")
-            
-            # Ensure dependencies is a list
-            if 'dependencies' not in task or not isinstance(task['dependencies'], list):
-                task['dependencies'] = []
-            
-            # Calculate priority score
-            score_result = calculate_priority_score(task, tasks, strategy)
-            scored_task = {
-                **task,
-                'priority_score': score_result['total_score'],
-                'score_breakdown': score_result['score_breakdown'],
-                'explanation': score_result['explanation']
-            }
-            scored_tasks.append(scored_task)
-            
-        except Exception as e:
-            errors.append(f"Error processing task '{task.get('title', 'Unknown')}': {str(e)}")
-            continue
+    if not tasks:
+        return {
+            'rankings': {},
+            'errors': ['No tasks provided'],
+            'warnings': []
+        }
     
-    # Sort by priority score (descending)
-    sorted_tasks = sorted(scored_tasks, key=lambda x: x['priority_score'], reverse=True)
+    result = rank_tasks(tasks, strategies, as_of)
+    result['rankings'] = {strategy: ranking.to_list() for strategy, ranking in result['rankings'].items()}
+    return result
+
+def select_top_tasks(tasks: List[Dict], strategy: Any = "smart_balance", k: int = 3,
+                     as_of: date = None, strict: bool = False) -> Dict[str, Any]:
+    """
+    Return the k highest-priority tasks without sorting the whole list.
+    Uses heap selection over the scores and only builds the score breakdown
+    and explanation for the tasks that are returned. The order matches the
+    first k tasks of analyze_and_sort_tasks.
+    """
+    if not tasks:
+        return {
+            'top_tasks': [],
+            'errors': ['No tasks provided'],
+            'warnings': []
+        }
+    
+    as_of = as_of or date.today()
+    strategy = resolve_strategy(strategy)
+    scored, errors, warnings = _prepare_tasks(tasks, as_of, strict)
+    with phase('score'):
+        totals = scored.rounded_totals([strategy])[strategy.name]
+    
+    # nlargest keeps input order among equal scores, like a stable sort
+    with phase('sort'):
+        top_indexes = heapq.nlargest(k, range(len(scored)), key=totals.__getitem__)
     
     return {
-        'sorted_tasks': sorted_tasks,
+        'top_tasks': [scored.to_dict(i, totals[i]) for i in top_indexes],
+        'total_tasks': len(scored),
         'errors': errors,
         'warnings': warnings,
-        'strategy_used': strategy
-    }
\ No newline at end of file
+        'strategy_used': strategy.name,
+        'as_of': as_of.isoformat()
+    }
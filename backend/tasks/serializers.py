@@ -0,0 +1,103 @@
+"""
+JSON encoding for analysis responses.
+
+dumps() uses orjson when it is installed and falls back to the standard
+library encoder. Compact mode sends each task's score breakdown as an
+array in BREAKDOWN_FIELDS order and its explanation as an index into one
+shared list of distinct explanations.
+"""
+import json
+from typing import Any, Dict, List, Tuple
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; the stdlib encoder is used instead
+    orjson = None
+
+from .metrics import phase
+from .scoring import Ranking
+
+# Order of the score breakdown arrays in compact responses
+BREAKDOWN_FIELDS = ['urgency', 'importance', 'effort', 'dependencies', 'impact']
+
+class CompactRanking:
+    """
+    A ranking whose output dicts carry the score breakdown as an array and
+    the explanation as an index.
+    """
+    __slots__ = ('ranking', 'explanation_codes')
+
+    def __init__(self, ranking: Ranking, explanation_codes: List[int]):
+        self.ranking = ranking
+        self.explanation_codes = explanation_codes
+
+    def __len__(self) -> int:
+        return len(self.ranking)
+
+    def __iter__(self):
+        ranking = self.ranking
+        scored = ranking.scored
+        fields = ranking.fields
+        # Whole rankings convert the factor columns once; pages look up rows
+        columns = scored.factor_lists() if len(ranking) == len(scored) else None
+        for i in ranking.order:
+            task = scored.records[i].to_dict()
+            if fields is not None:
+                task = {key: value for key, value in task.items() if key in fields}
+            if fields is None or 'priority_score' in fields:
+                task['priority_score'] = ranking.totals[i]
+            if fields is None or 'score_breakdown' in fields:
+                row = scored.factor_row(i) if columns is None else [column[i] for column in columns]
+                task['score_breakdown'] = [round(score, 4) for score in row]
+            if fields is None or 'explanation' in fields:
+                task['explanation'] = self.explanation_codes[i]
+            yield task
+
+def compact_rankings(rankings: Dict[str, Ranking]) -> Tuple[Dict[str, CompactRanking], List[str]]:
+    """
+    Compact versions of rankings that share one scoring pass, plus the
+    distinct explanations their indexes refer to.
+    """
+    if not rankings:
+        return {}, []
+    scored = next(iter(rankings.values())).scored
+    index = {}
+    codes = [index.setdefault(explanation, len(index)) for explanation in scored.explanations()]
+    compact = {strategy: CompactRanking(ranking, codes) for strategy, ranking in rankings.items()}
+    return compact, list(index)
+
+class TaskJSONEncoder(DjangoJSONEncoder):
+    """
+    Builds output task dicts from compact rankings while encoding.
+    """
+    def default(self, o):
+        if isinstance(o, (Ranking, CompactRanking)):
+            return list(o)
+        return super().default(o)
+
+def _orjson_default(o):
+    if isinstance(o, (Ranking, CompactRanking)):
+        return list(o)
+    raise TypeError
+
+def dumps(data: Any) -> bytes:
+    """
+    Encode a response body. Values orjson can't encode (e.g. Decimal or
+    integers over 64 bits) fall back to the standard library encoder.
+    """
+    with phase('serialize'):
+        if orjson is not None:
+            try:
+                return orjson.dumps(data, default=_orjson_default)
+            except (orjson.JSONEncodeError, TypeError):
+                pass
+        return json.dumps(data, cls=TaskJSONEncoder).encode()
+
+def json_response(data: Any, status: int = 200) -> HttpResponse:
+    """
+    JsonResponse equivalent that encodes with dumps().
+    """
+    return HttpResponse(dumps(data), content_type='application/json', status=status)
@@ -0,0 +1,387 @@
+"""
+Incremental analysis sessions.
+
+A session keeps one analyzed task list (one strategy, one as-of date) in
+memory, so after the first analysis clients only send the tasks they
+added, changed or removed. A delta re-scores the changed tasks, the tasks
+whose blocking count changed and the upstream tasks whose downstream
+impact changed, and moves just those entries within a sorted list using
+bisect: a one-task edit costs a few dictionary updates and one list
+insert/delete per affected task instead of a full analysis.
+
+Sessions live in a per-process store bounded by count and idle time. A
+client that gets 404 for an expired session (or one held by another
+worker process) starts a new session.
+"""
+import bisect
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+from datetime import date
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+
+from .records import TaskRecord
+from .scoring import (
+    _compute_factors, _cycle_error, _prepare_records, _record_factors,
+    calculate_importance_score, scored_task_dict
+)
+from .strategies import resolve_strategy
+from .validation import validate_tasks
+
+class DeltaRejected(ValueError):
+    """
+    The tasks or delta failed validation; nothing was applied.
+    """
+    def __init__(self, errors: List[str], warnings: List[str] = None):
+        super().__init__('; '.join(errors))
+        self.errors = errors
+        self.warnings = warnings or []
+
+class SessionEntry:
+    __slots__ = ('record', 'seq', 'row', 'total', 'key', 'weight', 'dependency_count')
+
+    def __init__(self, record: TaskRecord, seq: int):
+        self.record = record
+        self.seq = seq  # Position in the client's list; breaks score ties like a stable sort
+        self.weight = calculate_importance_score(record.importance)  # Its share of upstream impact
+        self.dependency_count = 0  # Distinct dependencies present in the session
+        self.row = None
+        self.total = None
+        self.key = None  # (-total, seq, id) while the entry is in the sorted order
+
+def _unique_dependencies(dependencies: Any) -> set:
+    if not dependencies or not isinstance(dependencies, list):
+        return set()
+    return {dependency for dependency in dependencies if isinstance(dependency, Hashable)}
+
+def _id_errors(records: List[TaskRecord]) -> List[str]:
+    errors = []
+    seen = set()
+    for record in records:
+        if record.id is None or not isinstance(record.id, Hashable):
+            errors.append(f"Task '{record.title}' needs a string or integer id")
+        elif record.id in seen:
+            errors.append(f"Task id {record.id} appears more than once")
+        else:
+            seen.add(record.id)
+    return errors
+
+class AnalysisSession:
+    """
+    One strategy's ranking of a task list, kept sorted as the list changes.
+    Callers hold `lock` while applying deltas and reading results.
+    """
+    def __init__(self, strategy: Any, as_of: date):
+        self.id = secrets.token_urlsafe(16)
+        self.compiled = resolve_strategy(strategy)
+        self.strategy = self.compiled.name
+        self.as_of = as_of
+        self.entries = {}  # task id -> SessionEntry
+        self.dependents = {}  # task id -> ids of the tasks that list it as a dependency
+        self.impact = {}  # task id -> downstream impact, for tasks that have any
+        self.order = []  # entry keys, highest priority first
+        self.next_seq = 0
+        self.lock = threading.Lock()
+        self.last_used = time.monotonic()
+
+    @classmethod
+    def create(cls, tasks: List[Dict], strategy: Any, as_of: date = None) -> Tuple['AnalysisSession', List[str]]:
+        """
+        Analyze a full task list. Returns the session and the validation
+        warnings; raises DeltaRejected when the list has errors.
+        """
+        session = cls(strategy, as_of or date.today())
+        records, blocking_counts, impacts, errors, warnings = _prepare_records(tasks)
+        errors.extend(_id_errors(records))
+        if not errors:
+            scored = _compute_factors(records, blocking_counts, impacts, session.as_of, errors)
+        if errors:
+            raise DeltaRejected(errors, warnings)
+
+        columns = scored.factor_lists()
+        totals = scored.rounded_totals([session.compiled])[session.strategy]
+        session.impact = impacts
+        for i, record in enumerate(scored.records):
+            entry = SessionEntry(record, i)
+            entry.row = (columns[0][i], columns[1][i], columns[2][i], columns[3][i], columns[4][i])
+            entry.total = totals[i]
+            entry.key = (-entry.total, i, record.id)
+            session.entries[record.id] = entry
+            session._link(record)
+        for entry in session.entries.values():
+            entry.dependency_count = session._dependency_count(entry.record)
+        session.order = sorted(entry.key for entry in session.entries.values())
+        session.next_seq = len(scored.records)
+        return session, warnings
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def apply(self, upsert: List[Dict], remove: List[Any]) -> Tuple[List[Any], List[Any], List[str]]:
+        """
+        Add or replace the tasks in `upsert` (matched by id) and drop the
+        ids in `remove`. Returns (ids whose score changed, ids removed,
+        warnings); raises DeltaRejected, leaving the session unchanged,
+        when the delta is invalid or would create a dependency cycle.
+        """
+        if not isinstance(upsert, list) or not isinstance(remove, list):
+            raise DeltaRejected(['upsert and remove must be lists'])
+        errors = [f"Task at index {i} of upsert has no id" for i, task in enumerate(upsert)
+                  if not isinstance(task, dict) or 'id' not in task]
+        if errors:
+            raise DeltaRejected(errors)
+
+        records, _, errors, warnings = validate_tasks(upsert)
+        errors.extend(_id_errors(records))
+        removed = {task_id for task_id in remove if isinstance(task_id, Hashable) and task_id in self.entries}
+        for record in records:
+            if not isinstance(record.id, Hashable):
+                continue
+            if record.id in removed:
+                errors.append(f"Task id {record.id} is both updated and removed")
+            try:
+                _record_factors(record, {}, self.as_of)
+            except Exception as e:
+                errors.append(f"Error processing task '{record.title}': {str(e)}")
+        if not errors:
+            cycle = self._find_cycle(records, removed)
+            if cycle:
+                errors.append(_cycle_error(cycle))
+        if errors:
+            raise DeltaRejected(errors, warnings)
+
+        affected = set()  # Tasks whose direct dependents changed
+        appeared = set(removed)  # Tasks that were added or removed
+        for task_id in removed:
+            entry = self.entries.pop(task_id)
+            self._unplace(entry)
+            self.impact.pop(task_id, None)
+            affected.update(self._unlink(entry.record))
+        for record in records:
+            entry = self.entries.get(record.id)
+            if entry is None:
+                entry = self.entries[record.id] = SessionEntry(record, self.next_seq)
+                self.next_seq += 1
+                appeared.add(record.id)
+            else:
+                affected.update(self._unlink(entry.record))
+                entry.record = record
+                entry.weight = calculate_importance_score(record.importance)
+            affected.update(self._link(record))
+        for record in records:
+            self.entries[record.id].dependency_count = self._dependency_count(record)
+
+        # Tasks depending on one that appeared or disappeared now split
+        # their impact credit between a different number of dependencies
+        stale_impact = affected.union(record.id for record in records)
+        for task_id in appeared:
+            for dependent in self.dependents.get(task_id, ()):
+                entry = self.entries[dependent]
+                entry.dependency_count = self._dependency_count(entry.record)
+                stale_impact.update(_unique_dependencies(entry.record.dependencies))
+
+        changed = [record.id for record in records]
+        for task_id in (affected | self._update_impacts(stale_impact)).difference(changed):
+            if task_id in self.entries and self._rescore(self.entries[task_id]):
+                changed.append(task_id)
+        for record in records:
+            self._rescore(self.entries[record.id], force=True)
+        return changed, sorted(removed, key=str), warnings
+
+    def rank(self, task_id: Any) -> int:
+        """
+        1-based position of a task in priority order.
+        """
+        return bisect.bisect_left(self.order, self.entries[task_id].key) + 1
+
+    def tasks(self, offset: int = 0, limit: int = None, fields: frozenset = None) -> List[Dict[str, Any]]:
+        """
+        Output dicts for a window of the ranking.
+        """
+        end = None if limit is None else offset + limit
+        return [self.task_dict(self.entries[key[2]], fields) for key in self.order[offset:end]]
+
+    def task_dict(self, entry: SessionEntry, fields: frozenset = None) -> Dict[str, Any]:
+        return scored_task_dict(entry.record, entry.total, entry.row, fields=fields)
+
+    def _link(self, record: TaskRecord) -> set:
+        dependencies = _unique_dependencies(record.dependencies)
+        for dependency in dependencies:
+            self.dependents.setdefault(dependency, set()).add(record.id)
+        return dependencies
+
+    def _unlink(self, record: TaskRecord) -> set:
+        dependencies = _unique_dependencies(record.dependencies)
+        for dependency in dependencies:
+            dependents = self.dependents[dependency]
+            dependents.discard(record.id)
+            if not dependents:
+                del self.dependents[dependency]
+        return dependencies
+
+    def _unplace(self, entry: SessionEntry):
+        if entry.key is not None:
+            del self.order[bisect.bisect_left(self.order, entry.key)]
+            entry.key = None
+
+    def _rescore(self, entry: SessionEntry, force: bool = False) -> bool:
+        """
+        Recompute an entry's scores and move it if its total changed.
+        Returns whether anything changed.
+        """
+        task_id = entry.record.id
+        row = _record_factors(entry.record, {task_id: len(self.dependents.get(task_id, ()))}, self.as_of,
+                              self.impact)
+        total = round(self.compiled.score(row), 4)
+        if not force and row == entry.row:
+            return False
+        entry.row = row
+        key = (-total, entry.seq, task_id)
+        if key != entry.key:
+            self._unplace(entry)
+            entry.total = total
+            entry.key = key
+            bisect.insort(self.order, key)
+        return True
+
+    def _dependency_count(self, record: TaskRecord) -> int:
+        dependencies = _unique_dependencies(record.dependencies)
+        return sum(1 for dependency in dependencies if dependency in self.entries)
+
+    def _update_impacts(self, stale: Iterable) -> set:
+        """
+        Recompute the downstream impact of the stale tasks and everything
+        upstream of them, each after all of its dependents (Kahn's
+        algorithm within that upstream set). Returns the ids whose impact
+        changed. Dependents are summed in list order, as in the full pass.
+        """
+        pending = [task_id for task_id in stale if task_id in self.entries]
+        upstream = set(pending)
+        while pending:
+            for dependency in _unique_dependencies(self.entries[pending.pop()].record.dependencies):
+                if dependency in self.entries and dependency not in upstream:
+                    upstream.add(dependency)
+                    pending.append(dependency)
+
+        waiting = {task_id: sum(1 for dependent in self.dependents.get(task_id, ()) if dependent in upstream)
+                   for task_id in upstream}
+        ready = [task_id for task_id, count in waiting.items() if not count]
+        impact = self.impact
+        changed = set()
+        for task_id in ready:  # Grows while it is walked, like a FIFO queue
+            total = 0.0
+            dependents = sorted((self.entries[dependent] for dependent in self.dependents.get(task_id, ())),
+                                key=lambda entry: entry.seq)
+            for entry in dependents:
+                total += (entry.weight + impact.get(entry.record.id, 0.0)) / entry.dependency_count
+            if total != self.impact.get(task_id, 0.0):
+                changed.add(task_id)
+                if total:
+                    self.impact[task_id] = total
+                else:
+                    del self.impact[task_id]
+            for dependency in _unique_dependencies(self.entries[task_id].record.dependencies):
+                if dependency in waiting:
+                    waiting[dependency] -= 1
+                    if not waiting[dependency]:
+                        ready.append(dependency)
+        return changed
+
+    def _find_cycle(self, records: List[TaskRecord], removed: set) -> Optional[List[Any]]:
+        """
+        A dependency cycle the delta would create, or None. The current
+        graph is acyclic, so any new cycle runs through an upserted task;
+        each one is searched for a path from its dependencies back to it.
+        """
+        new_dependencies = {record.id: _unique_dependencies(record.dependencies) for record in records}
+
+        def dependencies_of(task_id) -> Iterable:
+            if task_id in new_dependencies:
+                return new_dependencies[task_id]
+            entry = self.entries.get(task_id)
+            return _unique_dependencies(entry.record.dependencies) if entry is not None else ()
+
+        def exists(task_id) -> bool:
+            return task_id not in removed and (task_id in new_dependencies or task_id in self.entries)
+
+        for record in records:
+            path = [record.id]
+            stack = [iter(dependencies_of(record.id))]
+            visited = {record.id}
+            while stack:
+                for dependency in stack[-1]:
+                    if dependency == record.id:
+                        return path
+                    if dependency not in visited and exists(dependency):
+                        visited.add(dependency)
+                        path.append(dependency)
+                        stack.append(iter(dependencies_of(dependency)))
+                        break
+                else:
+                    stack.pop()
+                    path.pop()
+        return None
+
+class SessionStore:
+    """
+    Sessions by id, evicting the least recently used past max_sessions and
+    any left idle for ttl seconds.
+    """
+    def __init__(self, max_sessions: int, ttl: float):
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._sessions)
+
+    def add(self, session: AnalysisSession):
+        with self._lock:
+            self._expire(time.monotonic())
+            while len(self._sessions) >= self.max_sessions:
+                self._sessions.popitem(last=False)
+            self._sessions[session.id] = session
+
+    def get(self, session_id: str) -> Optional[AnalysisSession]:
+        now = time.monotonic()
+        with self._lock:
+            self._expire(now)
+            session = self._sessions.get(session_id)
+            if session is not None:
+                session.last_used = now
+                self._sessions.move_to_end(session_id)
+            return session
+
+    def discard(self, session_id: str) -> bool:
+        with self._lock:
+            return self._sessions.pop(session_id, None) is not None
+
+    def _expire(self, now: float):
+        # Least recently used first, so stop at the first live session
+        while self._sessions:
+            session = next(iter(self._sessions.values()))
+            if now - session.last_used <= self.ttl:
+                break
+            self._sessions.popitem(last=False)
+
+_store = None
+_store_lock = threading.Lock()
+
+def get_session_store() -> SessionStore:
+    """
+    The process-wide session store, sized from settings on first use.
+    """
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = SessionStore(
+                getattr(settings, 'TASK_ANALYZER_SESSION_MAX', 100),
+                getattr(settings, 'TASK_ANALYZER_SESSION_TTL', 1800)
+            )
+        return _store
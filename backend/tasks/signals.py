@@ -0,0 +1,57 @@
+"""
+Keep the materialized scores on Task current as rows are saved and deleted.
+"""
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .materialized import (
+    STRATEGY_SCORE_FIELDS, adjust_blocking_counts, apply_scores, count_dependents, unique_dependencies
+)
+from .models import Task
+
+@receiver(pre_save, sender=Task)
+def rescore_task(sender, instance, raw=False, **kwargs):
+    """
+    Recompute the task's own scores before it is written, and remember the
+    dependency list it had so post_save can update blocking counts.
+    blocking_count is only changed by these handlers, never by the caller.
+    """
+    if raw:
+        return
+    previous, blocking_count = None, 0
+    if instance.pk is not None:
+        stored = Task.objects.filter(pk=instance.pk).values_list('dependencies', 'blocking_count').first()
+        if stored is not None:
+            previous, blocking_count = stored
+    # The stored count is authoritative; an instance loaded earlier may be stale
+    instance.blocking_count = blocking_count
+    instance._previous_dependencies = unique_dependencies(previous)
+    apply_scores(instance)
+
+@receiver(post_save, sender=Task)
+def update_dependency_blocking_counts(sender, instance, created=False, raw=False, **kwargs):
+    """
+    Tasks added to the dependency list now block one more task; tasks
+    removed from it block one fewer. A new task already blocks the stored
+    tasks that listed its id before it existed.
+    """
+    if raw:
+        return
+    previous = getattr(instance, '_previous_dependencies', set())
+    current = unique_dependencies(instance.dependencies)
+    deltas = {task_id: 1 for task_id in current - previous}
+    deltas.update((task_id, -1) for task_id in previous - current)
+    waiting = count_dependents(instance.pk) if created else 0
+    if waiting:
+        deltas[instance.pk] = deltas.get(instance.pk, 0) + waiting
+    adjust_blocking_counts(deltas)
+    if waiting:
+        instance.refresh_from_db(fields=['blocking_count', *STRATEGY_SCORE_FIELDS.values()])
+    instance._previous_dependencies = current
+
+@receiver(post_delete, sender=Task)
+def release_dependency_blocking_counts(sender, instance, **kwargs):
+    """
+    A deleted task no longer blocks on its dependencies.
+    """
+    adjust_blocking_counts({task_id: -1 for task_id in unique_dependencies(instance.dependencies)})
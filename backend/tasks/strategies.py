@@ -0,0 +1,287 @@
+"""
+Scoring strategies.
+
+A strategy weighs the five factor scores (urgency, importance, effort,
+dependencies, impact) into one priority score, optionally ignoring a
+factor while its score is below a threshold. Besides the built-in
+strategies, teams can define their own:
+
+    {"name": "ops", "weights": {"urgency": 0.5, "impact": 0.5},
+     "thresholds": {"urgency": 0.5}}
+
+either per request (in place of a strategy name) or server-side in the
+TASK_ANALYZER_STRATEGIES setting, which makes them available by name.
+Each definition is validated and compiled once into a Strategy whose
+score() takes a factor row with its weights bound as locals, so scoring
+a task does no dict lookups. Request-defined strategies are kept in a
+bounded LRU registry keyed by a hash of the definition.
+"""
+import hashlib
+import json
+import math
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+# Factor order of score rows and weight vectors
+FACTOR_NAMES = ('urgency', 'importance', 'effort', 'dependencies', 'impact')
+
+# Built-in strategy weights, in the order they are offered to clients
+BUILTIN_WEIGHTS = {
+    "smart_balance": {
+        "urgency": 0.4,
+        "importance": 0.3,
+        "effort": 0.2,
+        "dependencies": 0.1,
+        "impact": 0.0
+    },
+    "fastest_wins": {
+        "urgency": 0.2,
+        "importance": 0.2,
+        "effort": 0.6,
+        "dependencies": 0.0,
+        "impact": 0.0
+    },
+    "high_impact": {
+        "urgency": 0.2,
+        "importance": 0.6,
+        "effort": 0.1,
+        "dependencies": 0.1,
+        "impact": 0.0
+    },
+    "deadline_driven": {
+        "urgency": 0.7,
+        "importance": 0.2,
+        "effort": 0.1,
+        "dependencies": 0.0,
+        "impact": 0.0
+    },
+    # Ranks by how much work sits downstream of a task, not just how
+    # many tasks wait on it directly
+    "downstream_impact": {
+        "urgency": 0.3,
+        "importance": 0.2,
+        "effort": 0.1,
+        "dependencies": 0.0,
+        "impact": 0.4
+    }
+}
+
+# Unknown strategy names are scored with this one
+DEFAULT_STRATEGY = "smart_balance"
+
+# Compiled request-defined strategies kept per process
+DEFAULT_REGISTRY_SIZE = 256
+
+MAX_NAME_LENGTH = 64
+
+# How far custom weights may be from adding up to 1
+WEIGHT_SUM_TOLERANCE = 1e-6
+
+class StrategyError(ValueError):
+    """
+    A custom strategy definition is invalid; the message is for the client.
+    """
+
+class Strategy:
+    """
+    A compiled strategy. `score(row)` weighs one (urgency, importance,
+    effort, dependencies, impact) row; `key` is the built-in strategy it
+    scores like, or the definition hash of a custom one.
+    """
+    __slots__ = ('name', 'key', 'weights', 'thresholds', 'weights_used', 'score')
+
+    def __init__(self, name: str, weights: Tuple[float, ...], thresholds: Optional[Tuple[float, ...]] = None,
+                 key: str = None):
+        self.name = name
+        self.key = key or name
+        self.weights = tuple(weights)
+        self.thresholds = tuple(thresholds) if thresholds else None
+        self.weights_used = dict(zip(FACTOR_NAMES, self.weights))
+        self.score = _compile(self.weights, self.thresholds)
+
+    def __reduce__(self):
+        # The compiled closure can't be pickled; process pool workers recompile
+        return Strategy, (self.name, self.weights, self.thresholds, self.key)
+
+    def __repr__(self):
+        return f'<Strategy {self.name}>'
+
+def _compile(weights: Tuple[float, ...], thresholds: Optional[Tuple[float, ...]]) -> Callable[[Tuple], float]:
+    """
+    Scoring function with the weights (and thresholds) bound as locals.
+    Terms are added in factor order, like calculate_weighted_score, so
+    built-in totals are bit-for-bit the same.
+    """
+    w0, w1, w2, w3, w4 = weights
+    if thresholds is None:
+        def score(row):
+            urgency, importance, effort, dependencies, impact = row
+            return urgency * w0 + importance * w1 + effort * w2 + dependencies * w3 + impact * w4
+        return score
+
+    t0, t1, t2, t3, t4 = thresholds
+    def score(row):
+        urgency, importance, effort, dependencies, impact = row
+        return ((urgency * w0 if urgency >= t0 else 0.0) +
+                (importance * w1 if importance >= t1 else 0.0) +
+                (effort * w2 if effort >= t2 else 0.0) +
+                (dependencies * w3 if dependencies >= t3 else 0.0) +
+                (impact * w4 if impact >= t4 else 0.0))
+    return score
+
+BUILTIN_STRATEGIES = {
+    name: Strategy(name, tuple(weights[factor] for factor in FACTOR_NAMES))
+    for name, weights in BUILTIN_WEIGHTS.items()
+}
+
+@lru_cache(maxsize=64)
+def _fallback(name: str) -> Strategy:
+    default = BUILTIN_STRATEGIES[DEFAULT_STRATEGY]
+    strategy = Strategy(name, default.weights, key=default.key)
+    strategy.weights_used = default.weights_used
+    return strategy
+
+def definition_key(definition: Any) -> str:
+    """
+    Hash of a strategy definition; key order and whitespace don't matter.
+    """
+    canonical = json.dumps(definition, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+def _factor_values(values: Any, field: str) -> Tuple[float, ...]:
+    """
+    A {factor: number between 0 and 1} object as a tuple in factor order,
+    with 0.0 for factors it leaves out.
+    """
+    if not isinstance(values, dict):
+        raise StrategyError(f'{field} must be an object of factor names to numbers')
+    unknown = [factor for factor in values if factor not in FACTOR_NAMES]
+    if unknown:
+        raise StrategyError(f'Unknown factors in {field}: {", ".join(map(str, unknown))}; '
+                            f'expected {", ".join(FACTOR_NAMES)}')
+    for factor, value in values.items():
+        if isinstance(value, bool) or not isinstance(value, (int, float)) or not 0 <= value <= 1:
+            raise StrategyError(f'{field}.{factor} must be a number between 0 and 1')
+    return tuple(float(values.get(factor, 0.0)) for factor in FACTOR_NAMES)
+
+def compile_definition(definition: Any, key: str = None) -> Strategy:
+    """
+    Validate a custom strategy definition and compile it. Raises
+    StrategyError when it is invalid.
+    """
+    if not isinstance(definition, dict):
+        raise StrategyError('A strategy must be a strategy name or an object with "weights", '
+                            'and optionally "thresholds" and "name"')
+    unknown = [field for field in definition if field not in ('name', 'weights', 'thresholds')]
+    if unknown:
+        raise StrategyError(f'Unknown strategy fields: {", ".join(map(str, unknown))}')
+
+    weights = _factor_values(definition.get('weights'), 'weights')
+    if not math.isclose(sum(weights), 1.0, abs_tol=WEIGHT_SUM_TOLERANCE):
+        raise StrategyError('weights must add up to 1')
+    thresholds = definition.get('thresholds')
+    thresholds = _factor_values(thresholds, 'thresholds') if thresholds else None
+
+    key = key or definition_key(definition)
+    name = definition.get('name', f'custom-{key[:12]}')
+    if not isinstance(name, str) or not 0 < len(name) <= MAX_NAME_LENGTH:
+        raise StrategyError(f'name must be a string of 1 to {MAX_NAME_LENGTH} characters')
+    if name in BUILTIN_STRATEGIES:
+        raise StrategyError(f'{name} is a built-in strategy; give the custom strategy another name')
+    return Strategy(name, weights, thresholds, key)
+
+class StrategyRegistry:
+    """
+    Server-side strategies by name, plus the most recently used compiled
+    request-defined strategies by definition hash (bounded, LRU).
+    """
+    def __init__(self, max_size: int = DEFAULT_REGISTRY_SIZE, named: Dict[str, Any] = None):
+        self.max_size = max_size
+        self.named = {}
+        self.compiled = OrderedDict()
+        self.lock = threading.Lock()
+        for name, definition in (named or {}).items():
+            self.register(name, definition)
+
+    def __len__(self) -> int:
+        return len(self.compiled)
+
+    def register(self, name: str, definition: Dict) -> Strategy:
+        """
+        Make a strategy available by name. Registered strategies are never
+        evicted; registering a name again replaces it.
+        """
+        if not isinstance(definition, dict):
+            raise StrategyError(f'Strategy {name} must be an object with "weights"')
+        strategy = compile_definition(dict(definition, name=name))
+        with self.lock:
+            self.named[name] = strategy
+        return strategy
+
+    def get(self, name: str) -> Optional[Strategy]:
+        return self.named.get(name)
+
+    def compile(self, definition: Any) -> Strategy:
+        """
+        The compiled strategy for a definition, compiling and caching it
+        the first time it is seen.
+        """
+        key = definition_key(definition)
+        with self.lock:
+            strategy = self.compiled.get(key)
+            if strategy is not None:
+                self.compiled.move_to_end(key)
+                return strategy
+
+        strategy = compile_definition(definition, key)
+        with self.lock:
+            self.compiled[key] = strategy
+            while len(self.compiled) > self.max_size:
+                self.compiled.popitem(last=False)
+        return strategy
+
+_registry = None
+_registry_lock = threading.Lock()
+
+def get_strategy_registry() -> StrategyRegistry:
+    """
+    The process-wide registry, loaded from settings on first use.
+    """
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            try:
+                named = getattr(settings, 'TASK_ANALYZER_STRATEGIES', {})
+                max_size = getattr(settings, 'TASK_ANALYZER_STRATEGY_CACHE_SIZE', DEFAULT_REGISTRY_SIZE)
+            except ImproperlyConfigured:
+                named, max_size = {}, DEFAULT_REGISTRY_SIZE  # Used outside Django
+            _registry = StrategyRegistry(max_size, named)
+        return _registry
+
+def resolve_strategy(strategy: Any) -> Strategy:
+    """
+    The compiled strategy for a built-in or registered name, or for a
+    custom definition. Unknown names score like smart_balance but keep
+    their name. Raises StrategyError for invalid definitions.
+    """
+    if isinstance(strategy, str):
+        compiled = BUILTIN_STRATEGIES.get(strategy) or get_strategy_registry().get(strategy)
+        return compiled or _fallback(strategy)
+    return get_strategy_registry().compile(strategy)
+
+def is_known_strategy(name: Any) -> bool:
+    """
+    Whether a name is a built-in or registered strategy.
+    """
+    return isinstance(name, str) and (name in BUILTIN_STRATEGIES or get_strategy_registry().get(name) is not None)
+
+def strategy_names() -> list:
+    """
+    Built-in strategy names followed by the registered ones.
+    """
+    return list(BUILTIN_STRATEGIES) + list(get_strategy_registry().named)
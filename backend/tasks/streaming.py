@@ -0,0 +1,64 @@
+"""
+Newline-delimited JSON (application/x-ndjson) input and output.
+
+Tasks are parsed one line at a time from the request stream, so a large
+export never has to be held as one bytes object or one list of dicts.
+Results are written back one task per line.
+"""
+import json
+from typing import Dict, Iterable, Iterator
+
+from .serializers import dumps
+
+NDJSON_CONTENT_TYPE = 'application/x-ndjson'
+
+class PayloadTooLarge(Exception):
+    """
+    Raised when a request exceeds the configured task or byte limit.
+    """
+
+def check_content_length(request, max_bytes: int):
+    """
+    Reject a request up front when its declared size is over the limit.
+    """
+    try:
+        content_length = int(request.META.get('CONTENT_LENGTH') or 0)
+    except ValueError:
+        content_length = 0
+    if content_length > max_bytes:
+        raise PayloadTooLarge(f'Request body is larger than {max_bytes} bytes')
+
+def iter_ndjson_tasks(stream, max_tasks: int, max_bytes: int) -> Iterator[Dict]:
+    """
+    Yield one task dict per non-blank line of the stream.
+    Raises PayloadTooLarge as soon as a limit is crossed and ValueError for
+    a line that is not a JSON object.
+    """
+    bytes_read = 0
+    task_count = 0
+    for line_number, line in enumerate(stream, 1):
+        bytes_read += len(line)
+        if bytes_read > max_bytes:
+            raise PayloadTooLarge(f'Request body is larger than {max_bytes} bytes')
+        if not line.strip():
+            continue
+
+        task_count += 1
+        if task_count > max_tasks:
+            raise PayloadTooLarge(f'More than {max_tasks} tasks in one request')
+
+        try:
+            task = json.loads(line)
+        except json.JSONDecodeError:
+            raise ValueError(f'Line {line_number} is not valid JSON')
+        if not isinstance(task, dict):
+            raise ValueError(f'Line {line_number} is not a JSON object')
+        yield task
+
+def ndjson_lines(header: Dict, tasks: Iterable[Dict]) -> Iterator[bytes]:
+    """
+    Serialize a header object followed by one line per task.
+    """
+    yield dumps(header) + b'\n'
+    for task in tasks:
+        yield dumps(task) + b'\n'
@@ -1,7 +1,18 @@
-from django.test import TestCase
+from django.core.handlers.asgi import ASGIHandler
+from django.core.management import call_command
+from django.test import TestCase, override_settings
 from django.urls import reverse
+from unittest import mock, skipUnless
+from . import (
+    batch, cache, executor, materialized, metrics, parallel, schedule, scoring, serializers, sessions, strategies,
+    validation, vectorized
+)
+from .models import Task
 from .scoring import *
+import copy
+import io
 import json
+import pickle
 from datetime import date, timedelta
 
 class ScoringAlgorithmTests(TestCase):
@@ -57,6 +68,24 @@ class ScoringAlgorithmTests(TestCase):
         none_score = calculate_urgency_score(None)
         self.assertEqual(none_score, 0.3)
     
+    def test_urgency_table_and_as_of(self):
+        """Test the urgency lookup table and scoring against a pinned date"""
+        as_of = date(2025, 1, 1)
+        for days in range(-5, 400):
+            due = (as_of + timedelta(days=days)).strftime('%Y-%m-%d')
+            expected = 1.0 if days < 0 else 0.9 if days == 0 else 0.8 if days <= 1 else \
+                0.7 if days <= 3 else 0.5 if days <= 7 else 0.3 if days <= 14 else max(0.1, 10 / days)
+            self.assertEqual(calculate_urgency_score(due, as_of), expected)
+
+        self.assertEqual(calculate_urgency_score("not a date", as_of), 0.3)
+        self.assertEqual(calculate_urgency_score(["2025-01-01"], as_of), 0.3)
+
+        # Results depend only on the pinned date, not on the current day
+        tasks = [{"id": 1, "title": "Due soon", "due_date": "2025-01-02", "estimated_hours": 2, "importance": 5}]
+        result = analyze_and_sort_tasks(copy.deepcopy(tasks), "deadline_driven", as_of=as_of)
+        self.assertEqual(result['as_of'], "2025-01-01")
+        self.assertEqual(result['sorted_tasks'][0]['score_breakdown']['urgency'], 0.8)
+
     def test_effort_score_calculation(self):
         """Test effort score calculation (inverted - lower effort = higher score)"""
         # Quick task should have high score
@@ -89,6 +118,114 @@ class ScoringAlgorithmTests(TestCase):
         self.assertTrue(len(errors) > 0)
         self.assertIn("circular", errors[0].lower())
     
+    def test_cycle_members_reported(self):
+        """Test every cycle is reported with its member ids, without recursion limits"""
+        chain_length = 50000
+        tasks = [{"id": i, "title": f"Task {i}", "dependencies": [i + 1]} for i in range(chain_length)]
+        tasks[-1]["dependencies"] = [0]  # Close one very long cycle
+        tasks.append({"id": "self", "title": "Self", "dependencies": ["self"]})
+        tasks.append({"id": "free", "title": "Free", "dependencies": [0]})
+
+        cycles = find_dependency_cycles(tasks)
+        self.assertEqual(len(cycles), 2)
+        self.assertEqual(sorted(len(cycle) for cycle in cycles), [1, chain_length])
+        self.assertIn(["self"], cycles)
+
+        result = analyze_and_sort_tasks(tasks[-2:])
+        self.assertEqual(len(result['errors']), 1)
+        self.assertIn("circular", result['errors'][0].lower())
+
+    def test_blocking_index(self):
+        """Test reverse-dependency counts used for the dependency score"""
+        tasks = [
+            {"id": 1, "title": "Root", "dependencies": []},
+            {"id": 2, "title": "Child A", "dependencies": [1, 1]},  # Duplicate counts once
+            {"id": 3, "title": "Child B", "dependencies": [1, 2]},
+            {"id": 4, "title": "Orphan", "dependencies": [99]},  # Unknown id ignored
+        ]
+
+        index = build_blocking_index(tasks)
+        self.assertEqual(index, {1: 2, 2: 1})
+
+        self.assertEqual(calculate_dependency_score(tasks[0], tasks, index), 0.7)
+        self.assertEqual(calculate_dependency_score(tasks[1], tasks, index), 0.4)
+        self.assertEqual(calculate_dependency_score(tasks[3], tasks, index), 0.1)
+        # Without a prebuilt index the same score is computed
+        self.assertEqual(calculate_dependency_score(tasks[0], tasks), 0.7)
+
+    @skipUnless(vectorized.is_available(), "NumPy is not installed")
+    def test_vectorized_scores_match_python(self):
+        """Test the NumPy engine gives exactly the pure-Python scores"""
+        tasks = []
+        for i in range(300):
+            tasks.append({
+                "id": i + 1,
+                "title": f"Task {i}",
+                "due_date": (self.today + timedelta(days=(i * 7) % 90 - 10)).strftime('%Y-%m-%d') if i % 5 else None,
+                "estimated_hours": [0.5, 1, 1.5, 3, 6, 9, 13.7, 40][i % 8],
+                "importance": [1, 3, 5, 7.5, 10][i % 5],
+                "dependencies": [j for j in (i // 2, i // 3) if j]
+            })
+
+        for strategy in ["smart_balance", "fastest_wins", "high_impact", "deadline_driven"]:
+            with mock.patch.object(scoring, 'VECTORIZE_THRESHOLD', 10 ** 9):
+                expected = analyze_and_sort_tasks(copy.deepcopy(tasks), strategy)
+            with mock.patch.object(scoring, 'VECTORIZE_THRESHOLD', 1), \
+                    mock.patch.object(vectorized, 'score_factors', wraps=vectorized.score_factors) as engine:
+                actual = analyze_and_sort_tasks(copy.deepcopy(tasks), strategy)
+            self.assertTrue(engine.called)
+            self.assertEqual(actual['sorted_tasks'], expected['sorted_tasks'])
+
+    def test_all_strategies_in_one_pass(self):
+        """Test multi-strategy rankings match single-strategy analysis"""
+        for threshold in (10 ** 9, 1):
+            with mock.patch.object(scoring, 'VECTORIZE_THRESHOLD', threshold):
+                result = analyze_tasks_by_strategy(copy.deepcopy(self.sample_tasks))
+                self.assertEqual(result['strategies_used'], STRATEGY_NAMES)
+                for strategy in STRATEGY_NAMES:
+                    expected = analyze_and_sort_tasks(copy.deepcopy(self.sample_tasks), strategy)
+                    self.assertEqual(result['rankings'][strategy], expected['sorted_tasks'])
+
+    def test_top_k_selection(self):
+        """Test top-k selection matches the head of the full ranking, ties included"""
+        tasks = [
+            {"id": i, "title": f"Task {i}", "estimated_hours": [1, 3, 9][i % 3],
+             "importance": [5, 8][i % 2], "dependencies": []}
+            for i in range(1, 40)
+        ]
+
+        for threshold in (10 ** 9, 1):
+            with mock.patch.object(scoring, 'VECTORIZE_THRESHOLD', threshold):
+                expected = analyze_and_sort_tasks(copy.deepcopy(tasks), "fastest_wins")['sorted_tasks']
+                with mock.patch.object(scoring, 'build_explanation', wraps=build_explanation) as explain:
+                    result = select_top_tasks(copy.deepcopy(tasks), "fastest_wins", k=5)
+
+            self.assertEqual(result['top_tasks'], expected[:5])
+            self.assertEqual(result['total_tasks'], len(tasks))
+            # Explanations are only built for the returned tasks
+            self.assertEqual(explain.call_count, 5)
+
+    def test_compact_records_leave_input_untouched(self):
+        """Test analysis works on records without mutating the caller's dicts"""
+        tasks = [
+            {"title": "No id or hours", "importance": 50, "dependencies": "bad", "owner": "sam"},
+            {"id": 7, "title": "Has due date", "due_date": None, "estimated_hours": 3, "importance": 4}
+        ]
+        original = copy.deepcopy(tasks)
+
+        result = rank_tasks(tasks, ["smart_balance"])
+        self.assertEqual(tasks, original)
+
+        ranking = result['rankings']['smart_balance']
+        self.assertEqual(len(ranking), 2)
+        by_title = {task['title']: task for task in ranking}
+        first = by_title["No id or hours"]
+        self.assertEqual((first['id'], first['estimated_hours'], first['importance']), (1, 1, 5))
+        self.assertEqual(first['dependencies'], [])
+        self.assertEqual(first['owner'], "sam")  # Unknown fields are echoed back
+        self.assertNotIn('due_date', first)
+        self.assertIsNone(by_title["Has due date"]['due_date'])
+
     def test_different_strategies(self):
         """Test that different strategies produce different weights"""
         smart_weights = get_strategy_weights("smart_balance")
@@ -113,6 +250,298 @@ class ScoringAlgorithmTests(TestCase):
         self.assertGreater(result['sorted_tasks'][0]['priority_score'], 
                           result['sorted_tasks'][1]['priority_score'])
 
+    def test_parallel_scoring_matches_single_process(self):
+        """Test process-pool scoring gives the same ranking as one process"""
+        tasks = [
+            {"id": i, "title": f"Task {i}", "due_date": (date(2025, 1, 1) + timedelta(days=i % 40)).isoformat(),
+             "estimated_hours": (i % 12) + 0.5, "importance": (i % 10) + 1,
+             "dependencies": [i - 1] if i % 3 else []}
+            for i in range(1, 301)
+        ]
+        tasks[5]['due_date'] = None
+        tasks[7]['id'] = None
+
+        expected = analyze_and_sort_tasks(tasks, "smart_balance", date(2025, 1, 1))
+        with mock.patch.object(parallel, 'rank_records', wraps=parallel.rank_records) as rank_records:
+            result = analyze_and_sort_tasks(tasks, "smart_balance", date(2025, 1, 1),
+                                            workers=2, parallel_threshold=100)
+        rank_records.assert_called_once()
+        self.assertEqual(result, expected)
+
+
+    def test_rank_tasks_page_and_fields(self):
+        """Test a page of the ranking matches the same slice of the full ranking"""
+        tasks = [
+            {"id": i, "title": f"Task {i}", "estimated_hours": (i * 7) % 11 + 1, "importance": i % 10 + 1}
+            for i in range(1, 41)
+        ]
+        full = rank_tasks(tasks, ["smart_balance"], date(2025, 1, 1))['rankings']["smart_balance"].to_list()
+        result = rank_tasks(tasks, ["smart_balance"], date(2025, 1, 1), limit=5, offset=10)
+        page = result['rankings']["smart_balance"].to_list()
+
+        self.assertEqual(result['total_tasks'], 40)
+        self.assertEqual(page, full[10:15])
+
+        result = rank_tasks(tasks, ["smart_balance"], date(2025, 1, 1), limit=3, fields=["title", "explanation"])
+        projected = result['rankings']["smart_balance"].to_list()
+        self.assertEqual(projected, [{"title": t["title"], "explanation": t["explanation"]} for t in full[:3]])
+
+    def test_benchmark_generator_and_comparison(self):
+        """Test generated task graphs are reproducible and acyclic, and regressions are flagged"""
+        from benchmarks.generator import generate_tasks
+        from benchmarks.suite import compare
+
+        tasks = generate_tasks(500, seed=3, max_dependencies=4, today=date(2025, 1, 1))
+        self.assertEqual(tasks, generate_tasks(500, seed=3, max_dependencies=4, today=date(2025, 1, 1)))
+        self.assertEqual(find_dependency_cycles(tasks), [])
+        self.assertTrue(all(dependency < task['id'] for task in tasks for dependency in task['dependencies']))
+
+        # Medians are compared, so one slow or fast run doesn't decide
+        baseline = {'results': {'case[n=1]': {'seconds': 0.5, 'median_seconds': 1.0, 'peak_bytes': 100}}}
+        current = {'results': {'case[n=1]': {'seconds': 0.9, 'median_seconds': 1.1, 'peak_bytes': 200}}}
+        self.assertEqual([r['metric'] for r in compare(current, baseline, threshold=0.2)], ['peak_bytes'])
+        current['results']['case[n=1]']['median_seconds'] = 1.5
+        self.assertEqual([r['metric'] for r in compare(current, baseline, threshold=0.2)],
+                         ['median_seconds', 'peak_bytes'])
+
+    def test_latency_histogram(self):
+        """Test histogram buckets are cumulative and end with +Inf"""
+        histogram = metrics.Histogram((0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 3):
+            histogram.observe(value)
+        self.assertEqual(histogram.cumulative(), [('0.1', 2), ('1.0', 3), ('+Inf', 4)])
+        self.assertEqual((histogram.count, histogram.sum), (4, 3.65))
+
+    def test_session_store_bounds(self):
+        """Test the session store evicts the least recently used and idle sessions"""
+        store = sessions.SessionStore(max_sessions=2, ttl=60)
+        created = [sessions.AnalysisSession('smart_balance', date(2025, 1, 1)) for _ in range(3)]
+        store.add(created[0])
+        store.add(created[1])
+        store.get(created[0].id)
+        store.add(created[2])
+        self.assertIsNone(store.get(created[1].id))
+        self.assertIs(store.get(created[0].id), created[0])
+
+        created[0].last_used -= 61
+        created[2].last_used -= 61
+        self.assertIsNone(store.get(created[0].id))
+        self.assertEqual(len(store), 0)
+
+    def test_downstream_impact(self):
+        """Test transitive impact counts whole chains and never double-counts shared tasks"""
+        chain = [{"id": i, "title": f"Step {i}", "estimated_hours": 4, "importance": 10,
+                  "dependencies": [i - 1] if i > 1 else []} for i in range(1, 201)]
+        impact = build_impact_index(chain)
+        self.assertAlmostEqual(impact[1], 199)
+        self.assertAlmostEqual(impact[150], 50)
+        self.assertNotIn(200, impact)
+
+        # 2 and 3 both feed 4, which feeds 5: 1 has 4 tasks downstream
+        diamond = [
+            {"id": 1, "title": "Root", "importance": 10},
+            {"id": 2, "title": "Left", "importance": 10, "dependencies": [1]},
+            {"id": 3, "title": "Right", "importance": 10, "dependencies": [1]},
+            {"id": 4, "title": "Join", "importance": 10, "dependencies": [2, 3]},
+            {"id": 5, "title": "Ship", "importance": 10, "dependencies": [4]},
+        ]
+        impact = build_impact_index(diamond)
+        self.assertAlmostEqual(impact[1], 4)
+        self.assertAlmostEqual(impact[2], 1)
+        self.assertAlmostEqual(impact[4], 1)
+
+        # The head of a long chain outranks a task with three direct dependents
+        tasks = chain[:60] + [
+            {"id": 1000, "title": "Hub", "estimated_hours": 4, "importance": 10},
+            *({"id": 1000 + i, "title": f"Leaf {i}", "estimated_hours": 4, "importance": 1, "dependencies": [1000]}
+              for i in range(1, 4))
+        ]
+        for threshold in (10 ** 9, 1):
+            with mock.patch.object(scoring, 'VECTORIZE_THRESHOLD', threshold):
+                result = analyze_and_sort_tasks(copy.deepcopy(tasks), 'downstream_impact', date(2025, 1, 1))
+                self.assertEqual(result['sorted_tasks'][0]['title'], "Step 1")
+                hub = next(task for task in result['sorted_tasks'] if task['title'] == "Hub")
+                self.assertEqual(hub['score_breakdown']['dependencies'], 1.0)
+                self.assertLess(hub['score_breakdown']['impact'], result['sorted_tasks'][0]['score_breakdown']['impact'])
+        expected = calculate_priority_score(tasks[0], tasks, 'downstream_impact')
+        self.assertEqual(result['sorted_tasks'][0]['priority_score'], expected['total_score'])
+
+        # Without an impact index, strategies that don't weigh impact skip it
+        with mock.patch.object(scoring, 'build_impact_index') as build:
+            skipped = calculate_priority_score(tasks[0], tasks, 'smart_balance')
+        build.assert_not_called()
+        self.assertNotIn('impact', skipped['score_breakdown'])
+        indexed = calculate_priority_score(tasks[0], tasks, 'smart_balance', impact_index=build_impact_index(tasks))
+        self.assertEqual(skipped['total_score'], indexed['total_score'])
+
+    def test_critical_path_schedule(self):
+        """Test earliest/latest times, slack, critical path and missed due dates"""
+        tasks = [
+            {"id": 1, "title": "Design", "estimated_hours": 8, "importance": 5},
+            {"id": 2, "title": "Backend", "estimated_hours": 16, "importance": 5, "dependencies": [1]},
+            {"id": 3, "title": "Frontend", "estimated_hours": 4, "importance": 5, "dependencies": [1]},
+            {"id": 4, "title": "Launch", "due_date": "2025-01-02", "estimated_hours": 2, "importance": 5,
+             "dependencies": [2, 3]},
+            {"id": 5, "title": "Blog post", "due_date": "2025-01-01", "estimated_hours": 3, "importance": 5},
+        ]
+        result = schedule.build_schedule(tasks, date(2025, 1, 1))
+        rows = {row['id']: row for row in result['tasks']}
+        self.assertEqual(result['critical_path'], [1, 2, 4])
+        self.assertEqual(result['total_hours'], 26)
+        self.assertEqual(result['finish_date'], '2025-01-04')
+        self.assertEqual((rows[4]['earliest_start'], rows[4]['earliest_finish']), (24, 26))
+        self.assertEqual((rows[3]['slack'], rows[3]['latest_start']), (12, 20))
+        self.assertEqual([row['id'] for row in result['tasks'] if row['critical']], [1, 2, 4])
+        self.assertEqual((rows[4]['days_late'], rows[5]['days_late'], result['late_tasks']), (2, 0, 1))
+        # Every task comes after the tasks it depends on
+        self.assertLess([row['id'] for row in result['tasks']].index(2), [row['id'] for row in result['tasks']].index(4))
+
+        # Twelve-hour days finish launch a day sooner
+        self.assertEqual(schedule.build_schedule(tasks, date(2025, 1, 1), 12)['tasks'][-1]['days_late'], 1)
+
+        chain = [{"id": i, "title": f"Step {i}", "estimated_hours": 0.1, "importance": 5,
+                  "dependencies": [i - 1] if i > 1 else []} for i in range(1, 5001)]
+        result = schedule.build_schedule(chain, date(2025, 1, 1))
+        self.assertEqual(len(result['critical_path']), 5000)
+        self.assertTrue(all(row['critical'] for row in result['tasks']))
+
+        cyclic = schedule.build_schedule([{"id": 1, "title": "A", "dependencies": [2]},
+                                          {"id": 2, "title": "B", "dependencies": [1]}])
+        self.assertEqual((cyclic['tasks'], len(cyclic['errors'])), ([], 1))
+
+    def test_validation_aggregates_problems(self):
+        """Test validation problems are counted per rule with a capped list of task ids"""
+        tasks = [{"id": i, "title": f"Task {i}", "estimated_hours": 0, "importance": 5} for i in range(1, 31)]
+        tasks.append({"id": 31, "title": "Unrated", "estimated_hours": 2, "importance": 11})
+        records, rejected, errors, warnings = validation.validate_tasks(tasks)
+        self.assertEqual((len(records), rejected, errors), (31, [], []))
+        self.assertEqual(warnings, [
+            "30 tasks have invalid estimated hours, using default 1 (task ids: 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, ...)",
+            "Task 'Unrated' has invalid importance, using default 5",
+        ])
+
+        _, rejected, errors, _ = validation.validate_tasks([{"id": 1}, {"id": 2, "title": ""}, "oops"])
+        self.assertEqual(len(rejected), 3)
+        self.assertEqual(errors[0], "2 tasks are missing a title (task ids: 1, 2)")
+        self.assertIn("Error processing task 'Unknown'", errors[1])
+
+        # Strict mode stops at the first problem and scores nothing
+        result = rank_tasks(tasks, ['smart_balance'], date(2025, 1, 1), strict=True)
+        self.assertEqual(result['errors'], ["Task 'Task 1' has invalid estimated hours"])
+        self.assertEqual((result['total_tasks'], result['warnings']), (0, []))
+        cyclic = [{"id": 1, "title": "A", "dependencies": [2]}, {"id": 2, "title": "B", "dependencies": [1]}]
+        for task in cyclic:
+            task.update(estimated_hours=1, importance=5)
+        result = rank_tasks(cyclic, ['smart_balance'], strict=True)
+        self.assertEqual((len(result['errors']), result['total_tasks']), (1, 0))
+
+    def test_custom_strategies(self):
+        """Test custom strategies are validated, compiled once and scored the same by every engine"""
+        definition = {"name": "ops", "weights": {"urgency": 0.5, "importance": 0.2, "impact": 0.3},
+                      "thresholds": {"urgency": 0.5}}
+        registry = strategies.StrategyRegistry(max_size=2)
+        compiled = registry.compile(definition)
+        self.assertIs(registry.compile(dict(reversed(definition.items()))), compiled)
+        self.assertEqual(compiled.weights, (0.5, 0.2, 0.0, 0.0, 0.3))
+        # Urgency below its threshold adds nothing
+        self.assertAlmostEqual(compiled.score((0.4, 1.0, 1.0, 1.0, 0.5)), 0.35)
+        self.assertAlmostEqual(pickle.loads(pickle.dumps(compiled)).score((0.9, 1.0, 1.0, 1.0, 0.5)), 0.8)
+        registry.compile({"weights": {"effort": 1}})
+        registry.compile({"weights": {"urgency": 1}})
+        self.assertEqual(len(registry), 2)
+        self.assertNotIn(compiled, registry.compiled.values())
+
+        for invalid in ({"weights": {"urgency": 0.5}}, {"weights": {"speed": 1}}, {"weights": {"urgency": "1"}},
+                        {"name": "smart_balance", "weights": {"urgency": 1}}, ["urgency"]):
+            with self.assertRaises(strategies.StrategyError):
+                strategies.compile_definition(invalid)
+
+        # Built-in weights are compiled once, not rebuilt per call
+        self.assertIs(get_strategy_weights("fastest_wins"), get_strategy_weights("fastest_wins"))
+        self.assertIs(get_strategy_weights("no_such_strategy"), get_strategy_weights("smart_balance"))
+
+        tasks = [{"id": i, "title": f"Task {i}", "due_date": (self.today + timedelta(days=i % 40)).isoformat(),
+                  "estimated_hours": 1 + i % 9, "importance": 1 + i % 10, "dependencies": [i - 1] if i % 3 else []}
+                 for i in range(1, 801)]
+        results = []
+        for threshold in (10 ** 9, 1):
+            with mock.patch.object(scoring, 'VECTORIZE_THRESHOLD', threshold):
+                result = rank_tasks(tasks, [definition, "smart_balance"], self.today)
+                self.assertEqual(result['strategies_used'], ["ops", "smart_balance"])
+                results.append({name: ranking.to_list() for name, ranking in result['rankings'].items()})
+        self.assertEqual(results[0], results[1])
+        top = results[0]["ops"][0]
+        self.assertEqual(top['priority_score'], calculate_priority_score(tasks[top['id'] - 1], tasks, definition)['total_score'])
+
+class MaterializedScoreTests(TestCase):
+
+    def test_scores_follow_saves_and_deletes(self):
+        """Test blocking counts and composite scores are kept current"""
+        blocker = Task.objects.create(title="Blocker", estimated_hours=3, importance=6)
+        dependent = Task.objects.create(title="Dependent", estimated_hours=1, importance=4,
+                                        dependencies=[blocker.id, blocker.id])
+        blocker.refresh_from_db()
+        self.assertEqual(blocker.blocking_count, 1)
+
+        tasks = [{'id': blocker.id, 'title': "Blocker", 'estimated_hours': 3, 'importance': 6},
+                 {'id': dependent.id, 'title': "Dependent", 'estimated_hours': 1, 'importance': 4,
+                  'dependencies': [blocker.id]}]
+        for strategy, field in materialized.STRATEGY_SCORE_FIELDS.items():
+            expected = analyze_and_sort_tasks(tasks, strategy)['sorted_tasks']
+            scores = {task['title']: task['priority_score'] for task in expected}
+            self.assertEqual(getattr(blocker, field), scores["Blocker"])
+
+        # A stale instance must not overwrite the maintained count
+        stale = Task.objects.get(pk=blocker.pk)
+        Task.objects.create(title="Second", estimated_hours=1, importance=4, dependencies=[blocker.id])
+        stale.title = "Renamed blocker"
+        stale.save()
+        blocker.refresh_from_db()
+        self.assertEqual(blocker.blocking_count, 2)
+
+        dependent.dependencies = []
+        dependent.save()
+        Task.objects.filter(title="Second").delete()
+        materialized.adjust_blocking_counts({blocker.id: -1})
+        blocker.refresh_from_db()
+        self.assertEqual(blocker.blocking_count, 0)
+        self.assertEqual(blocker.score_smart_balance, calculate_priority_score(
+            {'id': blocker.id, 'estimated_hours': 3, 'importance': 6}, [], "smart_balance")['total_score'])
+
+    def test_blocking_count_of_task_created_after_its_dependents(self):
+        """Test a new task counts the stored tasks that already listed its id"""
+        first = Task.objects.create(title="First", estimated_hours=1, importance=5)
+        blocker_id = first.id + 2
+        Task.objects.create(title="Early dependent", estimated_hours=1, importance=5,
+                            dependencies=[blocker_id, blocker_id])
+        blocker = Task.objects.create(title="Late blocker", estimated_hours=3, importance=6)
+        self.assertEqual(blocker.id, blocker_id)
+        self.assertEqual(blocker.blocking_count, 1)
+        stored = Task.objects.get(pk=blocker_id)
+        self.assertEqual(stored.blocking_count, 1)
+        self.assertEqual(stored.score_smart_balance, blocker.score_smart_balance)
+        self.assertEqual(materialized.count_dependents(first.id), 0)
+
+    def test_roll_task_urgency_command(self):
+        """Test the daily command moves urgency forward"""
+        today = date.today()
+        task = Task.objects.create(title="Soon", due_date=today + timedelta(days=3),
+                                   estimated_hours=2, importance=5)
+        Task.objects.create(title="Someday", estimated_hours=2, importance=5)
+        self.assertEqual(task.urgency_score, 0.7)
+
+        self.assertEqual(materialized.stale_urgency_tasks(today + timedelta(days=2)).count(), 1)
+        call_command('roll_task_urgency', date=(today + timedelta(days=2)).isoformat(), stdout=io.StringIO())
+        task.refresh_from_db()
+        self.assertEqual(task.urgency_score, 0.8)
+        self.assertEqual(task.scored_on, today + timedelta(days=2))
+
+        Task.objects.filter(pk=task.pk).update(blocking_count=5)
+        call_command('roll_task_urgency', full=True, batch_size=1, stdout=io.StringIO())
+        task.refresh_from_db()
+        self.assertEqual(task.blocking_count, 0)
+        self.assertEqual(task.urgency_score, 0.7)
+
 class APITests(TestCase):
     
     def test_analyze_tasks_endpoint(self):
@@ -139,4 +568,524 @@ class APITests(TestCase):
         self.assertEqual(response.status_code, 200)
         data = response.json()
         self.assertEqual(data['status'], 'success')
-        self.assertEqual(len(data['data']['sorted_tasks']), 1)
\ No newline at end of file
+        self.assertEqual(len(data['data']['sorted_tasks']), 1)
+
+    def test_analyze_all_strategies_endpoint(self):
+        """Test requesting every strategy's ranking in one call"""
+        sample_data = {
+            "tasks": [
+                {"id": 1, "title": "Long task", "estimated_hours": 12, "importance": 9, "dependencies": []},
+                {"id": 2, "title": "Quick task", "estimated_hours": 0.5, "importance": 4, "dependencies": []}
+            ],
+            "strategies": "all"
+        }
+
+        response = self.client.post(
+            reverse('analyze-tasks'),
+            data=json.dumps(sample_data),
+            content_type='application/json'
+        )
+
+        self.assertEqual(response.status_code, 200)
+        rankings = response.json()['data']['rankings']
+        self.assertEqual(list(rankings), STRATEGY_NAMES)
+        self.assertEqual(rankings['fastest_wins'][0]['title'], "Quick task")
+        self.assertEqual(rankings['high_impact'][0]['title'], "Long task")
+
+        sample_data['strategies'] = ["fastest_wins", "no_such_strategy"]
+        response = self.client.post(
+            reverse('analyze-tasks'),
+            data=json.dumps(sample_data),
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_suggest_tasks_top_k(self):
+        """Test the suggest endpoint returns k suggestions"""
+        tasks = [
+            {"id": i, "title": f"Task {i}", "estimated_hours": i, "importance": 5, "dependencies": []}
+            for i in range(1, 11)
+        ]
+
+        response = self.client.get(reverse('suggest-tasks'), {'tasks': json.dumps(tasks), 'k': 5})
+        self.assertEqual(response.status_code, 200)
+        suggestions = response.json()['suggestions']
+        self.assertEqual([s['rank'] for s in suggestions], [1, 2, 3, 4, 5])
+        self.assertEqual(suggestions[0]['task'], "Task 1")
+
+        response = self.client.get(reverse('suggest-tasks'), {'tasks': json.dumps(tasks)})
+        self.assertEqual(len(response.json()['suggestions']), 3)
+
+        response = self.client.get(reverse('suggest-tasks'), {'tasks': json.dumps(tasks), 'k': 'many'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_invalid_as_of_rejected(self):
+        """Test an invalid as_of date is rejected"""
+        response = self.client.post(
+            reverse('analyze-tasks'),
+            data=json.dumps({"tasks": [{"title": "Task"}], "as_of": "01/02/2025"}),
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def post_ndjson(self, lines, query=''):
+        return self.client.post(
+            reverse('analyze-tasks') + query,
+            data='\n'.join(lines).encode(),
+            content_type='application/x-ndjson'
+        )
+
+    def test_analyze_ndjson_streaming(self):
+        """Test NDJSON in, streamed NDJSON out"""
+        lines = [
+            json.dumps({"id": 1, "title": "Slow", "estimated_hours": 20, "importance": 3}),
+            "",
+            json.dumps({"id": 2, "title": "Quick", "estimated_hours": 1, "importance": 9}),
+        ]
+        response = self.post_ndjson(lines, '?strategy=fastest_wins&as_of=2025-01-01')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        rows = [json.loads(line) for line in b''.join(response.streaming_content).splitlines()]
+        self.assertEqual(rows[0]['status'], 'success')
+        self.assertEqual(rows[0]['as_of'], '2025-01-01')
+        self.assertEqual([row['title'] for row in rows[1:]], ["Quick", "Slow"])
+
+        response = self.post_ndjson(['{"title": "ok"}', '[1, 2]'])
+        self.assertEqual(response.status_code, 400)
+
+    def test_analyze_large_json_body(self):
+        """Test JSON bodies over Django's default 2.5MB limit are accepted up to the configured size"""
+        tasks = [{"id": i, "title": f"Task {i}", "description": "x" * 100000, "estimated_hours": 1, "importance": 5}
+                 for i in range(30)]
+        body = json.dumps({"tasks": tasks})
+        self.assertGreater(len(body), 2621440)
+        response = self.client.post(reverse('analyze-tasks'), data=body, content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()['data']['sorted_tasks']), 30)
+
+        with self.settings(TASK_ANALYZER_MAX_BODY_BYTES=len(body) - 1):
+            response = self.client.post(reverse('analyze-tasks'), data=body, content_type='application/json')
+        self.assertEqual(response.status_code, 413)
+
+    @override_settings(TASK_ANALYZER_MAX_TASKS=2)
+    def test_analyze_ndjson_task_limit(self):
+        """Test requests over the task limit are rejected"""
+        lines = [json.dumps({"title": f"Task {i}"}) for i in range(3)]
+        response = self.post_ndjson(lines)
+        self.assertEqual(response.status_code, 413)
+
+    def create_stored_tasks(self):
+        blocker = Task.objects.create(title="Blocker", due_date=date(2025, 1, 3),
+                                      estimated_hours=2, importance=6)
+        Task.objects.create(title="Dependent", due_date=date(2025, 1, 20),
+                            estimated_hours=4, importance=9, dependencies=[blocker.id])
+        Task.objects.create(title="Someday", estimated_hours=1, importance=2)
+
+    def test_analyze_stored_tasks(self):
+        """Test ranking stored tasks with filters"""
+        self.create_stored_tasks()
+        response = self.client.get(reverse('analyze-stored-tasks'), {'as_of': '2025-01-01'})
+
+        self.assertEqual(response.status_code, 200)
+        sorted_tasks = response.json()['data']['sorted_tasks']
+        self.assertEqual(len(sorted_tasks), 3)
+        self.assertEqual(sorted_tasks[0]['title'], "Blocker")
+        self.assertEqual(sorted_tasks[0]['due_date'], "2025-01-03")
+
+        response = self.client.get(reverse('analyze-stored-tasks'),
+                                   {'due_before': '2025-01-10', 'min_importance': 5})
+        titles = [task['title'] for task in response.json()['data']['sorted_tasks']]
+        self.assertEqual(titles, ["Blocker"])
+
+        response = self.client.get(reverse('analyze-stored-tasks'), {'min_importance': 'high'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_suggest_stored_tasks(self):
+        """Test suggestions from stored tasks"""
+        self.create_stored_tasks()
+        response = self.client.get(reverse('suggest-stored-tasks'),
+                                   {'k': 2, 'as_of': '2025-01-01', 'min_importance': 5})
+
+        self.assertEqual(response.status_code, 200)
+        suggestions = response.json()['suggestions']
+        self.assertEqual([s['task'] for s in suggestions], ["Blocker", "Dependent"])
+
+        Task.objects.all().delete()
+        response = self.client.get(reverse('suggest-stored-tasks'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['suggestions'], [])
+
+        # Unexpected failures are logged and reported as JSON
+        for name, view in (('select_top_tasks', 'suggest-stored-tasks'), ('rank_tasks', 'analyze-stored-tasks')):
+            with mock.patch(f'tasks.views.{name}', side_effect=RuntimeError('boom')), \
+                    self.assertLogs('tasks.views', 'ERROR'):
+                response = self.client.get(reverse(view), {'as_of': '2025-01-01'})
+            self.assertEqual(response.status_code, 500)
+            self.assertEqual(response.json(), {'status': 'error', 'message': 'Server error: boom'})
+
+    def test_suggest_stored_tasks_materialized(self):
+        """Test materialized suggestions match a full scoring pass"""
+        self.create_stored_tasks()
+        for strategy in STRATEGY_NAMES:
+            params = {'k': 3, 'strategy': strategy}
+            with mock.patch.object(serializers, 'dumps', wraps=serializers.dumps) as dumps:
+                materialized_response = self.client.get(reverse('suggest-stored-tasks'), params)
+                params['as_of'] = date.today().isoformat()
+                scored_response = self.client.get(reverse('suggest-stored-tasks'), params)
+            self.assertEqual(dumps.call_count, 2)
+            self.assertEqual(materialized_response.json()['suggestions'],
+                             scored_response.json()['suggestions'])
+
+    def test_result_cache(self):
+        """Test identical requests are answered from the result cache"""
+        cache.result_cache().clear()
+        cache.stats.reset()
+        tasks = [{"id": 1, "title": "Write report", "estimated_hours": 2, "importance": 7}]
+        reordered = [{"importance": 7, "estimated_hours": 2, "title": "Write report", "id": 1}]
+
+        with mock.patch.object(scoring, '_prepare_records', wraps=scoring._prepare_records) as prepare:
+            first = self.client.post(reverse('analyze-tasks'), data=json.dumps({"tasks": tasks}),
+                                     content_type='application/json')
+            second = self.client.post(reverse('analyze-tasks'), data=json.dumps({"tasks": reordered}),
+                                      content_type='application/json')
+            self.client.post(reverse('analyze-tasks'),
+                             data=json.dumps({"tasks": tasks, "strategy": "fastest_wins"}),
+                             content_type='application/json')
+        self.assertEqual(prepare.call_count, 2)
+        self.assertEqual(first.json(), second.json())
+
+        response = self.client.get(reverse('cache-stats'))
+        self.assertEqual(response.json()['cache'], {'hits': 1, 'misses': 2, 'evictions': 0})
+
+    def test_result_cache_lru_eviction(self):
+        """Test the local memory backend evicts the least recently used entry"""
+        cache.stats.reset()
+        lru = cache.LRULocMemCache('lru-test', {'OPTIONS': {'MAX_ENTRIES': 2}})
+        lru.set('a', 1)
+        lru.set('b', 2)
+        lru.get('a')
+        lru.set('c', 3)
+        self.assertEqual((lru.get('a'), lru.get('b'), lru.get('c')), (1, None, 3))
+        self.assertEqual(cache.stats.as_dict()['evictions'], 1)
+
+    def test_suggest_conditional_get(self):
+        """Test suggest answers a matching If-None-Match with 304 before scoring"""
+        params = {
+            'tasks': json.dumps([{"id": 1, "title": "Review PR", "estimated_hours": 1, "importance": 6}]),
+            'as_of': '2025-01-01'
+        }
+        response = self.client.get(reverse('suggest-tasks'), params)
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+        self.assertIn('max-age=', response['Cache-Control'])
+
+        with mock.patch('tasks.views.select_top_tasks') as select:
+            response = self.client.get(reverse('suggest-tasks'), params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+        select.assert_not_called()
+
+        params['k'] = 1
+        response = self.client.get(reverse('suggest-tasks'), params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def post_batch(self, lists):
+        return self.client.post(reverse('analyze-batch'),
+                                data=json.dumps({"lists": lists, "as_of": "2025-01-01"}),
+                                content_type='application/json')
+
+    def batch_lists(self):
+        return [
+            {"name": "team-a", "strategy": "fastest_wins", "tasks": [
+                {"id": 1, "title": "Slow", "estimated_hours": 20, "importance": 3},
+                {"id": 2, "title": "Quick", "estimated_hours": 1, "importance": 9},
+            ]},
+            {"name": "team-b", "tasks": []},
+            {"name": "team-c", "tasks": [{"id": 1, "title": "Only", "estimated_hours": 2, "importance": 5}]},
+        ]
+
+    def test_analyze_batch(self):
+        """Test many task lists are analyzed independently in one request"""
+        response = self.post_batch(self.batch_lists())
+        self.assertEqual(response.status_code, 200)
+        results = response.json()['results']
+
+        self.assertEqual([r['name'] for r in results], ["team-a", "team-b", "team-c"])
+        self.assertEqual([r['status'] for r in results], ["success", "error", "success"])
+        self.assertEqual([t['title'] for t in results[0]['data']['sorted_tasks']], ["Quick", "Slow"])
+        self.assertEqual(results[0]['data']['strategy_used'], "fastest_wins")
+
+        single = self.client.post(reverse('analyze-tasks'), data=json.dumps({
+            "tasks": self.batch_lists()[0]['tasks'], "strategy": "fastest_wins", "as_of": "2025-01-01"
+        }), content_type='application/json')
+        self.assertEqual(results[0]['data'], single.json()['data'])
+
+        self.assertEqual(self.post_batch([]).status_code, 400)
+        with self.settings(TASK_ANALYZER_MAX_BATCH_LISTS=2):
+            self.assertEqual(self.post_batch(self.batch_lists()).status_code, 413)
+
+        with mock.patch('tasks.views.analyze_batch', side_effect=RuntimeError('boom')), \
+                self.assertLogs('tasks.views', 'ERROR'):
+            response = self.post_batch(self.batch_lists())
+        self.assertEqual(response.status_code, 500)
+
+    @override_settings(TASK_ANALYZER_BATCH_PARALLEL_THRESHOLD=0, TASK_ANALYZER_BATCH_WORKERS=2)
+    def test_analyze_batch_process_pool(self):
+        """Test large batches fanned out to worker processes give the same results"""
+        sequential = [json.loads(entry) for entry in batch.analyze_batch(self.batch_lists(), date(2025, 1, 1))]
+        response = self.post_batch(self.batch_lists())
+        self.assertEqual(response.json()['results'], sequential)
+
+    async def test_async_views(self):
+        """Test the async endpoints match the sync ones and shed load when saturated"""
+        tasks = [{"id": 1, "title": "Plan sprint", "estimated_hours": 2, "importance": 8}]
+        response = await self.async_client.post(reverse('analyze-tasks-async'),
+                                                data={"tasks": tasks, "as_of": "2025-01-01"},
+                                                content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['data']['sorted_tasks'][0]['title'], "Plan sprint")
+
+        response = await self.async_client.get(reverse('suggest-tasks-async'), {'tasks': json.dumps(tasks)})
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('ETag', response)
+
+        busy = executor.BoundedExecutor(max_workers=1, max_pending=0)
+        busy._in_flight = 1
+        with mock.patch('tasks.async_views.get_scoring_executor', return_value=busy):
+            response = await self.async_client.get(reverse('suggest-tasks-async'), {'tasks': json.dumps(tasks)})
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response['Retry-After'], '1')
+
+    @override_settings(DEBUG=True)  # Adaptations are only logged in debug mode
+    def test_async_middleware_chain(self):
+        """Test no middleware makes Django run the async handler chain in a thread"""
+        for enabled in (False, True):
+            with self.subTest(metrics=enabled), self.settings(TASK_ANALYZER_METRICS=enabled), \
+                    mock.patch('django.core.handlers.base.logger') as logger:
+                ASGIHandler()
+            adapted = [call.args[1] for call in logger.debug.call_args_list if 'adapted' in call.args[0]]
+            self.assertEqual(adapted, [])
+
+    def test_analyze_compact(self):
+        """Test compact responses carry the same scores as full ones"""
+        tasks = [
+            {"id": 1, "title": "Fix outage", "due_date": "2025-01-01", "estimated_hours": 1, "importance": 10},
+            {"id": 2, "title": "Refactor", "estimated_hours": 12, "importance": 4, "dependencies": [1]},
+        ]
+        full = self.client.post(reverse('analyze-tasks'), data=json.dumps(
+            {"tasks": tasks, "as_of": "2025-01-01"}), content_type='application/json').json()['data']
+        compact = self.client.post(reverse('analyze-tasks'), data=json.dumps(
+            {"tasks": tasks, "as_of": "2025-01-01", "compact": True}), content_type='application/json').json()['data']
+
+        self.assertEqual(compact['breakdown_fields'], ["urgency", "importance", "effort", "dependencies", "impact"])
+        for full_task, compact_task in zip(full['sorted_tasks'], compact['sorted_tasks']):
+            self.assertEqual(compact_task['priority_score'], full_task['priority_score'])
+            self.assertEqual(compact_task['score_breakdown'],
+                             [full_task['score_breakdown'][field] for field in compact['breakdown_fields']])
+            self.assertEqual(compact['explanations'][compact_task['explanation']], full_task['explanation'])
+
+    def test_serializer_fallback(self):
+        """Test the stdlib encoder is used when the fast one is missing or can't encode a value"""
+        data = {"big": 2 ** 70, "when": date(2025, 1, 1)}
+        self.assertEqual(json.loads(serializers.dumps(data)), {"big": 2 ** 70, "when": "2025-01-01"})
+        with mock.patch.object(serializers, 'orjson', None):
+            self.assertEqual(json.loads(serializers.dumps(data)), {"big": 2 ** 70, "when": "2025-01-01"})
+
+    def test_analyze_pagination(self):
+        """Test limit, offset and fields on the analyze endpoint"""
+        tasks = [{"id": i, "title": f"Task {i}", "estimated_hours": i, "importance": 5} for i in range(1, 8)]
+        response = self.client.post(reverse('analyze-tasks'), data=json.dumps({
+            "tasks": tasks, "limit": 2, "offset": 1, "fields": "title,priority_score"
+        }), content_type='application/json')
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()['data']
+        self.assertEqual((data['total_tasks'], data['limit'], data['offset']), (7, 2, 1))
+        self.assertEqual([set(task) for task in data['sorted_tasks']], [{"title", "priority_score"}] * 2)
+        self.assertEqual([task['title'] for task in data['sorted_tasks']], ["Task 2", "Task 3"])
+
+        response = self.client.post(reverse('analyze-tasks'), data=json.dumps({"tasks": tasks, "limit": 0}),
+                                    content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+
+    @override_settings(TASK_ANALYZER_METRICS=True)
+    def test_server_timing_and_metrics(self):
+        """Test phase timings are sent as Server-Timing and aggregated at /api/metrics"""
+        metrics.registry.reset()
+        tasks = [{"id": i, "title": f"Task {i}", "estimated_hours": i, "importance": 5} for i in range(1, 6)]
+        response = self.client.post(reverse('analyze-tasks'), data=json.dumps({"tasks": tasks}),
+                                    content_type='application/json')
+
+        self.assertEqual(response.status_code, 200)
+        timing = {entry.split(';')[0]: entry for entry in response['Server-Timing'].split(', ')}
+        for name in ('parse', 'cache_key', 'validate', 'dependencies', 'score', 'sort', 'serialize', 'total'):
+            self.assertIn(f'{name};dur=', timing[name])
+        self.assertEqual(timing['tasks'], 'tasks;desc="5"')
+
+        body = self.client.get(reverse('metrics')).content.decode()
+        self.assertIn('task_analyzer_request_duration_seconds_count'
+                      '{view="analyze-tasks",method="POST",status="200"} 1', body)
+        self.assertIn('task_analyzer_phase_duration_seconds_bucket{view="analyze-tasks",phase="score",le="+Inf"} 1',
+                      body)
+        self.assertIn('task_analyzer_items_total{view="analyze-tasks",item="tasks"} 5', body)
+        self.assertIn('task_analyzer_result_cache_misses_total', body)
+
+    @override_settings(TASK_ANALYZER_METRICS=True)
+    async def test_server_timing_async(self):
+        """Test requests to the async views are timed too"""
+        metrics.registry.reset()
+        tasks = [{"id": 1, "title": "Task", "estimated_hours": 1, "importance": 5}]
+        response = await self.async_client.post(reverse('analyze-tasks-async'), data={"tasks": tasks},
+                                                content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('score;dur=', response['Server-Timing'])
+        self.assertIn('task_analyzer_request_duration_seconds_count{view="analyze-tasks-async",method="POST",'
+                      'status="200"} 1', metrics.registry.render())
+
+    def test_metrics_disabled(self):
+        """Test no timing is recorded unless metrics are enabled"""
+        metrics.registry.reset()
+        tasks = [{"id": 1, "title": "Task", "estimated_hours": 1, "importance": 5}]
+        response = self.client.post(reverse('analyze-tasks'), data=json.dumps({"tasks": tasks}),
+                                    content_type='application/json')
+
+        self.assertNotIn('Server-Timing', response)
+        self.assertIs(metrics.phase('score'), metrics.phase('sort'))
+        self.assertNotIn('task_analyzer_request_duration_seconds_count', self.client.get(reverse('metrics')).content.decode())
+
+
+    def test_loadtest_command(self):
+        """Test the load-test command reports every scenario without errors"""
+        from benchmarks.load import percentile
+
+        out = io.StringIO()
+        call_command('loadtest', endpoints='analyze,suggest', sizes='5', strategies='smart_balance,fastest_wins',
+                     requests=6, concurrency=2, warmup=0, stdout=out)
+        rows = [line.split() for line in out.getvalue().splitlines()[2:]]
+        self.assertEqual([(row[0], row[2]) for row in rows], [
+            ('analyze', 'smart_balance'), ('analyze', 'fastest_wins'),
+            ('suggest', 'smart_balance'), ('suggest', 'fastest_wins')
+        ])
+        self.assertEqual({row[-1] for row in rows}, {'0.0%'})
+        self.assertEqual([percentile([1, 2, 3, 4], p) for p in (50, 99, 100)], [2, 4, 4])
+
+    def test_analysis_session_deltas(self):
+        """Test session deltas re-rank only what changed and match a full analysis"""
+        tasks = [
+            {"id": 1, "title": "Design", "estimated_hours": 4, "importance": 6},
+            {"id": 2, "title": "Build", "estimated_hours": 8, "importance": 7, "dependencies": [1]},
+            {"id": 3, "title": "Docs", "estimated_hours": 2, "importance": 3},
+        ]
+        response = self.client.post(reverse('analysis-sessions'), data=json.dumps(
+            {"tasks": tasks, "as_of": "2025-01-01"}), content_type='application/json')
+        self.assertEqual(response.status_code, 201)
+        session_url = reverse('analysis-session', args=[response.json()['data']['session_id']])
+
+        # Task 3 now also blocks a new task, and task 2 is edited
+        delta = {"upsert": [
+            {"id": 4, "title": "Review", "estimated_hours": 1, "importance": 9, "dependencies": [3]},
+            {"id": 2, "title": "Build", "estimated_hours": 1, "importance": 7, "dependencies": [1]},
+        ]}
+        response = self.client.post(session_url, data=json.dumps(delta), content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        data = response.json()['data']
+        self.assertNotIn('sorted_tasks', data)
+        self.assertEqual(sorted(change['id'] for change in data['changes']), [2, 3, 4])
+
+        response = self.client.post(session_url, data=json.dumps({"remove": [1]}), content_type='application/json')
+        self.assertEqual(response.json()['data']['removed'], [1])
+
+        expected = analyze_and_sort_tasks([delta['upsert'][1], tasks[2], delta['upsert'][0]], 'smart_balance',
+                                          date(2025, 1, 1))['sorted_tasks']
+        self.assertEqual(self.client.get(session_url).json()['data']['sorted_tasks'], expected)
+        page = self.client.get(session_url, {'limit': 1, 'offset': 1, 'fields': 'id'}).json()['data']
+        self.assertEqual(page['sorted_tasks'], [{"id": expected[1]['id']}])
+
+        # A cycle is rejected without changing the session
+        response = self.client.post(session_url, data=json.dumps({"upsert": [
+            {"id": 3, "title": "Docs", "estimated_hours": 2, "importance": 3, "dependencies": [4]}
+        ]}), content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('Circular dependency', response.json()['errors'][0])
+        self.assertEqual(self.client.get(session_url).json()['data']['sorted_tasks'], expected)
+
+        for delta in ({"upsert": 5}, {"remove": 3}, {"upsert": None}):
+            response = self.client.post(session_url, data=json.dumps(delta), content_type='application/json')
+            self.assertEqual(response.status_code, 400)
+            self.assertEqual(response.json()['errors'], ['upsert and remove must be lists'])
+
+        self.assertEqual(self.client.delete(session_url).status_code, 200)
+        self.assertEqual(self.client.get(session_url).status_code, 404)
+
+        # Unexpected failures are logged and reported as JSON
+        with mock.patch('tasks.views.AnalysisSession.create', side_effect=RuntimeError('boom')), \
+                self.assertLogs('tasks.views', 'ERROR'):
+            response = self.client.post(reverse('analysis-sessions'), data=json.dumps({"tasks": tasks}),
+                                        content_type='application/json')
+        self.assertEqual(response.status_code, 500)
+        self.assertEqual(response.json(), {'status': 'error', 'message': 'Server error: boom'})
+
+    def test_schedule_endpoint(self):
+        """Test the schedule endpoint reports the critical path and missed due dates"""
+        tasks = [
+            {"id": 1, "title": "Design", "estimated_hours": 8, "importance": 5},
+            {"id": 2, "title": "Build", "due_date": "2025-01-01", "estimated_hours": 4, "importance": 5,
+             "dependencies": [1]},
+        ]
+        response = self.client.post(reverse('schedule-tasks'), data=json.dumps(
+            {"tasks": tasks, "as_of": "2025-01-01"}), content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        data = response.json()['data']
+        self.assertEqual((data['critical_path'], data['late_tasks'], data['hours_per_day']), ([1, 2], 1, 8))
+        self.assertEqual(data['tasks'][1]['earliest_finish_date'], '2025-01-02')
+
+        response = self.client.post(reverse('schedule-tasks'), data=json.dumps(
+            {"tasks": tasks, "hours_per_day": 0}), content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        tasks[0]['dependencies'] = [2]
+        response = self.client.post(reverse('schedule-tasks'), data=json.dumps({"tasks": tasks}),
+                                    content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('Circular dependency', response.json()['errors'][0])
+
+    def test_analyze_strict(self):
+        """Test strict analysis rejects the first invalid task"""
+        tasks = [{"id": 1, "title": "Fine", "estimated_hours": 2, "importance": 5},
+                 {"id": 2, "title": "Unestimated", "importance": 5}]
+        response = self.client.post(reverse('analyze-tasks'), data=json.dumps({"tasks": tasks}),
+                                    content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()['data']['warnings']), 1)
+
+        response = self.client.post(reverse('analyze-tasks'), data=json.dumps({"tasks": tasks, "strict": True}),
+                                    content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['errors'], ["Task 'Unestimated' has invalid estimated hours"])
+        response = self.client.get(reverse('suggest-tasks'), {'tasks': json.dumps(tasks), 'strict': 'true'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_analyze_custom_strategy(self):
+        """Test request-defined and registered strategies in the analyze endpoint"""
+        tasks = [{"id": 1, "title": "Quick", "estimated_hours": 1, "importance": 2},
+                 {"id": 2, "title": "Important", "estimated_hours": 8, "importance": 10}]
+        definition = {"name": "effort_only", "weights": {"effort": 1}}
+        response = self.client.post(reverse('analyze-tasks'), data=json.dumps({"tasks": tasks, "strategy": definition}),
+                                    content_type='application/json')
+        data = response.json()['data']
+        self.assertEqual((data['strategy_used'], data['sorted_tasks'][0]['id']), ("effort_only", 1))
+
+        response = self.client.post(reverse('analyze-tasks'), data=json.dumps(
+            {"tasks": tasks, "strategy": {"weights": {"effort": 2}}}), content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('weights', response.json()['message'])
+
+        registry = strategies.StrategyRegistry(named={"importance_only": {"weights": {"importance": 1}}})
+        with mock.patch.object(strategies, '_registry', registry):
+            response = self.client.post(reverse('analyze-tasks'), data=json.dumps(
+                {"tasks": tasks, "strategies": "all"}), content_type='application/json')
+            rankings = response.json()['data']['rankings']
+            self.assertEqual(list(rankings), STRATEGY_NAMES + ["importance_only"])
+            self.assertEqual(rankings["importance_only"][0]['id'], 2)
+            self.assertFalse(materialized.is_materialized("importance_only"))
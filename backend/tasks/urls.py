@@ -1,7 +1,16 @@
 from django.urls import path
-from . import views
+from . import async_views, views
 
 urlpatterns = [
     path('analyze/', views.analyze_tasks, name='analyze-tasks'),
     path('suggest/', views.suggest_tasks, name='suggest-tasks'),
+    path('async/analyze/', async_views.analyze_tasks, name='analyze-tasks-async'),
+    path('async/suggest/', async_views.suggest_tasks, name='suggest-tasks-async'),
+    path('schedule/', views.schedule_tasks, name='schedule-tasks'),
+    path('batch/', views.analyze_batch_tasks, name='analyze-batch'),
+    path('stored/analyze/', views.analyze_stored_tasks, name='analyze-stored-tasks'),
+    path('stored/suggest/', views.suggest_stored_tasks, name='suggest-stored-tasks'),
+    path('sessions/', views.create_analysis_session, name='analysis-sessions'),
+    path('sessions/<str:session_id>/', views.analysis_session, name='analysis-session'),
+    path('cache/stats/', views.cache_stats, name='cache-stats'),
 ]
\ No newline at end of file
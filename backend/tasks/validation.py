@@ -0,0 +1,144 @@
+"""
+Task list validation.
+
+One pass over the incoming tasks turns each into a TaskRecord, filling in
+defaults for unusable estimated_hours and importance values. Problems are
+not reported one message per task: they are counted per rule, with a few
+sample task ids, so a sloppy 100k-task import yields a handful of
+messages rather than hundreds of thousands. In strict mode the first
+problem, default-able or not, stops validation and is the only error.
+"""
+from typing import Any, Dict, Iterable, List, Tuple
+
+from .records import TaskRecord
+
+# Task ids quoted in an aggregated validation message
+ISSUE_SAMPLE_SIZE = 10
+
+# Rule -> (message for one task, message for several). Default-able rules
+# get their DEFAULTS text appended unless validation is strict.
+RULES = {
+    'missing_title': ("Task at index {index} is missing a title",
+                      "{count} tasks are missing a title"),
+    'invalid_task': ("Error processing task '{title}': {detail}",
+                     "{count} tasks could not be processed, e.g. task '{title}': {detail}"),
+    'invalid_estimated_hours': ("Task '{title}' has invalid estimated hours{default}",
+                                "{count} tasks have invalid estimated hours{default}"),
+    'invalid_importance': ("Task '{title}' has invalid importance{default}",
+                           "{count} tasks have invalid importance{default}"),
+}
+DEFAULTS = {
+    'invalid_estimated_hours': ', using default 1',
+    'invalid_importance': ', using default 5',
+}
+
+class IssueLog:
+    """
+    Occurrences of each validation rule: a count, the first few task ids,
+    and the details of the first occurrence for its message.
+    """
+    __slots__ = ('counts', 'samples', 'first')
+
+    def __init__(self):
+        self.counts = {}
+        self.samples = {}
+        self.first = {}
+
+    def __bool__(self):
+        return bool(self.counts)
+
+    def add(self, rule: str, task_id: Any, index: int = None, title: Any = None, detail: str = None):
+        if rule in self.counts:
+            self.counts[rule] += 1
+            if len(self.samples[rule]) < ISSUE_SAMPLE_SIZE:
+                self.samples[rule].append(task_id)
+        else:
+            self.counts[rule] = 1
+            self.samples[rule] = [task_id]
+            self.first[rule] = {'index': index, 'title': title, 'detail': detail}
+
+    def messages(self, strict: bool = False) -> List[str]:
+        """
+        One message per rule, in the order the rules were first hit.
+        """
+        messages = []
+        for rule, count in self.counts.items():
+            single, several = RULES[rule]
+            details = dict(self.first[rule], count=count, default='' if strict else DEFAULTS.get(rule, ''))
+            if count == 1:
+                messages.append(single.format(**details))
+                continue
+            sample = ', '.join(str(task_id) for task_id in self.samples[rule])
+            more = ', ...' if count > len(self.samples[rule]) else ''
+            messages.append(f"{several.format(**details)} (task ids: {sample}{more})")
+        return messages
+
+def validate_tasks(tasks: Iterable[Dict], strict: bool = False) -> Tuple[List[TaskRecord], List[Any], List[str],
+                                                                         List[str]]:
+    """
+    Validate and normalize each task into a compact TaskRecord.
+    The input dicts are left untouched.
+    Returns (records, rejected tasks, errors, warnings). With strict, the
+    first invalid task ends validation: the result then has no records
+    and that task's problem as its only error.
+    """
+    problems = IssueLog()  # Rejected tasks
+    defaults = IssueLog()  # Tasks accepted with default values
+    records = []
+    rejected = []
+    append = records.append
+    from_dict = TaskRecord.from_dict
+
+    for i, task in enumerate(tasks):
+        try:
+            title = task.get('title')
+            # Assign ID if missing
+            task_id = task['id'] if 'id' in task else i + 1
+        except (AttributeError, TypeError) as e:
+            problems.add('invalid_task', i + 1, i, 'Unknown', str(e))
+            rejected.append(task)
+            if strict:
+                break
+            continue
+
+        try:
+            # Ensure each task has basic required fields
+            if not title:
+                problems.add('missing_title', task_id, i)
+                rejected.append(task)
+                if strict:
+                    break
+                continue
+
+            # Ensure estimated_hours is valid
+            estimated_hours = task.get('estimated_hours')
+            if estimated_hours is None or estimated_hours <= 0:
+                estimated_hours = 1
+                defaults.add('invalid_estimated_hours', task_id, i, title)
+
+            # Ensure importance is valid
+            importance = task.get('importance')
+            if importance is None or not (1 <= importance <= 10):
+                importance = 5
+                defaults.add('invalid_importance', task_id, i, title)
+
+            if strict and defaults:
+                break
+
+            # Ensure dependencies is a list
+            dependencies = task.get('dependencies')
+            if not isinstance(dependencies, list):
+                dependencies = []
+
+            append(from_dict(task, task_id, estimated_hours, importance, dependencies))
+
+        except Exception as e:
+            problems.add('invalid_task', task_id, i, title, str(e))
+            rejected.append(task)
+            if strict:
+                break
+
+    if strict and (problems or defaults):
+        # Exactly one problem was recorded before stopping
+        return [], rejected, (problems.messages() or defaults.messages(strict=True))[:1], []
+    return records, rejected, problems.messages(), defaults.messages()
@@ -0,0 +1,166 @@
+"""
+Columnar NumPy scoring engine for large task lists.
+
+Turns validated task records into column arrays (days until due, hours, importance,
+blocking count) and computes the piecewise factor scores and weighted totals
+with array operations. Every step mirrors the pure-Python functions in
+scoring.py operation for operation, so the rounded scores are identical.
+"""
+from datetime import date
+from typing import List, Dict, Any
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; scoring falls back to pure Python
+    np = None
+
+from .records import TaskRecord
+from .scoring import URGENCY_FLOOR_DAYS, URGENCY_TABLE, build_explanation, calculate_impact_score, parse_due_date
+from .strategies import Strategy
+
+def is_available() -> bool:
+    """
+    Whether the vectorized engine can be used in this environment.
+    """
+    return np is not None
+
+def _days_until_due_column(records: List[TaskRecord], today: date):
+    """
+    Days until each task's due date, NaN where there is no valid due date.
+    Each distinct due date value is resolved only once.
+    """
+    days_by_due = {}
+    days = np.empty(len(records))
+
+    for i, record in enumerate(records):
+        due_date = record.due_date_value
+        try:
+            value = days_by_due[due_date]
+        except KeyError:
+            due = parse_due_date(due_date)
+            value = np.nan if due is None else (due - today).days
+            days_by_due[due_date] = value
+        except TypeError:
+            value = np.nan  # Unhashable, so not a date string either
+        days[i] = value
+
+    return days
+
+# URGENCY_TABLE plus the 0.1 floor used from URGENCY_FLOOR_DAYS on
+_URGENCY_LOOKUP = np.array(URGENCY_TABLE + (0.1,)) if np is not None else None
+
+def urgency_scores(days):
+    """
+    Vectorized calculate_urgency_score over a days-until-due column,
+    using the same URGENCY_TABLE lookup.
+    """
+    has_due = ~np.isnan(days)
+    positions = np.clip(np.where(has_due, days, 0), 0, URGENCY_FLOOR_DAYS).astype(np.int64)
+    urgency = np.where(days < 0, 1.0, _URGENCY_LOOKUP[positions])
+    return np.where(has_due, urgency, 0.3)
+
+def effort_scores(hours):
+    """
+    Vectorized calculate_effort_score over an estimated-hours column.
+    """
+    # fmax matches max(0.1, x) for NaN hours, which returns 0.1
+    long_tasks = np.fmax(0.1, 8 / np.where(hours <= 8, 9, hours))
+    return np.select(
+        [hours <= 0, hours <= 1, hours <= 2, hours <= 4, hours <= 8],
+        [0.5, 1.0, 0.8, 0.6, 0.4],
+        default=long_tasks
+    )
+
+def importance_scores(importance):
+    """
+    Vectorized calculate_importance_score over an importance column.
+    """
+    return np.where((importance >= 1) & (importance <= 10), importance / 10.0, 0.5)
+
+def dependency_scores(blocking_counts):
+    """
+    Vectorized calculate_blocking_score over a blocking-count column.
+    """
+    return np.select(
+        [blocking_counts == 0, blocking_counts == 1, blocking_counts == 2],
+        [0.1, 0.4, 0.7],
+        default=1.0
+    )
+
+def explanation_table() -> List[str]:
+    """
+    Every distinct explanation, indexed by the factor band codes below.
+    """
+    urgency_bands = (1.0, 0.5, 0.0)       # very urgent, time-sensitive, neither
+    importance_bands = (1.0, 0.5, 0.0)    # high, moderate, neither
+    effort_bands = (1.0, 0.0, 0.5)        # quick win, significant effort, neither
+    dependency_bands = (1.0, 0.0)         # blocks other tasks, doesn't
+    return [
+        build_explanation(u, i, e, d)
+        for u in urgency_bands
+        for i in importance_bands
+        for e in effort_bands
+        for d in dependency_bands
+    ]
+
+def explanation_codes(urgency, importance, effort, dependency):
+    """
+    Map factor scores to an index into explanation_table().
+    """
+    u = np.select([urgency > 0.7, urgency > 0.4], [0, 1], default=2)
+    i = np.select([importance > 0.7, importance > 0.4], [0, 1], default=2)
+    e = np.select([effort > 0.7, effort < 0.3], [0, 1], default=2)
+    d = np.where(dependency > 0.6, 0, 1)
+    return ((u * 3 + i) * 3 + e) * 2 + d
+
+def impact_scores(records: List[TaskRecord], impacts: Dict[Any, float]):
+    """
+    calculate_impact_score per record. Most tasks have nothing downstream,
+    so only those with an impact are scored (in Python, for identical
+    logarithms).
+    """
+    scores = np.full(len(records), 0.1)
+    if impacts:
+        for i, record in enumerate(records):
+            impact = impacts.get(record.id)
+            if impact:
+                scores[i] = calculate_impact_score(impact)
+    return scores
+
+def score_factors(records: List[TaskRecord], blocking_counts: Dict[Any, int], today: date = None,
+                  impacts: Dict[Any, float] = None):
+    """
+    Compute the five factor score columns for validated task records.
+    Returns (urgency, importance, effort, dependencies, impact) float64 arrays.
+    """
+    if today is None:
+        today = date.today()
+
+    days = _days_until_due_column(records, today)
+    hours = np.array([record.estimated_hours for record in records], dtype=np.float64)
+    importance = np.array([record.importance for record in records], dtype=np.float64)
+    blocking_counts = np.array([blocking_counts.get(record.id, 0) for record in records], dtype=np.int64)
+
+    return (
+        urgency_scores(days),
+        importance_scores(importance),
+        effort_scores(hours),
+        dependency_scores(blocking_counts),
+        impact_scores(records, impacts),
+    )
+
+def weighted_totals(factors, strategies: List[Strategy]):
+    """
+    Weighted totals for every strategy at once: the factor matrix (n x 5)
+    times the transposed weights matrix (5 x strategies). The product is
+    expanded term by term so each sum is added in the same order as a
+    strategy's compiled score(), which keeps results bit-for-bit
+    identical. Factors under a strategy's threshold add nothing.
+    """
+    weights = np.array([strategy.weights for strategy in strategies])
+    matrix = np.column_stack(factors)
+    terms = [matrix[:, k:k + 1] * weights[:, k] for k in range(5)]
+    if any(strategy.thresholds for strategy in strategies):
+        thresholds = np.array([strategy.thresholds or (-np.inf,) * 5 for strategy in strategies])
+        terms = [np.where(matrix[:, k:k + 1] >= thresholds[:, k], term, 0.0) for k, term in enumerate(terms)]
+    return terms[0] + terms[1] + terms[2] + terms[3] + terms[4]
@@ -1,19 +1,138 @@
-from django.http import JsonResponse
+from django.conf import settings
+from django.core.exceptions import RequestDataTooBig
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 import json
-from .scoring import analyze_and_sort_tasks
+import logging
+import os
+from datetime import datetime
+from .batch import analyze_batch, task_count
+from .cache import cached_response, result_cache_key, stats as cache_stats_counters
+from .materialized import is_materialized, top_stored_tasks
+from .metrics import phase, registry as metrics_registry
+from .queries import filter_stored_tasks, iter_stored_tasks
+from .schedule import DEFAULT_HOURS_PER_DAY, build_schedule
+from .scoring import rank_tasks, select_top_tasks, PARALLEL_THRESHOLD
+from .serializers import BREAKDOWN_FIELDS, compact_rankings, json_response
+from .sessions import AnalysisSession, DeltaRejected, get_session_store
+from .strategies import StrategyError, is_known_strategy, strategy_names
+from .streaming import (
+    NDJSON_CONTENT_TYPE, PayloadTooLarge, check_content_length, iter_ndjson_tasks, ndjson_lines
+)
+
+# Number of suggestions returned by /suggest/ unless ?k= is given
+DEFAULT_SUGGESTIONS = 3
+MAX_SUGGESTIONS = 100
+
+logger = logging.getLogger(__name__)
+
+def parse_as_of(value):
+    """
+    Parse the optional as_of date (YYYY-MM-DD) that pins "today" for scoring,
+    so results are reproducible. Raises ValueError when it is invalid.
+    """
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').date()
+    except TypeError:
+        raise ValueError(value)
+
+def max_tasks_per_request():
+    return getattr(settings, 'TASK_ANALYZER_MAX_TASKS', 1000000)
+
+def max_body_bytes():
+    return getattr(settings, 'TASK_ANALYZER_MAX_BODY_BYTES', 256 * 1024 * 1024)
+
+def max_batch_lists():
+    return getattr(settings, 'TASK_ANALYZER_MAX_BATCH_LISTS', 1000)
+
+def parallel_scoring_options():
+    """
+    Process-pool settings for scoring one large task list; a single worker
+    (the default) keeps scoring in the request process.
+    """
+    return {
+        'workers': getattr(settings, 'TASK_ANALYZER_SCORING_WORKERS', 1),
+        'parallel_threshold': getattr(settings, 'TASK_ANALYZER_PARALLEL_THRESHOLD', PARALLEL_THRESHOLD)
+    }
+
+def batch_workers(total_tasks):
+    """
+    Worker processes for a batch: one (in-process) below the parallel
+    threshold, the configured pool size above it.
+    """
+    if total_tasks < getattr(settings, 'TASK_ANALYZER_BATCH_PARALLEL_THRESHOLD', 20000):
+        return 1
+    return getattr(settings, 'TASK_ANALYZER_BATCH_WORKERS', None) or os.cpu_count() or 1
+
+def schedule_hours_per_day():
+    return getattr(settings, 'TASK_ANALYZER_SCHEDULE_HOURS_PER_DAY', DEFAULT_HOURS_PER_DAY)
+
+def suggest_max_age():
+    return getattr(settings, 'TASK_ANALYZER_SUGGEST_MAX_AGE', 60)
+
+def payload_too_large_response(error):
+    return JsonResponse({
+        'status': 'error',
+        'message': str(error)
+    }, status=413)
+
+def strategy_error_response(error):
+    return JsonResponse({
+        'status': 'error',
+        'message': f'Invalid strategy: {error}'
+    }, status=400)
+
+def invalid_as_of_response():
+    return JsonResponse({
+        'status': 'error',
+        'message': 'as_of must be a date in YYYY-MM-DD format'
+    }, status=400)
 
 @csrf_exempt
 @require_http_methods(["POST"])
 def analyze_tasks(request):
     """
     Accept a list of tasks and return them sorted by priority score.
+    Pass "strategies": "all" (or a list of names) instead of "strategy" to
+    get one ranking per strategy from a single scoring pass. A strategy
+    can also be a custom definition, e.g. {"name": "ops", "weights":
+    {"urgency": 0.6, "impact": 0.4}, "thresholds": {"urgency": 0.5}}. Pass
+    "compact": true for the smaller array-based task format.
+    "limit"/"offset" return one page of the ranking and "fields" limits
+    the keys of each task. "strict": true rejects the request at the first
+    invalid task instead of scoring it with default values.
+    Send Content-Type: application/x-ndjson to stream tasks in and out.
     """
     try:
-        data = json.loads(request.body)
+        check_content_length(request, max_body_bytes())
+        
+        if request.content_type == NDJSON_CONTENT_TYPE:
+            return analyze_tasks_ndjson(request)
+        
+        with phase('parse'):
+            data = json.loads(request.body)
         tasks = data.get('tasks', [])
         strategy = data.get('strategy', 'smart_balance')
+        strategies = data.get('strategies')
+        compact = is_compact(data.get('compact'))
+        strict = is_strict(data.get('strict'))
+        
+        try:
+            as_of = parse_as_of(data.get('as_of'))
+        except ValueError:
+            return invalid_as_of_response()
+        
+        try:
+            page = parse_page(data)
+        except ValueError as e:
+            return JsonResponse({
+                'status': 'error',
+                'message': str(e)
+            }, status=400)
         
         if not tasks:
             return JsonResponse({
@@ -21,51 +140,313 @@ def analyze_tasks(request):
                 'message': 'No tasks provided'
             }, status=400)
         
-        # Analyze and sort tasks
-        result = analyze_and_sort_tasks(tasks, strategy)
+        def analyze():
+            if strategies is not None:
+                return analyze_strategies(tasks, strategies, as_of, compact, page, strict)
+            return analyze_strategy(tasks, strategy, as_of, compact, page, strict)
         
-        if result['errors']:
+        # Identical task lists are answered from the result cache
+        key = result_cache_key('analyze', tasks, as_of, strategy=strategy, strategies=strategies,
+                               compact=compact, strict=strict, **page)
+        return cached_response(key, analyze)
+        
+    except (PayloadTooLarge, RequestDataTooBig) as e:
+        return payload_too_large_response(e)
+    except StrategyError as e:
+        return strategy_error_response(e)
+    except json.JSONDecodeError:
+        return JsonResponse({
+            'status': 'error',
+            'message': 'Invalid JSON data'
+        }, status=400)
+    except Exception as e:
+        logger.exception('Error analyzing tasks')
+        return JsonResponse({
+            'status': 'error',
+            'message': f'Server error: {str(e)}'
+        }, status=500)
+
+def parse_suggestion_count(request):
+    """
+    Read ?k= for the suggest endpoints. Raises ValueError when it is not an
+    integer between 1 and MAX_SUGGESTIONS.
+    """
+    try:
+        k = int(request.GET.get('k', DEFAULT_SUGGESTIONS))
+    except ValueError:
+        k = 0
+    if not 1 <= k <= MAX_SUGGESTIONS:
+        raise ValueError(f'k must be an integer between 1 and {MAX_SUGGESTIONS}')
+    return k
+
+def build_suggestions(top_tasks):
+    """
+    Shape the top scored tasks as ranked suggestions.
+    """
+    suggestions = []
+    for i, task in enumerate(top_tasks, 1):
+        suggestions.append({
+            'rank': i,
+            'task': task['title'],
+            'priority_score': task['priority_score'],
+            'reason': task['explanation'],
+            'due_date': task.get('due_date', 'Not specified'),
+            'estimated_hours': task.get('estimated_hours', 'Unknown'),
+            'importance': task.get('importance', 'Unknown')
+        })
+    return suggestions
+
+@csrf_exempt
+@require_http_methods(["POST"])
+def analyze_batch_tasks(request):
+    """
+    Analyze many independent task lists in one request.
+    Body: {"lists": [{"name": ..., "tasks": [...], "strategy": ...}, ...],
+    "as_of": optional}. Each list gets its own result entry, in order, with
+    the same shape as an /analyze/ response; one list failing validation
+    doesn't fail the batch.
+    """
+    try:
+        check_content_length(request, max_body_bytes())
+        with phase('parse'):
+            data = json.loads(request.body)
+        lists = data.get('lists')
+        
+        if not isinstance(lists, list) or not lists or not all(isinstance(item, dict) for item in lists):
             return JsonResponse({
                 'status': 'error',
-                'message': 'Validation errors occurred',
-                'errors': result['errors'],
-                'warnings': result['warnings']
+                'message': 'lists must be a non-empty list of objects'
             }, status=400)
         
-        return JsonResponse({
+        try:
+            as_of = parse_as_of(data.get('as_of'))
+        except ValueError:
+            return invalid_as_of_response()
+        
+        if len(lists) > max_batch_lists():
+            raise PayloadTooLarge(f'More than {max_batch_lists()} task lists in one request')
+        total_tasks = sum(task_count(item) for item in lists)
+        if total_tasks > max_tasks_per_request():
+            raise PayloadTooLarge(f'More than {max_tasks_per_request()} tasks in one request')
+        
+        # Entries arrive already serialized, so the body is assembled as text
+        entries = analyze_batch(lists, as_of, batch_workers(total_tasks))
+        header = json.dumps({
             'status': 'success',
-            'message': f'Analyzed {len(result["sorted_tasks"])} tasks using {strategy} strategy',
-            'data': result
-        })
+            'message': f'Analyzed {len(lists)} task lists'
+        }).encode()
+        body = header[:-1] + b', "results": [' + b', '.join(entries) + b']}'
+        return HttpResponse(body, content_type='application/json')
         
-    except json.JSONDecodeError:
+    except (PayloadTooLarge, RequestDataTooBig) as e:
+        return payload_too_large_response(e)
+    except (json.JSONDecodeError, AttributeError):
         return JsonResponse({
             'status': 'error',
             'message': 'Invalid JSON data'
         }, status=400)
     except Exception as e:
-        # Log the actual error for debugging
-        import traceback
-        print("Server error:", str(e))
-        print("Traceback:", traceback.format_exc())
-        
+        logger.exception('Error analyzing task batch')
         return JsonResponse({
             'status': 'error',
             'message': f'Server error: {str(e)}'
         }, status=500)
 
+def analyze_tasks_ndjson(request):
+    """
+    NDJSON mode of analyze_tasks: one task object per request line in; a
+    header line and then one scored task per line out, in priority order.
+    Strategy, as_of and strict come from the query string. Tasks are parsed and
+    validated as they are read, and the task/byte limits are enforced
+    while reading.
+    """
+    strategy = request.GET.get('strategy', 'smart_balance')
+    try:
+        as_of = parse_as_of(request.GET.get('as_of'))
+    except ValueError:
+        return invalid_as_of_response()
+    
+    tasks = iter_ndjson_tasks(request, max_tasks_per_request(), max_body_bytes())
+    try:
+        result = rank_tasks(tasks, [strategy], as_of, **parallel_scoring_options(),
+                            strict=is_strict(request.GET.get('strict')))
+    except ValueError as e:
+        return JsonResponse({
+            'status': 'error',
+            'message': str(e)
+        }, status=400)
+    
+    sorted_tasks = result['rankings'][strategy]
+    if not len(sorted_tasks) and not result['errors']:
+        return JsonResponse({
+            'status': 'error',
+            'message': 'No tasks provided'
+        }, status=400)
+    
+    if result['errors']:
+        return JsonResponse({
+            'status': 'error',
+            'message': 'Validation errors occurred',
+            'errors': result['errors'],
+            'warnings': result['warnings']
+        }, status=400)
+    
+    header = {
+        'status': 'success',
+        'message': f'Analyzed {len(sorted_tasks)} tasks using {strategy} strategy',
+        'strategy_used': strategy,
+        'as_of': result['as_of'],
+        'warnings': result['warnings']
+    }
+    return StreamingHttpResponse(ndjson_lines(header, sorted_tasks), content_type=NDJSON_CONTENT_TYPE)
+
+def parse_page(data):
+    """
+    Read the optional fields, limit and offset parameters of an analyze
+    request. Raises ValueError with a message for the client when invalid.
+    """
+    fields = data.get('fields')
+    if isinstance(fields, str):
+        fields = [field.strip() for field in fields.split(',') if field.strip()]
+    if fields is not None and (not isinstance(fields, list) or not all(isinstance(f, str) for f in fields)):
+        raise ValueError('fields must be a list of field names or a comma-separated string')
+    
+    limit = data.get('limit')
+    offset = data.get('offset', 0)
+    if limit is not None and (not isinstance(limit, int) or isinstance(limit, bool) or limit < 1):
+        raise ValueError('limit must be a positive integer')
+    if not isinstance(offset, int) or isinstance(offset, bool) or offset < 0:
+        raise ValueError('offset must be a non-negative integer')
+    
+    return {'fields': fields, 'limit': limit, 'offset': offset}
+
+def page_info(result, page):
+    """
+    Paging details for a response: the total ranked and the window sent.
+    """
+    if page['limit'] is None:
+        return {}
+    return {'total_tasks': result['total_tasks'], 'limit': page['limit'], 'offset': page['offset']}
+
+def is_compact(value):
+    """
+    Whether the compact response format was asked for (compact=true).
+    """
+    return value is True or value == 'true'
+
+def is_strict(value):
+    """
+    Whether strict validation was asked for (strict=true).
+    """
+    return value is True or value == 'true'
+
+def ranked_data(result, compact):
+    """
+    The rankings of a rank_tasks result and, in compact mode, the tables
+    that compact task entries refer to.
+    """
+    if not compact:
+        return result['rankings'], {}
+    rankings, explanations = compact_rankings(result['rankings'])
+    return rankings, {'breakdown_fields': BREAKDOWN_FIELDS, 'explanations': explanations}
+
+def analyze_strategy(tasks, strategy, as_of=None, compact=False, page=None, strict=False):
+    """
+    Score tasks and rank them under one strategy.
+    """
+    page = page or {'fields': None, 'limit': None, 'offset': 0}
+    # Task dicts are only built while encoding
+    result = rank_tasks(tasks, [strategy], as_of, **parallel_scoring_options(), **page, strict=strict)
+    strategy = result['strategies_used'][0]
+    
+    if result['errors']:
+        return JsonResponse({
+            'status': 'error',
+            'message': 'Validation errors occurred',
+            'errors': result['errors'],
+            'warnings': result['warnings']
+        }, status=400)
+    
+    rankings, tables = ranked_data(result, compact)
+    return json_response({
+        'status': 'success',
+        'message': f'Analyzed {result["total_tasks"]} tasks using {strategy} strategy',
+        'data': {
+            'sorted_tasks': rankings[strategy],
+            'errors': result['errors'],
+            'warnings': result['warnings'],
+            'strategy_used': strategy,
+            'as_of': result['as_of'],
+            **page_info(result, page),
+            **tables
+        }
+    })
+
+def analyze_strategies(tasks, strategies, as_of=None, compact=False, page=None, strict=False):
+    """
+    Score tasks once and rank them under several strategies.
+    """
+    if strategies == 'all':
+        strategies = strategy_names()
+    if not isinstance(strategies, list) or not strategies:
+        return JsonResponse({
+            'status': 'error',
+            'message': 'strategies must be "all" or a non-empty list of strategy names or definitions'
+        }, status=400)
+    
+    unknown = [name for name in strategies if isinstance(name, str) and not is_known_strategy(name)]
+    if unknown:
+        return JsonResponse({
+            'status': 'error',
+            'message': f'Unknown strategies: {", ".join(map(str, unknown))}'
+        }, status=400)
+    
+    page = page or {'fields': None, 'limit': None, 'offset': 0}
+    result = rank_tasks(tasks, strategies, as_of, **parallel_scoring_options(), **page, strict=strict)
+    
+    if result['errors']:
+        return JsonResponse({
+            'status': 'error',
+            'message': 'Validation errors occurred',
+            'errors': result['errors'],
+            'warnings': result['warnings']
+        }, status=400)
+    
+    result['rankings'], tables = ranked_data(result, compact)
+    return json_response({
+        'status': 'success',
+        'message': f'Analyzed {result["total_tasks"]} tasks using {len(result["strategies_used"])} strategies',
+        'data': {**result, **page_info(result, page), **tables}
+    })
+
 @require_http_methods(["GET"])
 def suggest_tasks(request):
     """
-    Return the top 3 tasks the user should work on today.
+    Return the top k (default 3) tasks the user should work on today.
     This is a simplified version that expects tasks as query parameters.
+    Responses carry an ETag; send it back in If-None-Match to get a 304.
     """
     try:
         # For GET requests, we'll accept tasks as a JSON string in query params
         tasks_json = request.GET.get('tasks', '[]')
         strategy = request.GET.get('strategy', 'smart_balance')
+        strict = is_strict(request.GET.get('strict'))
+        
+        try:
+            k = parse_suggestion_count(request)
+        except ValueError as e:
+            return JsonResponse({
+                'status': 'error',
+                'message': str(e)
+            }, status=400)
+        
+        try:
+            as_of = parse_as_of(request.GET.get('as_of'))
+        except ValueError:
+            return invalid_as_of_response()
         
-        tasks = json.loads(tasks_json)
+        with phase('parse'):
+            tasks = json.loads(tasks_json)
         
         if not tasks:
             return JsonResponse({
@@ -73,45 +454,455 @@ def suggest_tasks(request):
                 'message': 'No tasks provided. Use ?tasks=[...] query parameter'
             }, status=400)
         
-        # Analyze tasks
-        result = analyze_and_sort_tasks(tasks, strategy)
+        key = result_cache_key('suggest', tasks, as_of, strategy=strategy, k=k, strict=strict)
+        
+        # The key hashes every input, so it doubles as a strong ETag and an
+        # unchanged poll is answered before any scoring
+        etag = f'"{key.rsplit(":", 1)[1]}"'
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = cached_response(key, lambda: suggest_from_tasks(tasks, strategy, k, as_of, strict))
+            if response.status_code != 200:
+                return response
+        response['ETag'] = etag
+        patch_cache_control(response, public=True, max_age=suggest_max_age())
+        return response
+        
+    except json.JSONDecodeError:
+        return JsonResponse({
+            'status': 'error',
+            'message': 'Invalid JSON in tasks parameter'
+        }, status=400)
+    except Exception as e:
+        return JsonResponse({
+            'status': 'error',
+            'message': f'Server error: {str(e)}'
+        }, status=500)
+
+def suggest_from_tasks(tasks, strategy, k, as_of=None, strict=False):
+    """
+    Select the top k tasks without ranking the rest.
+    """
+    result = select_top_tasks(tasks, strategy, k, as_of, strict)
+    strategy = result['strategy_used']
+    
+    if result['errors']:
+        return JsonResponse({
+            'status': 'error',
+            'message': 'Validation errors occurred',
+            'errors': result['errors']
+        }, status=400)
+    
+    suggestions = build_suggestions(result['top_tasks'])
+    
+    return json_response({
+        'status': 'success',
+        'message': f'Top {len(suggestions)} task suggestions using {strategy} strategy',
+        'suggestions': suggestions,
+        'warnings': result['warnings']
+    })
+
+def parse_hours_per_day(value):
+    """
+    Working hours per scheduled day, from the request or the settings.
+    Raises ValueError when it is not a number between 0 and 24.
+    """
+    if value is None:
+        return schedule_hours_per_day()
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not 0 < value <= 24:
+        raise ValueError('hours_per_day must be a number greater than 0 and at most 24')
+    return value
+
+@csrf_exempt
+@require_http_methods(["POST"])
+def schedule_tasks(request):
+    """
+    Lay tasks out on the critical path: earliest and latest start/finish
+    (in hours from as_of), slack, the critical path, and the tasks whose
+    earliest finish date misses their due date. Takes tasks, as_of, strict
+    and an optional hours_per_day for converting hours to dates.
+    """
+    try:
+        check_content_length(request, max_body_bytes())
+        with phase('parse'):
+            data = json.loads(request.body)
+        tasks = data.get('tasks', [])
+        strict = is_strict(data.get('strict'))
+        
+        try:
+            as_of = parse_as_of(data.get('as_of'))
+        except ValueError:
+            return invalid_as_of_response()
+        
+        try:
+            hours_per_day = parse_hours_per_day(data.get('hours_per_day'))
+        except ValueError as e:
+            return JsonResponse({
+                'status': 'error',
+                'message': str(e)
+            }, status=400)
+        
+        if not tasks or not isinstance(tasks, list):
+            return JsonResponse({
+                'status': 'error',
+                'message': 'No tasks provided'
+            }, status=400)
+        if len(tasks) > max_tasks_per_request():
+            raise PayloadTooLarge(f'More than {max_tasks_per_request()} tasks in one request')
+        
+        def schedule():
+            result = build_schedule(tasks, as_of, hours_per_day, strict)
+            if result['errors']:
+                return JsonResponse({
+                    'status': 'error',
+                    'message': 'Validation errors occurred',
+                    'errors': result['errors'],
+                    'warnings': result['warnings']
+                }, status=400)
+            return json_response({
+                'status': 'success',
+                'message': f'Scheduled {len(result["tasks"])} tasks over {result["total_hours"]} hours; '
+                           f'{result["late_tasks"]} would miss their due date',
+                'data': result
+            })
+        
+        key = result_cache_key('schedule', tasks, as_of, hours_per_day=hours_per_day, strict=strict)
+        return cached_response(key, schedule)
+        
+    except (PayloadTooLarge, RequestDataTooBig) as e:
+        return payload_too_large_response(e)
+    except (json.JSONDecodeError, AttributeError):
+        return JsonResponse({
+            'status': 'error',
+            'message': 'Invalid JSON data'
+        }, status=400)
+    except Exception as e:
+        logger.exception('Error scheduling tasks')
+        return JsonResponse({
+            'status': 'error',
+            'message': f'Server error: {str(e)}'
+        }, status=500)
+
+@require_http_methods(["GET"])
+def cache_stats(request):
+    """
+    Hit, miss and eviction counts of the analysis result cache in this
+    worker process.
+    """
+    return JsonResponse({
+        'status': 'success',
+        'cache': cache_stats_counters.as_dict()
+    })
+
+@require_http_methods(["GET"])
+def metrics(request):
+    """
+    Request and phase latency histograms, items processed and result cache
+    counters of this worker process, in the Prometheus text format.
+    Latencies are only recorded while TASK_ANALYZER_METRICS is enabled.
+    """
+    cache_counters = {
+        f'task_analyzer_result_cache_{name}_total': (f'Result cache {name}.', value)
+        for name, value in cache_stats_counters.as_dict().items()
+    }
+    return HttpResponse(metrics_registry.render(cache_counters),
+                        content_type='text/plain; version=0.0.4; charset=utf-8')
+
+@require_http_methods(["GET"])
+def analyze_stored_tasks(request):
+    """
+    Rank the stored Task rows by priority score.
+    Optional filters: ?due_before=YYYY-MM-DD and ?min_importance=N.
+    Dependencies on tasks outside the filtered set are not counted.
+    """
+    try:
+        strategy = request.GET.get('strategy', 'smart_balance')
+        try:
+            as_of = parse_as_of(request.GET.get('as_of'))
+        except ValueError:
+            return invalid_as_of_response()
+        
+        try:
+            queryset = filter_stored_tasks(request.GET)
+        except ValueError as e:
+            return JsonResponse({
+                'status': 'error',
+                'message': str(e)
+            }, status=400)
+        
+        result = rank_tasks(iter_stored_tasks(queryset), [strategy], as_of, **parallel_scoring_options())
         
         if result['errors']:
             return JsonResponse({
                 'status': 'error',
                 'message': 'Validation errors occurred',
-                'errors': result['errors']
+                'errors': result['errors'],
+                'warnings': result['warnings']
             }, status=400)
         
-        # Get top 3 tasks
-        top_tasks = result['sorted_tasks'][:3]
-        
-        suggestions = []
-        for i, task in enumerate(top_tasks, 1):
-            suggestions.append({
-                'rank': i,
-                'task': task['title'],
-                'priority_score': task['priority_score'],
-                'reason': task['explanation'],
-                'due_date': task.get('due_date', 'Not specified'),
-                'estimated_hours': task.get('estimated_hours', 'Unknown'),
-                'importance': task.get('importance', 'Unknown')
-            })
+        rankings, tables = ranked_data(result, is_compact(request.GET.get('compact')))
+        sorted_tasks = rankings[strategy]
+        return json_response({
+            'status': 'success',
+            'message': f'Analyzed {len(sorted_tasks)} stored tasks using {strategy} strategy',
+            'data': {
+                'sorted_tasks': sorted_tasks,
+                'errors': result['errors'],
+                'warnings': result['warnings'],
+                'strategy_used': strategy,
+                'as_of': result['as_of'],
+                **tables
+            }
+        })
         
+    except Exception as e:
+        logger.exception('Error analyzing stored tasks')
         return JsonResponse({
+            'status': 'error',
+            'message': f'Server error: {str(e)}'
+        }, status=500)
+
+@require_http_methods(["GET"])
+def suggest_stored_tasks(request):
+    """
+    Return the top k (default 3) stored tasks to work on today.
+    Accepts the same filters as analyze_stored_tasks. Without as_of this
+    reads the materialized scores (ORDER BY score LIMIT k), whose blocking
+    counts cover the whole table; with as_of, or for strategies that use
+    downstream impact, every matching row is scored.
+    """
+    try:
+        strategy = request.GET.get('strategy', 'smart_balance')
+        try:
+            k = parse_suggestion_count(request)
+            queryset = filter_stored_tasks(request.GET)
+        except ValueError as e:
+            return JsonResponse({
+                'status': 'error',
+                'message': str(e)
+            }, status=400)
+        
+        try:
+            as_of = parse_as_of(request.GET.get('as_of'))
+        except ValueError:
+            return invalid_as_of_response()
+        
+        if as_of is None and is_materialized(strategy):
+            suggestions = build_suggestions(top_stored_tasks(queryset, strategy, k))
+            return json_response({
+                'status': 'success',
+                'message': f'Top {len(suggestions)} stored task suggestions using {strategy} strategy',
+                'suggestions': suggestions,
+                'warnings': []
+            })
+        
+        result = select_top_tasks(iter_stored_tasks(queryset), strategy, k, as_of)
+        
+        if result['errors']:
+            return JsonResponse({
+                'status': 'error',
+                'message': 'Validation errors occurred',
+                'errors': result['errors']
+            }, status=400)
+        
+        suggestions = build_suggestions(result['top_tasks'])
+        return json_response({
             'status': 'success',
-            'message': f'Top 3 task suggestions using {strategy} strategy',
+            'message': f'Top {len(suggestions)} stored task suggestions using {strategy} strategy',
             'suggestions': suggestions,
             'warnings': result['warnings']
         })
         
-    except json.JSONDecodeError:
+    except Exception as e:
+        logger.exception('Error suggesting stored tasks')
         return JsonResponse({
             'status': 'error',
-            'message': 'Invalid JSON in tasks parameter'
+            'message': f'Server error: {str(e)}'
+        }, status=500)
+
+def parse_query_page(query):
+    """
+    parse_page for query string parameters (?limit=&offset=&fields=).
+    """
+    page = {'fields': query.get('fields')}
+    for name in ('limit', 'offset'):
+        if query.get(name) is not None:
+            try:
+                page[name] = int(query[name])
+            except ValueError:
+                raise ValueError(f'{name} must be an integer')
+    return parse_page(page)
+
+def session_response(session, page, message, status=200, include_tasks=True, **extra):
+    """
+    Summary of a session plus a page of its ranking: the whole ranking
+    when there is no limit, unless include_tasks is False.
+    """
+    data = {
+        'session_id': session.id,
+        'total_tasks': len(session),
+        'strategy_used': session.strategy,
+        'as_of': session.as_of.isoformat(),
+        **extra
+    }
+    if include_tasks or page['limit'] is not None:
+        fields = frozenset(page['fields']) if page['fields'] is not None else None
+        data['sorted_tasks'] = session.tasks(page['offset'], page['limit'], fields)
+        if page['limit'] is not None:
+            data.update(limit=page['limit'], offset=page['offset'])
+    return json_response({'status': 'success', 'message': message, 'data': data}, status=status)
+
+def session_rejected_response(error):
+    return JsonResponse({
+        'status': 'error',
+        'message': 'Validation errors occurred',
+        'errors': error.errors,
+        'warnings': error.warnings
+    }, status=400)
+
+def session_not_found_response():
+    return JsonResponse({
+        'status': 'error',
+        'message': 'Unknown or expired analysis session; create a new one'
+    }, status=404)
+
+@csrf_exempt
+@require_http_methods(["POST"])
+def create_analysis_session(request):
+    """
+    Analyze a task list and keep it as a session for incremental updates.
+    Takes the same tasks, strategy, as_of and paging fields as /analyze/
+    and returns a session_id to send deltas to.
+    """
+    try:
+        check_content_length(request, max_body_bytes())
+        with phase('parse'):
+            data = json.loads(request.body)
+        tasks = data.get('tasks', [])
+        strategy = data.get('strategy', 'smart_balance')
+        
+        try:
+            as_of = parse_as_of(data.get('as_of'))
+        except ValueError:
+            return invalid_as_of_response()
+        
+        try:
+            page = parse_page(data)
+        except ValueError as e:
+            return JsonResponse({
+                'status': 'error',
+                'message': str(e)
+            }, status=400)
+        
+        if not tasks or not isinstance(tasks, list):
+            return JsonResponse({
+                'status': 'error',
+                'message': 'No tasks provided'
+            }, status=400)
+        if len(tasks) > max_tasks_per_request():
+            raise PayloadTooLarge(f'More than {max_tasks_per_request()} tasks in one request')
+        
+        try:
+            session, warnings = AnalysisSession.create(tasks, strategy, as_of)
+        except DeltaRejected as e:
+            return session_rejected_response(e)
+        except StrategyError as e:
+            return strategy_error_response(e)
+        get_session_store().add(session)
+        
+        with session.lock:
+            return session_response(session, page, f'Analyzed {len(session)} tasks using {session.strategy} strategy',
+                                    status=201, warnings=warnings)
+        
+    except (PayloadTooLarge, RequestDataTooBig) as e:
+        return payload_too_large_response(e)
+    except (json.JSONDecodeError, AttributeError):
+        return JsonResponse({
+            'status': 'error',
+            'message': 'Invalid JSON data'
         }, status=400)
     except Exception as e:
+        logger.exception('Error creating analysis session')
         return JsonResponse({
             'status': 'error',
             'message': f'Server error: {str(e)}'
-        }, status=500)
\ No newline at end of file
+        }, status=500)
+
+@csrf_exempt
+@require_http_methods(["GET", "POST", "DELETE"])
+def analysis_session(request, session_id):
+    """
+    GET: the session's ranking (?limit=&offset=&fields= for one page).
+    POST: apply a delta {"upsert": [tasks], "remove": [ids]} and return
+    the new rank and score of every task whose score changed; add
+    "limit"/"offset"/"fields" to also get a page of the ranking.
+    DELETE: drop the session.
+    """
+    try:
+        store = get_session_store()
+        if request.method == 'DELETE':
+            if not store.discard(session_id):
+                return session_not_found_response()
+            return JsonResponse({'status': 'success', 'message': 'Session closed'})
+        
+        session = store.get(session_id)
+        if session is None:
+            return session_not_found_response()
+        
+        if request.method == 'GET':
+            try:
+                page = parse_query_page(request.GET)
+            except ValueError as e:
+                return JsonResponse({
+                    'status': 'error',
+                    'message': str(e)
+                }, status=400)
+            with session.lock:
+                return session_response(session, page, f'{len(session)} tasks ranked')
+        
+        check_content_length(request, max_body_bytes())
+        with phase('parse'):
+            data = json.loads(request.body)
+        try:
+            page = parse_page(data)
+        except ValueError as e:
+            return JsonResponse({
+                'status': 'error',
+                'message': str(e)
+            }, status=400)
+        
+        upsert, remove = data.get('upsert', []), data.get('remove', [])
+        if not isinstance(upsert, list) or not isinstance(remove, list):
+            return session_rejected_response(DeltaRejected(['upsert and remove must be lists']))
+        
+        with session.lock:
+            if len(session) + len(upsert) > max_tasks_per_request():
+                raise PayloadTooLarge(f'More than {max_tasks_per_request()} tasks in one session')
+            try:
+                with phase('score'):
+                    changed, removed, warnings = session.apply(upsert, remove)
+            except DeltaRejected as e:
+                return session_rejected_response(e)
+            changes = sorted(
+                ({'id': task_id, 'rank': session.rank(task_id),
+                  'priority_score': session.entries[task_id].total} for task_id in changed),
+                key=lambda change: change['rank']
+            )
+            return session_response(
+                session, page, f'Updated {len(changes)} and removed {len(removed)} tasks',
+                include_tasks=False, changes=changes, removed=removed, warnings=warnings
+            )
+        
+    except (PayloadTooLarge, RequestDataTooBig) as e:
+        return payload_too_large_response(e)
+    except (json.JSONDecodeError, AttributeError):
+        return JsonResponse({
+            'status': 'error',
+            'message': 'Invalid JSON data'
+        }, status=400)
+    except Exception as e:
+        logger.exception('Error updating analysis session')
+        return JsonResponse({
+            'status': 'error',
+            'message': f'Server error: {str(e)}'
+        }, status=500)
@@ -0,0 +1,43 @@
+"""
+Shared process pool for CPU-bound scoring.
+
+Scoring is pure Python and holds the GIL, so work is fanned out to worker
+processes. Workers are spawned rather than forked so they never inherit a
+web worker's threads or open database connections, and only import the
+Django-free scoring modules. One pool is created per web worker process,
+on first use.
+"""
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+_pool = None
+_pool_size = None
+_pool_lock = threading.Lock()
+
+def default_pool_size() -> int:
+    return os.cpu_count() or 1
+
+def get_process_pool(max_workers: int = None) -> ProcessPoolExecutor:
+    """
+    Return the shared pool, creating it (or resizing it) if needed.
+    """
+    global _pool, _pool_size
+    max_workers = max_workers or default_pool_size()
+    with _pool_lock:
+        if _pool is None or _pool_size != max_workers:
+            if _pool is not None:
+                _pool.shutdown(wait=False)
+            _pool = ProcessPoolExecutor(max_workers=max_workers,
+                                        mp_context=multiprocessing.get_context('spawn'))
+            _pool_size = max_workers
+        return _pool
+
+def shutdown_process_pool():
+    global _pool, _pool_size
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown()
+        _pool = None
+        _pool_size = None